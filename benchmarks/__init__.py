@@ -0,0 +1,5 @@
+"""
+Benchmarks package for the Lubimyczytac.pl web scraper.
+
+This package contains performance benchmarks of the data processing path.
+"""
@@ -0,0 +1,256 @@
+"""
+Data path benchmarks for the Lubimyczytac.pl web scraper.
+
+This module generates synthetic Lubimyczytac.pl libraries of a given size and
+measures throughput and peak memory of saving, loading and converting them
+with BookRepository, table_utils and the Book model.
+"""
+
+import csv
+import gc
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+import table_utils
+from models.book import Book
+from repositories.book_repository import COLUMNAR_TEXT_FIELDS, CSV_HEADERS, BookRepository
+
+try:
+    import numpy
+except ImportError:  # NumPy jest potrzebny tylko do formatu kolumnowego
+    numpy = None
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+AUTHORS = [
+    'Andrzej Sapkowski', 'Stanisław Lem', 'Olga Tokarczuk', 'Christopher Ruocchio',
+    'Craig Alanson', 'Brandon Sanderson', 'Terry Pratchett', 'Ursula K. Le Guin'
+]
+CYCLES = ['', '', 'Wiedźmin (tom {})', 'Pożeracz słońc (tom {})', 'Expeditionary Force (tom {})']
+SHELVES = ['Przeczytane', 'Teraz czytam', 'Chcę przeczytać']
+SELF_SHELVES = ['', '', 'Fantasy', 'Sci-Fi', 'Fantasy, Ulubione', 'Kryminał']
+
+def generate_rows(count, seed=0):
+    """
+    Generate synthetic book rows in the order of Book.to_list().
+
+    Args:
+        count (int): Number of rows to generate
+        seed (int): Seed of the random generator, so runs are repeatable
+
+    Returns:
+        list: A list of lists of strings
+    """
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        book_id = str(1000000 + index)
+        read = rng.random() < 0.6
+        rows.append([
+            book_id,
+            f"Tytuł książki {index}",
+            rng.choice(AUTHORS),
+            f"978{rng.randrange(10 ** 10):010d}" if rng.random() < 0.9 else '',
+            rng.choice(CYCLES).format(rng.randint(1, 12)),
+            f"{rng.randint(1, 9)},{rng.randint(0, 9)}",
+            str(rng.randint(0, 5000)),
+            str(rng.randint(0, 20000)),
+            str(rng.randint(0, 500)),
+            str(rng.randint(1, 10)) if read else '',
+            f"https://lubimyczytac.pl/ksiazka/{book_id}/tytul-ksiazki-{index}",
+            f"20{rng.randint(10, 24)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" if read else '',
+            'Przeczytane' if read else rng.choice(SHELVES[1:]),
+            rng.choice(SELF_SHELVES),
+            f"Original Title {index}" if rng.random() < 0.5 else ''
+        ])
+    return rows
+
+def write_synthetic_csv(filename, count, seed=0):
+    """
+    Write a synthetic library in the format produced by save_books_to_csv().
+
+    Args:
+        filename (str): Path to the output CSV file
+        count (int): Number of books
+        seed (int): Seed of the random generator
+    """
+    with open(filename, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADERS)
+        writer.writerows(generate_rows(count, seed))
+
+def _measure(operation, measure_memory):
+    """
+    Run an operation once and measure it.
+
+    Args:
+        operation (callable): The operation to run
+        measure_memory (bool): Whether to trace allocations to find peak memory
+
+    Returns:
+        tuple: (seconds, peak memory in bytes or None)
+    """
+    gc.collect()
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = operation()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if measure_memory else None
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+    del result
+    return seconds, peak
+
+def _read_columnar_text(filename):
+    """
+    Load a columnar file and decode all of its text columns.
+
+    Args:
+        filename (str): Path to the .npz file
+
+    Returns:
+        dict: A mapping of text field name to a list of str
+    """
+    columns = BookRepository.load_columns_from_columnar(filename)
+    return {field: list(columns[field]) for field in COLUMNAR_TEXT_FIELDS}
+
+def _operations(size, workdir):
+    """
+    Return the benchmarked operations for a library of the given size.
+
+    Args:
+        size (int): Number of books
+        workdir (str): Directory for the benchmark files
+
+    Returns:
+        dict: A mapping of operation name to a callable
+    """
+    rows = generate_rows(size)
+    books = [Book.from_list(list(row)) for row in rows]
+    csv_file = os.path.join(workdir, f"books_{size}.csv")
+    goodreads_file = os.path.join(workdir, f"goodreads_{size}.csv")
+    write_synthetic_csv(csv_file, size)
+
+    operations = {
+        'book_construction': lambda: [Book.from_list(list(row)) for row in rows],
+        'repository_save_books_to_csv': lambda: BookRepository.save_books_to_csv(books, csv_file),
+        'repository_load_books_from_csv': lambda: BookRepository.load_books_from_csv(csv_file),
+        'repository_convert_books_to_goodreads':
+            lambda: BookRepository.convert_books_to_goodreads(csv_file, goodreads_file),
+        'table_utils_save_books_to_csv': lambda: table_utils.save_books_to_csv(rows, csv_file),
+        'table_utils_load_books_from_csv': lambda: table_utils.load_books_from_csv(csv_file),
+        'table_utils_convert_books_to_goodreads':
+            lambda: table_utils.convert_books_to_goodreads(csv_file, goodreads_file),
+    }
+    if numpy is not None:
+        columnar_file = os.path.join(workdir, f"books_{size}.npz")
+        BookRepository.save_books_to_columnar(books, columnar_file)
+        operations.update({
+            'repository_save_books_to_columnar':
+                lambda: BookRepository.save_books_to_columnar(books, columnar_file),
+            'repository_load_columns_from_columnar':
+                lambda: BookRepository.load_columns_from_columnar(columnar_file),
+            'repository_read_columnar_text': lambda: _read_columnar_text(columnar_file),
+        })
+    return operations
+
+def run_benchmarks(sizes, workdir, measure_memory=True):
+    """
+    Run all data path benchmarks.
+
+    Time is measured in a run without allocation tracing, and peak memory in
+    a separate traced run, so tracing does not distort the timings.
+
+    Args:
+        sizes (list): Library sizes (numbers of books) to benchmark
+        workdir (str): Directory for the benchmark files
+        measure_memory (bool): Whether to measure peak memory
+
+    Returns:
+        dict: Benchmark report with environment info and results per size and operation
+    """
+    os.makedirs(workdir, exist_ok=True)
+    results = {}
+    for size in sizes:
+        results[str(size)] = {}
+        for name, operation in _operations(size, workdir).items():
+            seconds, _ = _measure(operation, measure_memory=False)
+            peak = _measure(operation, measure_memory=True)[1] if measure_memory else None
+            results[str(size)][name] = {
+                'seconds': round(seconds, 6),
+                'rows_per_second': round(size / seconds, 1) if seconds else None,
+                'peak_memory_mb': round(peak / 2 ** 20, 2) if peak is not None else None,
+            }
+            print(f"{size:>8} {name:<40} {seconds:8.3f}s "
+                  f"{results[str(size)][name]['rows_per_second']:>12} rows/s "
+                  f"{results[str(size)][name]['peak_memory_mb']} MB")
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+def compare_with_baseline(report, baseline, tolerance=0.2):
+    """
+    Compare a benchmark report with a baseline.
+
+    Args:
+        report (dict): Report returned by run_benchmarks()
+        baseline (dict): Previously saved report
+        tolerance (float): Allowed relative drop in throughput or growth in peak memory
+
+    Returns:
+        list: Descriptions of regressions; empty if there are none
+    """
+    regressions = []
+    for size, operations in report['results'].items():
+        for name, result in operations.items():
+            previous = baseline.get('results', {}).get(size, {}).get(name)
+            if not previous:
+                continue
+            if previous['rows_per_second'] and result['rows_per_second'] and \
+                    result['rows_per_second'] < previous['rows_per_second'] * (1 - tolerance):
+                regressions.append(
+                    f"{name} ({size}): {result['rows_per_second']} rows/s, "
+                    f"baseline {previous['rows_per_second']} rows/s"
+                )
+            if previous['peak_memory_mb'] and result['peak_memory_mb'] and \
+                    result['peak_memory_mb'] > previous['peak_memory_mb'] * (1 + tolerance):
+                regressions.append(
+                    f"{name} ({size}): {result['peak_memory_mb']} MB, "
+                    f"baseline {previous['peak_memory_mb']} MB"
+                )
+    return regressions
+
+def load_baseline(filename):
+    """
+    Load a baseline report.
+
+    Args:
+        filename (str): Path to the baseline JSON file
+
+    Returns:
+        dict: The baseline report, or None if the file does not exist
+    """
+    if not os.path.exists(filename):
+        return None
+    with open(filename, mode='r', encoding='utf-8') as file:
+        return json.load(file)
+
+def save_baseline(report, filename):
+    """
+    Save a benchmark report as the baseline.
+
+    Args:
+        report (dict): Report returned by run_benchmarks()
+        filename (str): Path to the baseline JSON file
+    """
+    with open(filename, mode='w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
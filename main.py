@@ -7,10 +7,26 @@ The script reads configuration from config.ini, scrapes book data from a user's
 on Lubimyczytac.pl, and saves the data to CSV files.
 """
 
+import argparse
 import configparser
-from models.book import Book
-from repositories.book_repository import BookRepository
-from scrapers.book_scraper import BookScraper
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from metrics.run_metrics import RunMetrics
+from repositories.book_repository import BookCsvWriter, BookRepository
+from repositories.details_cache import BookDetailsCache
+from repositories.enrichment_journal import EnrichmentJournal
+from repositories.page_archive import PageArchive
+from repositories.page_validators import PageValidatorStore
+from repositories.sqlite_book_repository import SqliteBookRepository
+from repositories.task_queue import EnrichmentTaskQueue
+from scrapers.archive_replay_scraper import ArchiveReplayScraper
+from scrapers.async_book_scraper import enrich_books_async
+from scrapers.book_scraper import BookScraper, build_list_url, get_profile_id
+from scrapers.driver_pool import DriverPool
+from scrapers.fetch_controller import FetchController
+from scrapers.http_book_scraper import HttpBookScraper
 
 class ScraperApp:
     """
@@ -29,33 +45,314 @@ class ScraperApp:
         """
         self.config = configparser.ConfigParser()
         self.config.read(config_file)
-        self.profile_url = self.config.get('settings', 'profile_url')
+        self.profile_url = self.config.get('settings', 'profile_url', fallback='')
+        self.profile_urls = self._read_profile_urls()
+        self.lean_browser = self.config.getboolean('settings', 'lean_browser', fallback=False)
+        self.metrics_file = self.config.get('settings', 'metrics_file', fallback='dane/metrics.json')
+        self.prometheus_textfile = self.config.get('settings', 'prometheus_textfile', fallback='') or None
+        self.archive_dir = self.config.get('settings', 'archive_dir', fallback='') or None
+        self.incremental_export = self.config.getboolean('settings', 'incremental_export', fallback=False)
+        self.metrics = RunMetrics()
+        self.fetch_controller = FetchController(metrics=self.metrics)
         # Append parameters to the URL to access the user's book list
-        self.profile_url += '/biblioteczka/lista?page=1&listId=booksFilteredList&findString=&kolejnosc=data-dodania&listType=list&objectId=605200&own=0&paginatorType=Standard'
+        self.profile_url = build_list_url(self.profile_url or self.profile_urls[0])
     
-    def scrape_books(self):
+    def _read_profile_urls(self):
+        """
+        Read the profiles processed by run_batch() from the configuration.
+        
+        Profiles are taken from the profile_urls setting (separated by commas or
+        new lines) and from the file named by profiles_file (one URL per line,
+        lines starting with # are skipped). If neither is set, profile_url is used.
+        
+        Returns:
+            list: Profile URLs without duplicates, in configuration order
+        """
+        urls = self.config.get('settings', 'profile_urls', fallback='').replace(',', '\n').split()
+        profiles_file = self.config.get('settings', 'profiles_file', fallback='')
+        if profiles_file:
+            with open(profiles_file, mode='r', encoding='utf-8') as file:
+                urls += [line.strip() for line in file if line.strip() and not line.startswith('#')]
+        if not urls and self.profile_url:
+            urls = [self.profile_url]
+        if not urls:
+            raise ValueError("No profile_url, profile_urls or profiles_file in the configuration.")
+        return list(dict.fromkeys(urls))
+    
+    @contextmanager
+    def open_session(self, workers=1, cache_file='dane/details_cache.db'):
+        """
+        Open a browser session that can be shared by several stages.
+        
+        Passing the session to scrape_books, scrape_new_books and enrich_books
+        avoids starting Chrome and handling the cookie banner more than once.
+        If archive_dir is set in the configuration, every visited page is
+        recorded in a PageArchive there.
+        
+        Args:
+            workers (int): Number of browser sessions; with more than one, a DriverPool is used
+            cache_file (str): Path to the book details cache, or None to disable it
+        
+        Yields:
+            BookScraper or DriverPool: The started browser session
+        """
+        cache = BookDetailsCache(cache_file) if cache_file else None
+        archive = PageArchive(self.archive_dir) if self.archive_dir else None
+        try:
+            if workers > 1:
+                session = DriverPool(size=workers, headless=True, cache=cache, lean=self.lean_browser,
+                                     metrics=self.metrics, archive=archive,
+                                     controller=self.fetch_controller)
+            else:
+                session = BookScraper(cache=cache, lean=self.lean_browser, metrics=self.metrics,
+                                      archive=archive, controller=self.fetch_controller)
+            with ExitStack() as stack:
+                with self.metrics.stage('browser_start'):
+                    scraper = stack.enter_context(session)
+                yield scraper
+        finally:
+            if cache:
+                cache.close()
+    
+    def scrape_books(self, workers=1, scraper=None):
         """
         Scrape book data from the user's profile.
         
+        Args:
+            workers (int): Number of browser sessions; with more than one, the list
+                pages are fetched concurrently by URL instead of clicking through them
+            scraper (BookScraper or DriverPool): Shared session from open_session(),
+                or None to open a new one for this stage
+        
         Returns:
             list: A list of Book objects
         """
-        with BookScraper(headless=False) as scraper:
+        if scraper is None:
+            with self.open_session(workers, cache_file=None) as scraper:
+                return self.scrape_books(scraper=scraper)
+        
+        with self.metrics.stage('scrape'):
             books = scraper.scrape_profile(self.profile_url)
-            print(f"Scraped {len(books)} books from the user's profile")
-            return books
+        print(f"Scraped {len(books)} books from the user's profile")
+        return books
+    
+    def scrape_new_books(self, filename, scraper=None):
+        """
+        Scrape only the books added since the previous run and merge them.
+        
+        Paging stops at the first page of the profile list that consists only
+        of books already present in the given file.
+        
+        Args:
+            filename (str): Path to the CSV file from the previous run
+            scraper (BookScraper): Shared session from open_session(), or None
+                to open a new one for this stage
+        
+        Returns:
+            list: The merged list of Book objects
+        """
+        if scraper is None:
+            with self.open_session(cache_file=None) as scraper:
+                return self.scrape_new_books(filename, scraper=scraper)
+        
+        existing_books = BookRepository.load_books_from_csv(filename) if os.path.exists(filename) else []
+        known_ids = {book.book_id for book in existing_books}
+        
+        with self.metrics.stage('scrape'):
+            scraped_books = scraper.scrape_profile(self.profile_url, known_ids=known_ids)
+        
+        new_count = sum(1 for book in scraped_books if book.book_id not in known_ids)
+        print(f"Scraped {len(scraped_books)} books, {new_count} of them new")
+        return BookRepository.merge_books(scraped_books, existing_books)
+    
+    def stream_books(self, filename, enrich_workers=8, max_pending=200,
+                     cache_file='dane/details_cache.db'):
+        """
+        Scrape, enrich and save books in a single streaming pass.
+        
+        The browser walks the profile list page by page while the books of
+        each page are enriched over HTTP in a thread pool. Every enriched book
+        is appended to the CSV file right away, in the order of the list.
+        Books that need the browser fallback are enriched on a separate
+        browser, because the list browser is still paging.
+        
+        Args:
+            filename (str): Path to the output CSV file
+            enrich_workers (int): Number of threads enriching books over HTTP
+            max_pending (int): Maximum number of books scraped but not yet written
+            cache_file (str): Path to the book details cache, or None to disable it
+        
+        Returns:
+            int: The number of books written
+        """
+        with self.open_session(cache_file=cache_file) as scraper, \
+                HttpBookScraper(cache=scraper.cache, pool_size=enrich_workers, metrics=self.metrics,
+                                controller=self.fetch_controller, archive=scraper.archive) as http_scraper, \
+                BookCsvWriter(filename) as writer, \
+                ThreadPoolExecutor(max_workers=enrich_workers) as executor, \
+                self.metrics.stage('stream'):
+            pending = deque()
+            for page_books in scraper.iter_profile_pages(self.profile_url):
+                for book in page_books:
+                    pending.append(executor.submit(http_scraper.get_book_details, book))
+                    # Ogranicz liczbę książek w pamięci, czekając na najstarszą
+                    if len(pending) >= max_pending:
+                        writer.write(pending.popleft().result())
+                while pending and pending[0].done():
+                    writer.write(pending.popleft().result())
+            while pending:
+                writer.write(pending.popleft().result())
+        
+        print(f"Streamed {writer.count} books to '{filename}'")
+        return writer.count
+    
+    def replay_archive(self, archive_dir=None):
+        """
+        Scrape and enrich books from pages recorded in a PageArchive.
+        
+        No browser is started and Lubimyczytac.pl is not contacted.
+        
+        Args:
+            archive_dir (str): Path to the archive directory; defaults to archive_dir
+                from the configuration
+        
+        Returns:
+            list: A list of Book objects with ISBN and original title fields populated
+        """
+        archive = PageArchive(archive_dir or self.archive_dir)
+        with ArchiveReplayScraper(archive) as scraper:
+            with self.metrics.stage('scrape'):
+                books = scraper.scrape_profile(self.profile_url)
+            with self.metrics.stage('enrich'):
+                scraper.enrich_books(books)
+        print(f"Replayed {len(books)} books from '{archive.directory}'")
+        return books
+    
+    def scrape_profiles(self, scraper):
+        """
+        Scrape the book lists of all configured profiles with one session.
+        
+        Args:
+            scraper (BookScraper or DriverPool): Started session from open_session()
+        
+        Returns:
+            dict: Mapping of profile ID to the list of Book objects of that profile
+        """
+        books_by_profile = {}
+        for profile_url in self.profile_urls:
+            with self.metrics.stage('scrape'):
+                books = scraper.scrape_profile(build_list_url(profile_url))
+            books_by_profile[get_profile_id(profile_url)] = books
+            print(f"Scraped {len(books)} books from '{profile_url}'")
+        return books_by_profile
+    
+    def enrich_shared_books(self, books_by_profile, engine='http', scraper=None, journal_file=None):
+        """
+        Enrich the books of several profiles, visiting every book page once.
+        
+        A book present on several profiles is enriched once and its ISBN and
+        original title are copied to the other profiles' copies, which keep
+        their own ratings, read dates and shelves.
+        
+        Args:
+            books_by_profile (dict): Mapping of profile ID to a list of Book objects
+            engine (str): 'selenium', 'http' or 'async', as in enrich_books()
+            scraper (BookScraper or DriverPool): Shared session from open_session()
+            journal_file (str): Path to the enrichment journal, or None to disable it
+        
+        Returns:
+            dict: The same mapping, with ISBN and original title fields populated
+        """
+        unique_books = {}
+        for books in books_by_profile.values():
+            for book in books:
+                unique_books.setdefault(BookDetailsCache.book_key(book) or id(book), book)
+        
+        total = sum(len(books) for books in books_by_profile.values())
+        print(f"Enriching {len(unique_books)} unique books out of {total}")
+        self.enrich_books(list(unique_books.values()), engine, scraper=scraper, journal_file=journal_file)
+        
+        for books in books_by_profile.values():
+            for book in books:
+                enriched = unique_books[BookDetailsCache.book_key(book) or id(book)]
+                book.isbn, book.original_title = enriched.isbn, enriched.original_title
+        return books_by_profile
+    
+    def run_batch(self, output_dir='dane/profiles', workers=1, engine='http',
+                  cache_file='dane/details_cache.db', journal_file='dane/enrichment.journal'):
+        """
+        Scrape, enrich and convert the books of all configured profiles.
+        
+        All profiles share one browser session (or DriverPool) and one
+        enrichment pass. The results of each profile are saved to
+        <output_dir>/<profile ID>/books_enriched.csv and goodreads.csv.
+        
+        Args:
+            output_dir (str): Directory for the per-profile output directories
+            workers (int): Number of browser sessions shared by all profiles
+            engine (str): 'selenium', 'http' or 'async', as in enrich_books()
+            cache_file (str): Path to the book details cache, or None to disable it
+            journal_file (str): Path to the enrichment journal, or None to disable it
+        
+        Returns:
+            dict: Mapping of profile ID to the list of enriched Book objects
+        """
+        with self.open_session(workers, cache_file=cache_file) as scraper:
+            books_by_profile = self.scrape_profiles(scraper)
+            self.enrich_shared_books(books_by_profile, engine, scraper=scraper,
+                                     journal_file=journal_file)
+        
+        for profile_id, books in books_by_profile.items():
+            profile_dir = os.path.join(output_dir, profile_id)
+            self.save_books(books, os.path.join(profile_dir, 'books_enriched.csv'))
+            self.convert_to_goodreads(os.path.join(profile_dir, 'books_enriched.csv'),
+                                      os.path.join(profile_dir, 'goodreads.csv'))
+        return books_by_profile
     
     def save_books(self, books, filename):
         """
         Save book data to a CSV file.
         
+        With incremental_export enabled in the configuration, only new rows
+        are appended when possible and the changes are written to a delta file.
+        
         Args:
             books (list): A list of Book objects
             filename (str): Path to the output CSV file
         """
-        BookRepository.save_books_to_csv(books, filename)
+        if self.incremental_export:
+            with self.metrics.stage('save'):
+                changes = BookRepository.save_books_incrementally(books, filename)
+            self._print_changes(changes, filename)
+            return
+        
+        with self.metrics.stage('save'):
+            BookRepository.save_books_to_csv(books, filename)
         print(f"Saved {len(books)} books to '{filename}'")
     
+    def _print_changes(self, changes, filename):
+        """
+        Print the result of an incremental export.
+        
+        Args:
+            changes (dict): Result of BookRepository.save_books_incrementally()
+            filename (str): Path to the output file
+        """
+        print(f"Updated '{filename}' ({changes['mode']}): {changes['added']} added, "
+              f"{changes['changed']} changed, {changes['removed']} removed")
+    
+    def save_books_to_database(self, books, filename):
+        """
+        Save book data to an SQLite database, updating only new and changed rows.
+        
+        Args:
+            books (list): A list of Book objects
+            filename (str): Path to the SQLite database file
+        """
+        with self.metrics.stage('save'), SqliteBookRepository(filename) as repository:
+            changed = repository.upsert_books(books)
+        print(f"Saved {changed} new or changed books to '{filename}'")
+    
     def load_books(self, filename):
         """
         Load book data from a CSV file.
@@ -66,64 +363,316 @@ class ScraperApp:
         Returns:
             list: A list of Book objects
         """
-        books = BookRepository.load_books_from_csv(filename)
+        with self.metrics.stage('load'):
+            books = BookRepository.load_books_from_csv(filename)
         print(f"Loaded {len(books)} books from '{filename}'")
         return books
     
-    def enrich_books(self, books):
+    def enrich_books(self, books, engine='selenium', workers=1, cache_file='dane/details_cache.db',
+                     scraper=None, journal_file='dane/enrichment.journal', resume=False):
         """
         Enrich book data with ISBN and original titles.
         
+        Books are enriched in batches; after each batch the results are appended
+        to a journal file, so an interrupted run can be resumed.
+        
         Args:
             books (list): A list of Book objects
+            engine (str): 'selenium' to load every page in Chrome, 'http' to fetch
+                pages over plain HTTP and use Chrome only as a fallback, or 'async'
+                to fetch all pages concurrently with asyncio
+            workers (int): Number of concurrent headless browser sessions used by
+                the 'selenium' engine
+            cache_file (str): Path to the book details cache, or None to disable it
+            scraper (BookScraper or DriverPool): Shared session from open_session();
+                its cache is used instead of cache_file, and the 'http' engine uses
+                it as the fallback browser
+            journal_file (str): Path to the enrichment journal, or None to disable it
+            resume (bool): Whether to skip books already recorded in the journal
         
         Returns:
             list: The same list of books, but with ISBN and original title fields populated
         """
-        with BookScraper(headless=False) as scraper:
-            enriched_books = scraper.enrich_books(books)
-            print(f"Enriched {len(enriched_books)} books with ISBN and original titles")
-            return enriched_books
+        if scraper is None and engine == 'selenium':
+            with self.open_session(workers, cache_file=cache_file) as scraper:
+                return self.enrich_books(books, engine, scraper=scraper,
+                                         journal_file=journal_file, resume=resume)
+        
+        cache = scraper.cache if scraper is not None else (
+            BookDetailsCache(cache_file) if cache_file else None
+        )
+        try:
+            with self.metrics.stage('enrich'):
+                if journal_file:
+                    self._enrich_with_journal(books, engine, cache, scraper, journal_file, resume)
+                else:
+                    self._enrich_with_engine(books, engine, cache, scraper)
+        finally:
+            if cache and scraper is None:
+                cache.close()
+        print(f"Enriched {len(books)} books with ISBN and original titles")
+        return books
+    
+    def _enrich_with_journal(self, books, engine, cache, scraper, journal_file, resume):
+        """
+        Enrich book data in batches, recording every batch in the journal.
+        
+        The engine is opened once for the whole run, so HTTP connections, the
+        fallback browser and statistics are shared by all batches.
+        
+        Args:
+            books (list): A list of Book objects
+            engine (str): 'selenium', 'http' or 'async'
+            cache (BookDetailsCache): Book details cache, or None
+            scraper (BookScraper or DriverPool): Started browser session, or None
+            journal_file (str): Path to the enrichment journal
+            resume (bool): Whether to skip books already recorded in the journal
+        """
+        with EnrichmentJournal(journal_file, resume=resume) as journal:
+            pending = journal.replay(books)
+            if resume:
+                print(f"Resumed {len(books) - len(pending)} books from '{journal_file}'")
+            
+            if engine == 'async':
+                # Wszystkie książki są pobierane naraz, a dziennik zapisywany w miarę postępu
+                done = []
+                
+                def record_done(book, fetched):
+                    # Nieudane pobrania nie trafiają do dziennika i zostaną ponowione
+                    if not fetched:
+                        return
+                    done.append(book)
+                    if len(done) >= journal.batch_size:
+                        journal.record(done)
+                        done.clear()
+                
+                try:
+                    enrich_books_async(pending, on_book=record_done, cache=cache, metrics=self.metrics)
+                finally:
+                    journal.record(done)
+                return
+            
+            with self._open_enricher(engine, cache, scraper) as enricher:
+                for start in range(0, len(pending), journal.batch_size):
+                    batch = pending[start:start + journal.batch_size]
+                    enricher.enrich_books(batch, report=False)
+                    journal.record([book for book in batch
+                                    if book.book_link not in enricher.failed_links])
+                enricher.print_stats()
+    
+    def _enrich_with_engine(self, books, engine, cache, scraper=None):
+        """
+        Enrich book data using the selected engine.
+        
+        Args:
+            books (list): A list of Book objects
+            engine (str): 'selenium', 'http' or 'async'
+            cache (BookDetailsCache): Book details cache, or None
+            scraper (BookScraper or DriverPool): Started browser session, or None
+        
+        Returns:
+            list: The enriched books
+        """
+        if engine == 'async':
+            return enrich_books_async(books, cache=cache, metrics=self.metrics)
+        
+        with self._open_enricher(engine, cache, scraper) as enricher:
+            return enricher.enrich_books(books)
+    
+    @contextmanager
+    def _open_enricher(self, engine, cache, scraper=None):
+        """
+        Open the synchronous enrichment engine for a whole enrichment run.
+        
+        Args:
+            engine (str): 'selenium' or 'http'
+            cache (BookDetailsCache): Book details cache, or None
+            scraper (BookScraper or DriverPool): Started browser session, or None
+        
+        Yields:
+            HttpBookScraper, BookScraper or DriverPool: The engine; the shared browser
+                session is yielded as is and not closed
+        """
+        if engine == 'http':
+            if scraper is not None:
+                archive = scraper.archive
+            else:
+                archive = PageArchive(self.archive_dir) if self.archive_dir else None
+            with HttpBookScraper(cache=cache, fallback_scraper=scraper, metrics=self.metrics,
+                                 controller=self.fetch_controller, archive=archive) as http_scraper:
+                yield http_scraper
+        else:
+            yield scraper
+    
+    def refresh_stats(self, books, validators_file='dane/validators.db'):
+        """
+        Refresh average ratings, rating, reader and opinion counts of books.
+        
+        Book pages are re-checked over HTTP with conditional requests, so only
+        pages that changed since the previous refresh are downloaded and parsed.
+        
+        Args:
+            books (list): A list of Book objects
+            validators_file (str): Path to the database of stored ETag and
+                Last-Modified values
+        
+        Returns:
+            list: The same list of books, with the statistics of changed pages updated
+        """
+        with self.metrics.stage('refresh'), \
+                PageValidatorStore(validators_file) as validators, \
+                HttpBookScraper(metrics=self.metrics, controller=self.fetch_controller) as http_scraper:
+            http_scraper.refresh_books_stats(books, validators)
+        print(f"Refreshed statistics of {http_scraper.refresh_stats['changed']} changed books")
+        return books
+    
+    def enqueue_books(self, books, queue_file='dane/tasks.db'):
+        """
+        Add enrichment tasks for books to the task queue processed by worker.py.
+        
+        Args:
+            books (list): A list of Book objects
+            queue_file (str): Path to the task queue database
+        
+        Returns:
+            int: The number of newly queued books
+        """
+        with EnrichmentTaskQueue(queue_file) as queue:
+            added = queue.enqueue(books)
+            counts = queue.counts()
+        print(f"Queued {added} books in '{queue_file}' "
+              f"({counts['pending']} pending, {counts['leased']} leased, {counts['done']} done, "
+              f"{counts['failed']} failed)")
+        return added
+    
+    def collect_results(self, books, queue_file='dane/tasks.db'):
+        """
+        Fill in ISBN and original titles from the results of queue workers.
+        
+        Args:
+            books (list): A list of Book objects previously passed to enqueue_books()
+            queue_file (str): Path to the task queue database
+        
+        Returns:
+            list: The same list of books; books without a result are left unchanged
+        """
+        with EnrichmentTaskQueue(queue_file) as queue:
+            results = queue.results()
+        
+        missing = 0
+        for book in books:
+            result = results.get(BookDetailsCache.book_key(book))
+            if result is None:
+                missing += 1
+            else:
+                book.isbn, book.original_title = result
+        print(f"Collected {len(books) - missing} results from '{queue_file}', {missing} books still pending")
+        return books
     
     def convert_to_goodreads(self, input_file, output_file):
         """
         Convert book data to Goodreads format.
         
+        With incremental_export enabled in the configuration, the output is
+        updated like in save_books().
+        
         Args:
             input_file (str): Path to the input CSV file in Lubimyczytac.pl format
             output_file (str): Path to the output CSV file in Goodreads format
         """
-        BookRepository.convert_books_to_goodreads(input_file, output_file)
+        if self.incremental_export:
+            with self.metrics.stage('convert'):
+                changes = BookRepository.convert_books_to_goodreads_incrementally(input_file, output_file)
+            self._print_changes(changes, output_file)
+            return
+        
+        with self.metrics.stage('convert'):
+            BookRepository.convert_books_to_goodreads(input_file, output_file)
         print(f"Converted book data to Goodreads format and saved to '{output_file}'")
     
-    def run(self):
+    def save_metrics(self):
+        """
+        Print the metrics of the run and save them as a JSON report.
+        
+        If prometheus_textfile is set in the configuration, the metrics are also
+        written there in the Prometheus text format.
+        """
+        self.metrics.print_summary()
+        self.metrics.save_json(self.metrics_file)
+        print(f"Saved run metrics to '{self.metrics_file}'")
+        if self.prometheus_textfile:
+            self.metrics.save_prometheus(self.prometheus_textfile)
+    
+    def run(self, resume=False):
         """
         Run the scraper application.
         
         This method orchestrates the scraping process, data processing, and file operations.
         It can be customized by uncommenting the relevant code sections.
+        
+        Args:
+            resume (bool): Whether to resume an interrupted enrichment from its journal
         """
-        # STEP 1: Scrape book data and save to CSV
-        # Uncomment these lines to scrape books from the user's profile
-        # books = self.scrape_books()
-        # self.save_books(books, 'dane/books.csv')
+        try:
+            # STEP 1: Scrape book data and save to CSV
+            # Uncomment these lines to scrape books from the user's profile
+            # books = self.scrape_books()
+            # self.save_books(books, 'dane/books.csv')
+            # Or use these lines to scrape only the books added since the last run
+            # books = self.scrape_new_books('dane/books.csv')
+            # self.save_books(books, 'dane/books.csv')
+            # To scrape and enrich in one browser session, replace STEPS 1-3 with:
+            # with self.open_session() as scraper:
+            #     books = self.scrape_books(scraper=scraper)
+            #     self.save_books(books, 'dane/books.csv')
+            #     enriched_books = self.enrich_books(books, scraper=scraper)
+            # Or stream books straight to the enriched CSV file and skip to STEP 5:
+            # self.stream_books('dane/books_enriched.csv')
+            # Or re-parse the pages recorded in archive_dir and skip to STEP 4:
+            # enriched_books = self.replay_archive()
         
-        # STEP 2: Load book data from CSV
-        # Uncomment this line to load previously scraped books from CSV
-        books = self.load_books('dane/books.csv')
+            # STEP 2: Load book data from CSV
+            # Uncomment this line to load previously scraped books from CSV
+            books = self.load_books('dane/books.csv')
         
-        # STEP 3: Enrich book data with ISBN and original titles
-        # Uncomment this line to add ISBN and original titles to book data
-        enriched_books = self.enrich_books(books)
+            # STEP 3: Enrich book data with ISBN and original titles
+            # Uncomment this line to add ISBN and original titles to book data
+            enriched_books = self.enrich_books(books, engine='http', resume=resume)
+            # To only refresh ratings and reader counts of already enriched books, use:
+            # enriched_books = self.refresh_stats(self.load_books('dane/books_enriched.csv'))
+            # Or spread the work over worker.py processes: enqueue the books, run
+            # the workers, then run again with these lines to collect the results
+            # self.enqueue_books(books)
+            # enriched_books = self.collect_results(books)
         
-        # STEP 4: Save enriched book data to a new CSV file
-        # Uncomment this line to save the enriched book data
-        self.save_books(enriched_books, 'dane/books_enriched.csv')
+            # STEP 4: Save enriched book data to a new CSV file
+            # Uncomment this line to save the enriched book data
+            self.save_books(enriched_books, 'dane/books_enriched.csv')
+            # Uncomment this line to also keep the enriched book data in an SQLite database
+            # self.save_books_to_database(enriched_books, 'dane/books.db')
         
-        # STEP 5: Convert book data to Goodreads format
-        # Uncomment this line to convert the enriched book data to Goodreads format
-        self.convert_to_goodreads('dane/books_enriched.csv', 'dane/goodreads.csv')
+            # STEP 5: Convert book data to Goodreads format
+            # Uncomment this line to convert the enriched book data to Goodreads format
+            self.convert_to_goodreads('dane/books_enriched.csv', 'dane/goodreads.csv')
+        finally:
+            # Metryki zapisujemy także po nieudanym przebiegu
+            self.save_metrics()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lubimyczytac.pl web scraper")
+    parser.add_argument('--resume', action='store_true',
+                        help="skip books already enriched by an interrupted run")
+    parser.add_argument('--batch', action='store_true',
+                        help="scrape all profiles from profile_urls or profiles_file")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of browser sessions used by --batch")
+    args = parser.parse_args()
+    
     app = ScraperApp()
-    app.run()
\ No newline at end of file
+    if args.batch:
+        try:
+            app.run_batch(workers=args.workers)
+        finally:
+            app.save_metrics()
+    else:
+        app.run(resume=args.resume)
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""
+Metrics package for the Lubimyczytac.pl web scraper.
+
+This package contains classes for measuring and reporting scraper runs.
+"""
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""
+Run metrics for the Lubimyczytac.pl web scraper.
+
+This module contains the RunMetrics class that collects stage timings,
+fetch latencies and error counters of a scraper run and exports them as a
+JSON report or a Prometheus textfile.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Kwantyle raportowane dla histogramów opóźnień
+QUANTILES = (0.5, 0.95, 0.99)
+
+def percentile(values, quantile):
+    """
+    Return the nearest-rank percentile of a list of values.
+    
+    Args:
+        values (list): Observed values
+        quantile (float): Quantile between 0 and 1, e.g. 0.95
+    
+    Returns:
+        float: The percentile, or None if there are no values
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(quantile * len(ordered)))
+    return ordered[rank - 1]
+
+class RunMetrics:
+    """
+    Metrics of a single scraper run.
+    
+    Stages (scrape, load, enrich, save, convert) are timed with stage(),
+    fetch latencies are recorded with observe() and failures are counted with
+    increment(). All methods are thread-safe, so one instance can be shared by
+    the worker threads of a run.
+    """
+    
+    def __init__(self, clock=time.perf_counter):
+        """
+        Initialize the RunMetrics.
+        
+        Args:
+            clock (callable): Function returning the current time in seconds
+        """
+        self.clock = clock
+        self.stages = {}
+        self.latencies = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def stage(self, name):
+        """
+        Measure the wall time of a stage of the run.
+        
+        Repeated stages with the same name are added up.
+        
+        Args:
+            name (str): Name of the stage, e.g. 'enrich'
+        """
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - start
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+    
+    def observe(self, name, seconds):
+        """
+        Record a latency.
+        
+        Args:
+            name (str): Name of the histogram, e.g. 'page_fetch' or 'book_fetch'
+            seconds (float): The observed latency in seconds
+        """
+        with self._lock:
+            self.latencies.setdefault(name, []).append(seconds)
+    
+    def increment(self, name, amount=1):
+        """
+        Increase a counter.
+        
+        Args:
+            name (str): Name of the counter, e.g. 'book_timeouts'
+            amount (int): Value to add
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def pages_per_second(self):
+        """
+        Return the rate of listing pages scraped during the scrape or stream stage.
+        
+        Returns:
+            float: Pages per second, or None if neither stage was timed
+        """
+        seconds = self.stages.get('scrape') or self.stages.get('stream')
+        if not seconds:
+            return None
+        return len(self.latencies.get('page_fetch', [])) / seconds
+    
+    def report(self):
+        """
+        Return all metrics as a dictionary.
+        
+        Returns:
+            dict: Stage times, latency summaries, counters and pages per second
+        """
+        with self._lock:
+            latencies = {}
+            for name, values in self.latencies.items():
+                summary = {'count': len(values), 'sum': sum(values)}
+                for quantile in QUANTILES:
+                    summary[f"p{int(quantile * 100)}"] = percentile(values, quantile)
+                latencies[name] = summary
+            return {
+                'stages': dict(self.stages),
+                'latencies': latencies,
+                'counters': dict(self.counters),
+                'pages_per_second': self.pages_per_second(),
+            }
+    
+    def save_json(self, filename):
+        """
+        Save the metrics report as a JSON file.
+        
+        Args:
+            filename (str): Path to the output JSON file
+        """
+        self._write(filename, json.dumps(self.report(), indent=2))
+    
+    def save_prometheus(self, filename, prefix='lubimyczytac'):
+        """
+        Save the metrics in the Prometheus text exposition format.
+        
+        The file is suitable for the textfile collector of node_exporter; it is
+        replaced atomically, so the collector never reads a partial file.
+        
+        Args:
+            filename (str): Path to the output .prom file
+            prefix (str): Prefix of all metric names
+        """
+        report = self.report()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Wall time of a stage of the run.",
+            f"# TYPE {prefix}_stage_seconds gauge",
+        ]
+        for name, seconds in sorted(report['stages'].items()):
+            lines.append(f'{prefix}_stage_seconds{{stage="{name}"}} {seconds}')
+        
+        lines += [
+            f"# HELP {prefix}_latency_seconds Latency of page fetches.",
+            f"# TYPE {prefix}_latency_seconds summary",
+        ]
+        for name, summary in sorted(report['latencies'].items()):
+            for quantile in QUANTILES:
+                value = summary[f"p{int(quantile * 100)}"]
+                lines.append(f'{prefix}_latency_seconds{{kind="{name}",quantile="{quantile}"}} {value}')
+            lines.append(f'{prefix}_latency_seconds_sum{{kind="{name}"}} {summary["sum"]}')
+            lines.append(f'{prefix}_latency_seconds_count{{kind="{name}"}} {summary["count"]}')
+        
+        lines += [
+            f"# HELP {prefix}_events_total Number of events such as timeouts and errors.",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        for name, value in sorted(report['counters'].items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        
+        if report['pages_per_second'] is not None:
+            lines += [
+                f"# HELP {prefix}_pages_per_second Listing pages scraped per second.",
+                f"# TYPE {prefix}_pages_per_second gauge",
+                f"{prefix}_pages_per_second {report['pages_per_second']}",
+            ]
+        self._write(filename, '\n'.join(lines) + '\n')
+    
+    def print_summary(self):
+        """Print stage times and fetch latencies."""
+        report = self.report()
+        for name, seconds in report['stages'].items():
+            print(f"Etap {name}: {seconds:.2f}s")
+        for name, summary in report['latencies'].items():
+            print(f"{name}: p50 {summary['p50']:.2f}s, p95 {summary['p95']:.2f}s, "
+                  f"p99 {summary['p99']:.2f}s ({summary['count']} pomiarów)")
+        for name, value in report['counters'].items():
+            print(f"{name}: {value}")
+    
+    @staticmethod
+    def _write(filename, content):
+        """
+        Write a file atomically.
+        
+        Args:
+            filename (str): Path to the output file
+            content (str): Content of the file
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = filename + '.tmp'
+        with open(temporary, mode='w', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(temporary, filename)
@@ -4,14 +4,202 @@ Book model for the Lubimyczytac.pl web scraper.
 This module contains the Book class that represents a book with all its attributes.
 """
 
+import sys
+from functools import lru_cache
+
+_WHITESPACE = str.maketrans('', '', ' \u00a0\u202f\t')
+
+def parse_decimal(text):
+    """
+    Parse a decimal number written in Polish notation, e.g. "7,2".
+    
+    Args:
+        text (str): The number as shown on Lubimyczytac.pl
+    
+    Returns:
+        float: The parsed number, or None if the text is not a number
+    """
+    try:
+        return float(text.translate(_WHITESPACE).replace(',', '.'))
+    except (AttributeError, ValueError):
+        return None
+
+def parse_count(text):
+    """
+    Parse an integer that may contain thousands separators, e.g. "1 133".
+    
+    Args:
+        text (str): The number as shown on Lubimyczytac.pl
+    
+    Returns:
+        int: The parsed number, or None if the text is not a number
+    """
+    try:
+        return int(text.translate(_WHITESPACE).replace('.', ''))
+    except (AttributeError, ValueError):
+        return None
+
+# Nazwy pól w kolejności kolumn pliku CSV i Book.to_list()
+BOOK_FIELDS = (
+    'book_id', 'title', 'author', 'isbn', 'cycle', 'avg_rating', 'rating_count',
+    'readers', 'opinions', 'user_rating', 'book_link', 'read_date',
+    'shelves', 'self_shelves', 'original_title'
+)
+
+# Pola liczbowe przechowywane jako wartości, a nie tekst
+NUMERIC_FIELDS = ('avg_rating', 'rating_count', 'readers', 'opinions', 'user_rating')
+
+def format_decimal(value):
+    """
+    Format a decimal number the way Lubimyczytac.pl shows it, e.g. 7.2 as "7,2".
+    
+    Args:
+        value (float): The number
+    
+    Returns:
+        str: The number in Polish notation, without a fractional part if it is whole
+    """
+    text = '%d' % value if value.is_integer() else repr(value)
+    return text.replace('.', ',')
+
+class _NumericField:
+    """
+    Numeric Book field stored once, as its parsed value.
+    
+    The value is parsed when the field is set. The original text is kept
+    next to it only when formatting the value does not give the same text
+    back, e.g. for "1 182" or "4.5", so the text always reads back unchanged.
+    Repeated texts share one stored object.
+    """
+    
+    def __init__(self, parse, format, doc):
+        """
+        Initialize the field.
+        
+        Args:
+            parse (callable): Function parsing the text, returning None if it is not a number
+            format (callable): Function formatting a parsed value back into text
+            doc (str): Docstring of the field
+        """
+        self.parse = parse
+        self.format = format
+        self.__doc__ = doc
+        self.store = lru_cache(maxsize=4096)(self._store)
+    
+    def __set_name__(self, owner, name):
+        """Bind the field to the slot holding its stored value."""
+        self.slot = owner.__dict__['_' + name]
+    
+    def _store(self, text):
+        """
+        Return the object stored for a text: the value, None for an empty text,
+        or a (text, value) pair if the text is not the canonical formatting.
+        """
+        value = self.parse(text)
+        if value is None and text == '':
+            return None
+        if value is not None and self.format(value) == text:
+            return value
+        return (text, value)
+    
+    def __get__(self, book, owner=None):
+        """Return the text of the field."""
+        if book is None:
+            return self
+        stored = self.slot.__get__(book)
+        if type(stored) is tuple:
+            return stored[0]
+        return '' if stored is None else self.format(stored)
+    
+    def __set__(self, book, text):
+        """Parse and store the text of the field."""
+        self.slot.__set__(book, self.store(text))
+    
+    def value(self, book):
+        """
+        Return the parsed value of the field.
+        
+        Args:
+            book (Book): The book
+        
+        Returns:
+            The parsed number, or None if the text is not a number
+        """
+        stored = self.slot.__get__(book)
+        return stored[1] if type(stored) is tuple else stored
+
+class _NumericValue:
+    """Read-only view of the parsed value of a _NumericField."""
+    
+    def __init__(self, field, doc):
+        """
+        Initialize the view.
+        
+        Args:
+            field (_NumericField): The field whose value is returned
+            doc (str): Docstring of the view
+        """
+        self.field = field
+        self.__doc__ = doc
+    
+    def __get__(self, book, owner=None):
+        """Return the parsed value of the field."""
+        if book is None:
+            return self
+        return self.field.value(book)
+
+def _intern(value):
+    """Intern a string so that repeated values share one object."""
+    return sys.intern(value) if type(value) is str else value
+
 class Book:
     """
     Represents a book with all its attributes.
     
     This class encapsulates all the data for a book scraped from Lubimyczytac.pl.
     It provides methods for converting to and from different formats.
+    
+    Instances use __slots__ to keep memory usage low. The numeric fields are
+    parsed once, when they are set, and stored as numbers; they read back as
+    the exact text they were set to, so all conversions stay byte-identical.
+    The parsed numbers are available as avg_rating_value, rating_count_value,
+    readers_value, opinions_value and user_rating_value.
     """
     
+    __slots__ = tuple('_' + name if name in NUMERIC_FIELDS else name for name in BOOK_FIELDS)
+    
+    avg_rating = _NumericField(
+        parse_decimal, format_decimal, "str: The average rating of the book, as shown on the page."
+    )
+    rating_count = _NumericField(
+        parse_count, str, "str: The number of ratings for the book, as shown on the page."
+    )
+    readers = _NumericField(
+        parse_count, str, "str: The number of readers for the book, as shown on the page."
+    )
+    opinions = _NumericField(
+        parse_count, str, "str: The number of opinions for the book, as shown on the page."
+    )
+    user_rating = _NumericField(
+        parse_decimal, format_decimal, "str: The user's rating of the book, as shown on the page."
+    )
+    
+    avg_rating_value = _NumericValue(
+        avg_rating, "float: The average rating of the book, or None if it is not a number."
+    )
+    rating_count_value = _NumericValue(
+        rating_count, "int: The number of ratings for the book, or None if it is not a number."
+    )
+    readers_value = _NumericValue(
+        readers, "int: The number of readers for the book, or None if it is not a number."
+    )
+    opinions_value = _NumericValue(
+        opinions, "int: The number of opinions for the book, or None if it is not a number."
+    )
+    user_rating_value = _NumericValue(
+        user_rating, "float: The user's rating of the book, or None if it is not a number."
+    )
+    
     def __init__(self, book_id="", title="", author="", isbn="", cycle="", 
                  avg_rating="", rating_count="", readers="", opinions="", 
                  user_rating="", book_link="", read_date="", shelves="", 
@@ -38,9 +226,9 @@ class Book:
         """
         self.book_id = book_id
         self.title = title
-        self.author = author
+        self.author = _intern(author)
         self.isbn = isbn
-        self.cycle = cycle
+        self.cycle = _intern(cycle)
         self.avg_rating = avg_rating
         self.rating_count = rating_count
         self.readers = readers
@@ -48,8 +236,8 @@ class Book:
         self.user_rating = user_rating
         self.book_link = book_link
         self.read_date = read_date
-        self.shelves = shelves
-        self.self_shelves = self_shelves
+        self.shelves = _intern(shelves)
+        self.self_shelves = _intern(self_shelves)
         self.original_title = original_title
     
     @classmethod
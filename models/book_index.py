@@ -0,0 +1,244 @@
+"""
+Book index for the Lubimyczytac.pl web scraper.
+
+This module contains the BookIndex class that answers repeated queries over
+a library of books without scanning the whole list.
+"""
+
+import os
+import re
+from bisect import bisect_left, bisect_right
+from repositories.book_repository import BookRepository
+
+# Numer tomu na końcu nazwy cyklu, np. "Wiedźmin (tom 2)"
+CYCLE_VOLUME_PATTERN = re.compile(r'\s*\(tom [^)]*\)\s*$')
+
+# Znak większy od każdego innego — górna granica zakresu prefiksu
+MAX_CHAR = '\U0010ffff'
+
+def _key(text):
+    """
+    Normalize a value for case-insensitive lookups.
+    
+    Args:
+        text (str): The value
+    
+    Returns:
+        str: The stripped, case-folded value
+    """
+    return text.strip().casefold()
+
+class BookIndex:
+    """
+    In-memory query index over a list of books.
+    
+    The index keeps hash indexes on author, cycle and shelves (both the
+    standard shelves and the user's own, split on ', '), a sorted index on
+    read date for range queries and a sorted index on titles for prefix
+    queries. Author, cycle, shelf and title lookups are case-insensitive.
+    A cycle can be looked up with or without the volume, e.g. both
+    "Wiedźmin (tom 2)" and "Wiedźmin". The index is built once; rebuild it
+    after the list of books changes.
+    """
+    
+    def __init__(self, books):
+        """
+        Build the index.
+        
+        Args:
+            books (list): A list of Book objects
+        """
+        self.books = list(books)
+        self._by_author = {}
+        self._by_cycle = {}
+        self._by_shelf = {}
+        for book in self.books:
+            self._add(self._by_author, book.author, book)
+            cycle_keys = {_key(book.cycle), _key(CYCLE_VOLUME_PATTERN.sub('', book.cycle))}
+            for cycle in cycle_keys:
+                if cycle:
+                    self._by_cycle.setdefault(cycle, []).append(book)
+            shelves = (book.shelves + ', ' + book.self_shelves).split(', ')
+            for shelf in {_key(shelf) for shelf in shelves}:
+                if shelf:
+                    self._by_shelf.setdefault(shelf, []).append(book)
+        
+        dated = sorted(
+            ((book.read_date, position) for position, book in enumerate(self.books) if book.read_date)
+        )
+        self._read_dates = [read_date for read_date, _ in dated]
+        self._read_date_books = [self.books[position] for _, position in dated]
+        
+        titled = sorted((_key(book.title), position) for position, book in enumerate(self.books))
+        self._titles = [title for title, _ in titled]
+        self._title_books = [self.books[position] for _, position in titled]
+    
+    @staticmethod
+    def _add(index, value, book):
+        """
+        Add a book to a hash index under a normalized key.
+        
+        Args:
+            index (dict): The hash index
+            value (str): The indexed value
+            book (Book): The book to add
+        """
+        key = _key(value)
+        if key:
+            index.setdefault(key, []).append(book)
+    
+    @classmethod
+    def from_repository(cls, repository):
+        """
+        Build the index from all books of a repository.
+        
+        Args:
+            repository: A SqliteBookRepository (or any object with a load_books()
+                method), the path of a CSV file saved by BookRepository, or an
+                iterable of Book objects
+        
+        Returns:
+            BookIndex: The built index
+        """
+        if isinstance(repository, (str, os.PathLike)):
+            return cls(BookRepository.load_books_from_csv(os.fspath(repository)))
+        if hasattr(repository, 'load_books'):
+            return cls(repository.load_books())
+        return cls(repository)
+    
+    def __len__(self):
+        """
+        Return the number of indexed books.
+        
+        Returns:
+            int: The number of books
+        """
+        return len(self.books)
+    
+    def by_author(self, author):
+        """
+        Return the books of an author.
+        
+        Args:
+            author (str): The author, as shown on Lubimyczytac.pl
+        
+        Returns:
+            list: Book objects in library order
+        """
+        return list(self._by_author.get(_key(author), ()))
+    
+    def by_cycle(self, cycle):
+        """
+        Return the books of a cycle.
+        
+        Args:
+            cycle (str): The cycle name, with or without the volume
+        
+        Returns:
+            list: Book objects in library order
+        """
+        return list(self._by_cycle.get(_key(cycle), ()))
+    
+    def by_shelf(self, shelf):
+        """
+        Return the books on a shelf.
+        
+        Args:
+            shelf (str): A standard shelf, e.g. "Przeczytane", or the user's own shelf
+        
+        Returns:
+            list: Book objects in library order
+        """
+        return list(self._by_shelf.get(_key(shelf), ()))
+    
+    def read_between(self, start_date=None, end_date=None):
+        """
+        Return the books read within a date range.
+        
+        Args:
+            start_date (str): First date of the range in YYYY-MM-DD format, or None
+            end_date (str): Last date of the range in YYYY-MM-DD format, or None
+        
+        Returns:
+            list: Book objects ordered by read date
+        """
+        start = bisect_left(self._read_dates, start_date) if start_date else 0
+        end = bisect_right(self._read_dates, end_date) if end_date else len(self._read_dates)
+        return self._read_date_books[start:end]
+    
+    def title_starts_with(self, prefix):
+        """
+        Return the books whose Polish title starts with a prefix.
+        
+        Args:
+            prefix (str): Beginning of the title
+        
+        Returns:
+            list: Book objects ordered by title
+        """
+        prefix = _key(prefix)
+        start = bisect_left(self._titles, prefix)
+        end = bisect_right(self._titles, prefix + MAX_CHAR, lo=start)
+        return self._title_books[start:end]
+    
+    def query(self, author=None, cycle=None, shelf=None, read_from=None, read_to=None,
+              title_prefix=None):
+        """
+        Return the books matching all given conditions.
+        
+        Candidates are taken from the index of the most selective condition
+        and checked against the remaining conditions one by one.
+        
+        Args:
+            author (str): Author of the books
+            cycle (str): Cycle of the books, with or without the volume
+            shelf (str): Shelf the books are on
+            read_from (str): First read date in YYYY-MM-DD format
+            read_to (str): Last read date in YYYY-MM-DD format
+            title_prefix (str): Beginning of the Polish title
+        
+        Returns:
+            list: Matching Book objects; in the order of the most selective condition
+        """
+        conditions = []
+        if author is not None:
+            author = _key(author)
+            conditions.append((
+                self._by_author.get(author, []),
+                lambda book: _key(book.author) == author
+            ))
+        if cycle is not None:
+            cycle = _key(cycle)
+            conditions.append((
+                self._by_cycle.get(cycle, []),
+                lambda book: cycle in (_key(book.cycle), _key(CYCLE_VOLUME_PATTERN.sub('', book.cycle)))
+            ))
+        if shelf is not None:
+            shelf = _key(shelf)
+            conditions.append((
+                self._by_shelf.get(shelf, []),
+                lambda book: shelf in {
+                    _key(name) for name in (book.shelves + ', ' + book.self_shelves).split(', ')
+                }
+            ))
+        if read_from is not None or read_to is not None:
+            conditions.append((
+                self.read_between(read_from, read_to),
+                lambda book: bool(book.read_date)
+                and (not read_from or book.read_date >= read_from)
+                and (not read_to or book.read_date <= read_to)
+            ))
+        if title_prefix is not None:
+            title_prefix = _key(title_prefix)
+            conditions.append((
+                self.title_starts_with(title_prefix),
+                lambda book: _key(book.title).startswith(title_prefix)
+            ))
+        if not conditions:
+            return list(self.books)
+        
+        # Kandydaci z najmniejszego indeksu, pozostałe warunki sprawdzane na miejscu
+        conditions.sort(key=lambda condition: len(condition[0]))
+        candidates = conditions[0][0]
+        checks = [check for _, check in conditions[1:]]
+        return [book for book in candidates if all(check(book) for check in checks)]
@@ -6,9 +6,187 @@ and converting book data.
 """
 
 import csv
+import hashlib
+import json
 import os
 from models.book import Book
 
+try:
+    import numpy as np
+except ImportError:  # NumPy jest potrzebny tylko do formatu kolumnowego
+    np = None
+
+CSV_HEADERS = [
+    'ID', 'Polski Tytuł', 'Autor', 'ISBN', 'Cykl', 'Średnia ocena', 'Liczba ocen',
+    'Czytelnicy', 'Opinie', 'Ocena użytkownika', 'Link', 'Data przeczytania',
+    'Na półkach Głowne', 'Na półkach Pozostałe', 'Tytuł'
+]
+
+GOODREADS_HEADERS = [
+    'Title', 'Polish Title', 'Author', 'ISBN', 'My Rating', 'Average Rating', 'Publisher',
+    'Binding', 'Year Published', 'Original Publication Year', 'Date Read',
+    'Date Added', 'Shelves', 'Bookshelves', 'My Review'
+]
+
+# Kolumna pliku Lubimyczytac.pl, z której pochodzi dana kolumna Goodreads
+GOODREADS_COLUMN_SOURCES = {
+    'Title': 'Tytuł',
+    'Polish Title': 'Polski Tytuł',
+    'Author': 'Autor',
+    'ISBN': 'ISBN',
+    'My Rating': 'Ocena użytkownika',
+    'Average Rating': 'Średnia ocena',
+    'Date Read': 'Data przeczytania',
+    'Shelves': 'Na półkach Głowne',
+    'Bookshelves': 'Na półkach Pozostałe',
+}
+
+# Kolumny tekstowe i liczbowe pliku kolumnowego (.npz)
+COLUMNAR_TEXT_FIELDS = [
+    'book_id', 'title', 'author', 'isbn', 'cycle', 'book_link', 'read_date',
+    'shelves', 'self_shelves', 'original_title'
+]
+COLUMNAR_FLOAT_FIELDS = ['avg_rating', 'user_rating']
+COLUMNAR_COUNT_FIELDS = ['rating_count', 'readers', 'opinions']
+
+# Wartość oznaczająca brak liczby w kolumnach całkowitych
+MISSING_COUNT = -1
+
+# Tekst kolumny zapisany jako bajty UTF-8 i przesunięcia kolejnych wartości
+TEXT_DATA_SUFFIX = '_utf8'
+TEXT_OFFSETS_SUFFIX = '_offsets'
+
+# Pliki pomocnicze eksportu przyrostowego
+ROW_HASHES_SUFFIX = '.hashes'
+DELTA_SUFFIX = '.delta.csv'
+DELTA_HEADERS = ['Zmiana', 'Klucz']
+
+class ColumnarTextColumn:
+    """
+    Text column of a columnar .npz file, decoded lazily.
+    
+    The column keeps the UTF-8 bytes and offsets as stored in the file, so
+    loading it does not create a str object per value. Values are decoded
+    only when they are read.
+    """
+    
+    __slots__ = ('_data', '_offsets')
+    
+    def __init__(self, data, offsets):
+        """
+        Initialize the column.
+        
+        Args:
+            data (bytes): UTF-8 bytes of all values joined together
+            offsets (numpy.ndarray): int64 array of len(column) + 1 byte offsets into data
+        """
+        self._data = data
+        self._offsets = offsets
+    
+    def __len__(self):
+        """Return the number of values in the column."""
+        return len(self._offsets) - 1
+    
+    def __getitem__(self, index):
+        """
+        Decode a single value.
+        
+        Args:
+            index (int): Position of the value; negative positions count from the end
+        
+        Returns:
+            str: The value
+        """
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("column index out of range")
+        return self._data[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+    
+    def __iter__(self):
+        """Decode the values one by one, in order."""
+        data = self._data
+        offsets = self._offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield data[start:end].decode('utf-8')
+    
+    def to_array(self):
+        """
+        Decode the whole column.
+        
+        Returns:
+            numpy.ndarray: An object array of str
+        """
+        column = np.empty(len(self), dtype=object)
+        column[:] = list(self)
+        return column
+
+class BookCsvWriter:
+    """
+    Incremental writer of book data to a CSV file.
+    
+    Each book is written and flushed immediately, so the file grows while
+    books are still being scraped and memory use does not depend on the
+    number of books.
+    """
+    
+    def __init__(self, filename, append=False):
+        """
+        Initialize the BookCsvWriter.
+        
+        Args:
+            filename (str): Path to the output CSV file
+            append (bool): Whether to append to an existing file instead of overwriting it
+        """
+        self.filename = filename
+        self.append = append
+        self.count = 0
+        self._file = None
+        self._writer = None
+    
+    def __enter__(self):
+        """
+        Open the file and write the header if the file is empty.
+        
+        Returns:
+            BookCsvWriter: The BookCsvWriter instance
+        """
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._file = open(self.filename, mode='a' if self.append else 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._writer.writerow(CSV_HEADERS)
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Close the file when exiting a context.
+        
+        Args:
+            exc_type: Exception type
+            exc_val: Exception value
+            exc_tb: Exception traceback
+        """
+        if self._file:
+            self._file.close()
+            self._file = None
+            self._writer = None
+    
+    def write(self, book):
+        """
+        Append a single book to the file.
+        
+        Args:
+            book (Book): The Book object to write
+        """
+        self._writer.writerow(book.to_list())
+        self._file.flush()
+        self.count += 1
+
 class BookRepository:
     """
     Repository for book data operations.
@@ -31,11 +209,7 @@ class BookRepository:
         
         with open(filename, mode='w', newline='', encoding='utf-8') as file:
             writer = csv.writer(file)
-            writer.writerow([
-                'ID', 'Polski Tytuł', 'Autor', 'ISBN', 'Cykl', 'Średnia ocena', 'Liczba ocen',
-                'Czytelnicy', 'Opinie', 'Ocena użytkownika', 'Link', 'Data przeczytania',
-                'Na półkach Głowne', 'Na półkach Pozostałe', 'Tytuł'
-            ])
+            writer.writerow(CSV_HEADERS)
             
             # Convert Book objects to lists and write to CSV
             for book in books:
@@ -64,6 +238,24 @@ class BookRepository:
                 books.append(Book.from_list(row))
         return books
     
+    @staticmethod
+    def merge_books(new_books, existing_books):
+        """
+        Merge freshly scraped books into a previously saved list.
+        
+        Freshly scraped books replace the saved books with the same ID and are
+        placed first, followed by the remaining saved books in their order.
+        
+        Args:
+            new_books (list): A list of freshly scraped Book objects
+            existing_books (list): A list of previously saved Book objects
+        
+        Returns:
+            list: The merged list of Book objects
+        """
+        new_ids = {book.book_id for book in new_books}
+        return list(new_books) + [book for book in existing_books if book.book_id not in new_ids]
+    
     @staticmethod
     def convert_books_to_goodreads(input_file, output_file):
         """
@@ -71,26 +263,308 @@ class BookRepository:
         
         This method reads book data from a CSV file in the format produced by
         save_books_to_csv() and converts it to a format that can be imported into
-        Goodreads.
+        Goodreads. Rows are mapped straight from the reader to the writer through
+        column indexes computed once from the header, so memory use does not
+        depend on the size of the file.
         
         Args:
             input_file (str): Path to the input CSV file in Lubimyczytac.pl format
             output_file (str): Path to the output CSV file in Goodreads format
+        
+        Returns:
+            int: The number of converted books
+        """
+        count = 0
+        with open(output_file, mode='w', encoding='utf-8', newline='') as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(GOODREADS_HEADERS)
+            for _, goodreads_row in BookRepository._iter_goodreads_rows(input_file):
+                writer.writerow(goodreads_row)
+                count += 1
+        return count
+    
+    @staticmethod
+    def _iter_goodreads_rows(input_file):
         """
-        # Load books from CSV
-        books = BookRepository.load_books_from_csv(input_file)
+        Read a CSV file in Lubimyczytac.pl format and yield its rows in Goodreads format.
         
-        # Define Goodreads fieldnames
-        fieldnames = [
-            'Title', 'Polish Title', 'Author', 'ISBN', 'My Rating', 'Average Rating', 'Publisher', 
-            'Binding', 'Year Published', 'Original Publication Year', 'Date Read', 
-            'Date Added', 'Shelves', 'Bookshelves', 'My Review'
-        ]
+        Args:
+            input_file (str): Path to the input CSV file in Lubimyczytac.pl format
         
-        # Write books to Goodreads CSV
-        with open(output_file, mode='w', encoding='utf-8', newline='') as outfile:
-            writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-            writer.writeheader()
+        Yields:
+            tuple: (book_id, row in the order of GOODREADS_HEADERS)
+        """
+        with open(input_file, mode='r', encoding='utf-8', newline='') as infile:
+            reader = csv.reader(infile)
+            header = next(reader, None) or CSV_HEADERS
+            positions = {name: index for index, name in enumerate(header)}
             
+            # Indeks kolumny wejściowej dla każdej kolumny Goodreads (None — brak odpowiednika)
+            indexes = [positions.get(GOODREADS_COLUMN_SOURCES.get(name)) for name in GOODREADS_HEADERS]
+            polish_title_index = positions.get('Polski Tytuł')
+            id_index = positions.get('ID', 0)
+            width = len(header)
+            
+            for row in reader:
+                if len(row) < width:
+                    row.extend([''] * (width - len(row)))
+                goodreads_row = ['' if index is None else row[index] for index in indexes]
+                # Brak oryginalnego tytułu — użyj polskiego, jak w Book.to_goodreads_dict()
+                if not goodreads_row[0] and polish_title_index is not None:
+                    goodreads_row[0] = row[polish_title_index]
+                yield row[id_index], goodreads_row
+    
+    @staticmethod
+    def save_books_incrementally(books, filename):
+        """
+        Save book data to a CSV file, writing only what changed since the last save.
+        
+        See _save_rows_incrementally() for how the file, its row hashes and the
+        delta file are updated.
+        
+        Args:
+            books (list): A list of Book objects
+            filename (str): Path to the output CSV file
+        
+        Returns:
+            dict: Numbers of added, changed and removed books, and the write mode
+        """
+        def rows():
             for book in books:
-                writer.writerow(book.to_goodreads_dict())
\ No newline at end of file
+                row = book.to_list() if isinstance(book, Book) else list(book)
+                yield row[0], row
+        
+        return BookRepository._save_rows_incrementally(rows, CSV_HEADERS, filename)
+    
+    @staticmethod
+    def convert_books_to_goodreads_incrementally(input_file, output_file):
+        """
+        Convert book data to Goodreads format, writing only what changed.
+        
+        Args:
+            input_file (str): Path to the input CSV file in Lubimyczytac.pl format
+            output_file (str): Path to the output CSV file in Goodreads format
+        
+        Returns:
+            dict: Numbers of added, changed and removed books, and the write mode
+        """
+        return BookRepository._save_rows_incrementally(
+            lambda: BookRepository._iter_goodreads_rows(input_file), GOODREADS_HEADERS, output_file
+        )
+    
+    @staticmethod
+    def row_hash(row):
+        """
+        Return the content hash of a CSV row.
+        
+        Args:
+            row (list): The fields of the row
+        
+        Returns:
+            str: SHA-1 of the fields, as a hex string
+        """
+        return hashlib.sha1('\x1f'.join(row).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _load_row_hashes(filename):
+        """
+        Load the row hashes saved alongside an output file.
+        
+        Args:
+            filename (str): Path to the output CSV file
+        
+        Returns:
+            list: [key, hash] pairs in file order, or None if the file or its
+                hashes are missing, or the file was modified since they were saved
+        """
+        hashes_file = filename + ROW_HASHES_SUFFIX
+        if not os.path.exists(filename) or not os.path.exists(hashes_file):
+            return None
+        try:
+            with open(hashes_file, mode='r', encoding='utf-8') as file:
+                saved = json.load(file)
+        except ValueError:
+            return None
+        stat = os.stat(filename)
+        if saved.get('signature') != [stat.st_size, stat.st_mtime_ns]:
+            return None
+        return saved['rows']
+    
+    @staticmethod
+    def _save_row_hashes(filename, rows):
+        """
+        Save the row hashes of an output file.
+        
+        Args:
+            filename (str): Path to the output CSV file
+            rows (list): [key, hash] pairs in file order
+        """
+        stat = os.stat(filename)
+        temporary = filename + ROW_HASHES_SUFFIX + '.tmp'
+        with open(temporary, mode='w', encoding='utf-8') as file:
+            json.dump({'signature': [stat.st_size, stat.st_mtime_ns], 'rows': rows}, file)
+        os.replace(temporary, filename + ROW_HASHES_SUFFIX)
+    
+    @staticmethod
+    def _save_rows_incrementally(rows, headers, filename):
+        """
+        Update a CSV file so that it contains the given rows, writing as little as possible.
+        
+        The content hash of every row is kept in <filename>.hashes. Rows are
+        compared with the saved hashes by key and the differences are written to
+        <filename without .csv>.delta.csv, one row per added, changed or removed
+        key. If nothing changed, the file is left untouched; if the rows are the
+        saved rows, unchanged and in the same order, followed by new rows, the
+        new rows are appended at the end of the file; otherwise the file is
+        rewritten. The file therefore always holds the rows in the given order,
+        exactly as a full export would, e.g. with new books placed first by
+        merge_books().
+        
+        Args:
+            rows (callable): Function returning a new iterator of (key, row) pairs;
+                it is called once to compare hashes and once to write
+            headers (list): Header row of the file
+            filename (str): Path to the output CSV file
+        
+        Returns:
+            dict: Numbers of added, changed and removed rows, and the write mode:
+                'unchanged', 'append' or 'rewrite'
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        keys = []
+        hashes = []
+        for key, row in rows():
+            keys.append(key)
+            hashes.append(BookRepository.row_hash(row))
+        
+        previous = BookRepository._load_row_hashes(filename)
+        saved = dict(previous or [])
+        changes = {}
+        for key, row_hash in zip(keys, hashes):
+            if key not in saved:
+                changes[key] = 'added'
+            elif saved[key] != row_hash:
+                changes[key] = 'changed'
+        new_keys = set(keys)
+        removed = [key for key, _ in previous or [] if key not in new_keys]
+        
+        # Dopisanie na końcu zachowuje kolejność tylko, gdy nowe wiersze są za zapisanymi
+        appended_at_end = previous is not None and \
+            keys[:len(previous)] == [key for key, _ in previous]
+        if appended_at_end and all(change == 'added' for change in changes.values()):
+            mode = 'append' if changes else 'unchanged'
+        else:
+            mode = 'rewrite'
+        
+        delta_file = os.path.splitext(filename)[0] + DELTA_SUFFIX
+        with open(delta_file, mode='w', encoding='utf-8', newline='') as delta:
+            delta_writer = csv.writer(delta)
+            delta_writer.writerow(DELTA_HEADERS + headers)
+            
+            if mode == 'rewrite':
+                temporary = filename + '.tmp'
+                with open(temporary, mode='w', encoding='utf-8', newline='') as file:
+                    writer = csv.writer(file)
+                    writer.writerow(headers)
+                    for key, row in rows():
+                        writer.writerow(row)
+                        if key in changes:
+                            delta_writer.writerow([changes[key], key] + row)
+                os.replace(temporary, filename)
+                saved_rows = [[key, row_hash] for key, row_hash in zip(keys, hashes)]
+            elif mode == 'append':
+                with open(filename, mode='a', encoding='utf-8', newline='') as file:
+                    writer = csv.writer(file)
+                    for key, row in rows():
+                        if key in changes:
+                            writer.writerow(row)
+                            delta_writer.writerow([changes[key], key] + row)
+                saved_rows = previous + [[key, row_hash] for key, row_hash in zip(keys, hashes)
+                                         if key in changes]
+            
+            for key in removed:
+                delta_writer.writerow(['removed', key] + [''] * len(headers))
+        
+        if mode != 'unchanged':
+            BookRepository._save_row_hashes(filename, saved_rows)
+        
+        counts = {'added': 0, 'changed': 0}
+        for change in changes.values():
+            counts[change] += 1
+        counts['removed'] = len(removed)
+        counts['mode'] = mode
+        return counts
+    
+    @staticmethod
+    def save_books_to_columnar(books, filename):
+        """
+        Save book data to a columnar NumPy .npz file.
+        
+        Each text field is stored as its UTF-8 bytes joined into one uint8 array
+        plus an int64 array of offsets, so a single long title does not widen
+        the whole column. avg_rating and user_rating are stored as float64
+        arrays with NaN for missing values; rating_count, readers and opinions
+        as int64 arrays with MISSING_COUNT for missing values.
+        
+        Args:
+            books (list): A list of Book objects
+            filename (str): Path to the output .npz file
+        """
+        if np is None:
+            raise ImportError("NumPy is required for the columnar format.")
+        
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        columns = {}
+        for field in COLUMNAR_TEXT_FIELDS:
+            encoded = [getattr(book, field).encode('utf-8') for book in books]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(value) for value in encoded], out=offsets[1:])
+            columns[field + TEXT_DATA_SUFFIX] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+            columns[field + TEXT_OFFSETS_SUFFIX] = offsets
+        for field in COLUMNAR_FLOAT_FIELDS:
+            values = (getattr(book, field + '_value') for book in books)
+            columns[field] = np.fromiter(
+                (np.nan if value is None else value for value in values),
+                dtype=np.float64, count=len(books)
+            )
+        for field in COLUMNAR_COUNT_FIELDS:
+            values = (getattr(book, field + '_value') for book in books)
+            columns[field] = np.fromiter(
+                (MISSING_COUNT if value is None else value for value in values),
+                dtype=np.int64, count=len(books)
+            )
+        
+        with open(filename, mode='wb') as file:
+            np.savez(file, **columns)
+    
+    @staticmethod
+    def load_columns_from_columnar(filename):
+        """
+        Load book data from a columnar .npz file without creating Book objects.
+        
+        Args:
+            filename (str): Path to the input .npz file
+        
+        Returns:
+            dict: A mapping of field name (e.g. 'author', 'avg_rating') to a column;
+                numeric fields are NumPy arrays, text fields ColumnarTextColumn
+                objects decoded on access
+        """
+        if np is None:
+            raise ImportError("NumPy is required for the columnar format.")
+        
+        columns = {}
+        with np.load(filename, allow_pickle=False) as data:
+            for field in COLUMNAR_TEXT_FIELDS:
+                columns[field] = ColumnarTextColumn(
+                    data[field + TEXT_DATA_SUFFIX].tobytes(), data[field + TEXT_OFFSETS_SUFFIX]
+                )
+            for field in COLUMNAR_FLOAT_FIELDS + COLUMNAR_COUNT_FIELDS:
+                columns[field] = data[field]
+        return columns
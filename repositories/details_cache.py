@@ -0,0 +1,160 @@
+"""
+Book details cache for the Lubimyczytac.pl web scraper.
+
+This module contains the BookDetailsCache class that stores the ISBN and
+original title of already visited books in an SQLite database, so repeated
+runs only fetch new or stale books.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+BOOK_ID_PATTERN = re.compile(r'/ksiazka/(\d+)')
+
+class BookDetailsCache:
+    """
+    Persistent cache of book details keyed by book_id.
+
+    Entries older than the TTL are treated as missing, and the oldest entries
+    are evicted once the cache grows beyond max_entries. The cache can be
+    shared by several threads.
+    """
+
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, filename, ttl=90 * 24 * 3600, max_entries=100000, clock=time.time):
+        """
+        Initialize the BookDetailsCache and create the database if needed.
+
+        Args:
+            filename (str): Path to the SQLite database file
+            ttl (float): Time in seconds after which an entry is considered stale
+            max_entries (int): Maximum number of entries kept in the cache
+            clock (callable): Function returning the current time in seconds
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.filename = filename
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS details ('
+            'book_id TEXT PRIMARY KEY, isbn TEXT, original_title TEXT, fetched_at REAL)'
+        )
+        self._connection.execute(
+            'CREATE INDEX IF NOT EXISTS details_fetched_at ON details (fetched_at)'
+        )
+        self._connection.commit()
+
+    def __enter__(self):
+        """
+        Return the cache when entering a context.
+
+        Returns:
+            BookDetailsCache: The BookDetailsCache instance
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Close the database when exiting a context.
+
+        Args:
+            exc_type: Exception type
+            exc_val: Exception value
+            exc_tb: Exception traceback
+        """
+        self.close()
+
+    @staticmethod
+    def book_key(book):
+        """
+        Return the cache key of a book.
+
+        Args:
+            book (Book): A Book object
+
+        Returns:
+            str: The book_id, taken from the book link if the book has no ID
+        """
+        if book.book_id:
+            return book.book_id
+        match = BOOK_ID_PATTERN.search(book.book_link or '')
+        return match.group(1) if match else ''
+
+    def get(self, book):
+        """
+        Look up the cached details of a book.
+
+        Args:
+            book (Book): A Book object
+
+        Returns:
+            tuple: (isbn, original_title), or None if the entry is missing or stale
+        """
+        key = self.book_key(book)
+        row = None
+        with self._lock:
+            if key:
+                row = self._connection.execute(
+                    'SELECT isbn, original_title FROM details WHERE book_id = ? AND fetched_at >= ?',
+                    (key, self.clock() - self.ttl)
+                ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return row
+
+    def put(self, book):
+        """
+        Store the details of an enriched book.
+
+        Args:
+            book (Book): A Book object with ISBN and original title populated
+        """
+        key = self.book_key(book)
+        if not key:
+            return
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO details (book_id, isbn, original_title, fetched_at) '
+                'VALUES (?, ?, ?, ?)',
+                (key, book.isbn, book.original_title, self.clock())
+            )
+            self._connection.commit()
+            self._puts += 1
+            if self._puts % self.EVICTION_INTERVAL == 0:
+                self._evict()
+
+    def _evict(self):
+        """Remove the oldest entries beyond max_entries. Must be called with the lock held."""
+        self._connection.execute(
+            'DELETE FROM details WHERE book_id IN ('
+            'SELECT book_id FROM details ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+        self._connection.commit()
+
+    def print_stats(self):
+        """Print the number of cache hits and misses."""
+        print(f"Cache: {self.hits} trafień, {self.misses} chybień")
+
+    def close(self):
+        """Evict surplus entries and close the database."""
+        with self._lock:
+            if self._connection:
+                self._evict()
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,143 @@
+"""
+Enrichment journal for the Lubimyczytac.pl web scraper.
+
+This module contains the EnrichmentJournal class, an append-only file of
+enrichment results that lets an interrupted enrichment run be resumed
+without visiting the same book pages again.
+"""
+
+import json
+import os
+from repositories.details_cache import BookDetailsCache
+
+class EnrichmentJournal:
+    """
+    Write-ahead journal of enriched books.
+
+    Each enriched book is appended as one JSON line with its book_id, ISBN
+    and original title. Lines are written and fsynced in batches, so a crash
+    loses at most the batch in progress.
+    """
+
+    def __init__(self, filename, resume=False, batch_size=100):
+        """
+        Initialize the EnrichmentJournal.
+
+        Args:
+            filename (str): Path to the journal file
+            resume (bool): Whether to keep the entries of a previous run; if False,
+                the journal is truncated when opened
+            batch_size (int): Number of books enriched between two fsyncs
+        """
+        self.filename = filename
+        self.resume = resume
+        self.batch_size = batch_size
+        self.entries = {}
+        self._file = None
+
+    def __enter__(self):
+        """
+        Load previous entries when resuming and open the journal for appending.
+
+        Returns:
+            EnrichmentJournal: The EnrichmentJournal instance
+        """
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if self.resume:
+            self.entries = self._load()
+            self._truncate_torn_line()
+        else:
+            self.entries = {}
+        self._file = open(self.filename, mode='a' if self.resume else 'w', encoding='utf-8')
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Sync and close the journal when exiting a context.
+
+        Args:
+            exc_type: Exception type
+            exc_val: Exception value
+            exc_tb: Exception traceback
+        """
+        if self._file:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def _load(self):
+        """
+        Read the entries of the journal file.
+
+        Returns:
+            dict: Mapping of book_id to (isbn, original_title)
+        """
+        entries = {}
+        if not os.path.exists(self.filename):
+            return entries
+
+        with open(self.filename, mode='r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Ostatnia linia mogła zostać przerwana w trakcie zapisu
+                    continue
+                entries[entry['book_id']] = (entry['isbn'], entry['original_title'])
+        return entries
+
+    def _truncate_torn_line(self):
+        """Cut off a trailing line left incomplete by a crash, so new entries start on a fresh line."""
+        if not os.path.exists(self.filename):
+            return
+
+        with open(self.filename, mode='rb+') as file:
+            data = file.read()
+            end = data.rfind(b'\n') + 1
+            if end < len(data):
+                file.truncate(end)
+
+    def _sync(self):
+        """Flush the journal and force it to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def replay(self, books):
+        """
+        Fill in journaled details and return the books that still need enrichment.
+
+        Args:
+            books (list): A list of Book objects
+
+        Returns:
+            list: The books without an entry in the journal
+        """
+        pending = []
+        for book in books:
+            entry = self.entries.get(BookDetailsCache.book_key(book))
+            if entry is None:
+                pending.append(book)
+            else:
+                book.isbn, book.original_title = entry
+        return pending
+
+    def record(self, books):
+        """
+        Append enriched books to the journal and sync it to disk.
+
+        Args:
+            books (list): A list of enriched Book objects
+        """
+        for book in books:
+            key = BookDetailsCache.book_key(book)
+            if not key:
+                continue
+            self.entries[key] = (book.isbn, book.original_title)
+            self._file.write(json.dumps(
+                {'book_id': key, 'isbn': book.isbn, 'original_title': book.original_title},
+                ensure_ascii=False
+            ) + '\n')
+        self._sync()
@@ -0,0 +1,317 @@
+"""
+Lazy CSV book reader for the Lubimyczytac.pl web scraper.
+
+This module contains the LazyBookCsvReader class that memory-maps a CSV file
+saved by BookRepository and parses only the rows that are actually used,
+with the help of a book_id -> byte offset index cached in a sidecar file.
+"""
+
+import csv
+import json
+import mmap
+import os
+from models.book import BOOK_FIELDS, Book
+from repositories.book_repository import CSV_HEADERS
+
+class LazyBook:
+    """
+    View of a single CSV row that is parsed into a Book on first use.
+
+    The book_id is known from the index, so reading it does not parse the row.
+    Any other attribute is read from the materialized Book.
+    """
+
+    __slots__ = ('book_id', '_reader', '_offset', '_book')
+
+    def __init__(self, reader, offset, book_id):
+        """
+        Initialize the LazyBook.
+
+        Args:
+            reader (LazyBookCsvReader): The reader the row belongs to
+            offset (int): Byte offset of the row in the CSV file
+            book_id (str): The ID of the book, taken from the index
+        """
+        self.book_id = book_id
+        self._reader = reader
+        self._offset = offset
+        self._book = None
+
+    def materialize(self):
+        """
+        Parse the row into a Book object.
+
+        Returns:
+            Book: The Book object of the row
+        """
+        if self._book is None:
+            self._book = Book.from_list(self._reader.read_row(self._offset))
+        return self._book
+
+    def __getattr__(self, name):
+        """
+        Read an attribute of the materialized Book.
+
+        Args:
+            name (str): Name of the attribute
+
+        Returns:
+            The value of the attribute
+        """
+        # Pola prywatne mogą nie być jeszcze ustawione, np. przy kopiowaniu;
+        # odczyt przez materialize() zapętliłby się
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+    def __repr__(self):
+        """
+        Return a string representation of the view.
+
+        Returns:
+            str: The representation, without parsing the row
+        """
+        return f"LazyBook(book_id='{self.book_id}', offset={self._offset})"
+
+class LazyBookCsvReader:
+    """
+    Memory-mapped reader of a CSV file in the format of save_books_to_csv().
+
+    Opening the reader loads the offset index from the sidecar file, or
+    builds it with a single scan of the file if the sidecar is missing or
+    older than the CSV file. Rows are parsed only when a LazyBook is used or
+    a column is read.
+    """
+
+    INDEX_SUFFIX = '.idx'
+
+    def __init__(self, filename, index_file=None):
+        """
+        Initialize the LazyBookCsvReader.
+
+        Args:
+            filename (str): Path to the CSV file
+            index_file (str): Path to the sidecar index; defaults to the CSV path with '.idx' appended
+        """
+        self.filename = filename
+        self.index_file = index_file or filename + self.INDEX_SUFFIX
+        self.offsets = []
+        self.book_ids = []
+        self._positions = {}
+        self._file = None
+        self._mmap = None
+
+    def __enter__(self):
+        """
+        Map the CSV file into memory and load or build the index.
+
+        Returns:
+            LazyBookCsvReader: The LazyBookCsvReader instance
+        """
+        self._file = open(self.filename, mode='rb')
+        if os.fstat(self._file.fileno()).st_size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if not self._load_index():
+            self._build_index()
+            self._save_index()
+        self._positions = {}
+        for position, book_id in enumerate(self.book_ids):
+            self._positions.setdefault(book_id, position)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Unmap and close the CSV file when exiting a context.
+
+        Args:
+            exc_type: Exception type
+            exc_val: Exception value
+            exc_tb: Exception traceback
+        """
+        if self._mmap:
+            self._mmap.close()
+            self._mmap = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _file_signature(self):
+        """
+        Return the size and modification time of the CSV file.
+
+        Returns:
+            list: [size, mtime in nanoseconds]
+        """
+        stat = os.stat(self.filename)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _load_index(self):
+        """
+        Load the sidecar index if it matches the current CSV file.
+
+        Returns:
+            bool: True if the index was loaded
+        """
+        if not os.path.exists(self.index_file):
+            return False
+        try:
+            with open(self.index_file, mode='r', encoding='utf-8') as file:
+                index = json.load(file)
+        except ValueError:
+            return False
+        if index.get('signature') != self._file_signature():
+            return False
+        self.offsets = index['offsets']
+        self.book_ids = index['book_ids']
+        return True
+
+    def _save_index(self):
+        """Write the index to the sidecar file."""
+        temporary = self.index_file + '.tmp'
+        with open(temporary, mode='w', encoding='utf-8') as file:
+            json.dump({
+                'signature': self._file_signature(),
+                'offsets': self.offsets,
+                'book_ids': self.book_ids,
+            }, file)
+        os.replace(temporary, self.index_file)
+
+    def _lines(self, offset):
+        """
+        Yield decoded lines of the file starting at a byte offset.
+
+        Args:
+            offset (int): Byte offset of the first line
+
+        Yields:
+            tuple: (line including its line terminator, byte offset just past the line)
+        """
+        size = len(self._mmap) if self._mmap else 0
+        while offset < size:
+            end = self._mmap.find(b'\n', offset)
+            end = size if end == -1 else end + 1
+            yield self._mmap[offset:end].decode('utf-8'), end
+            offset = end
+
+    def _parse_at(self, offset):
+        """
+        Parse the CSV record starting at a byte offset.
+
+        Args:
+            offset (int): Byte offset of the record
+
+        Returns:
+            tuple: (row, offset of the next record); row is None at the end of the file
+        """
+        end = offset
+
+        def lines():
+            nonlocal end
+            # csv.reader nie czyta na zapas, więc end to koniec ostatniej linii rekordu
+            for line, end in self._lines(offset):
+                yield line
+
+        row = next(csv.reader(lines()), None)
+        return row, end
+
+    def _build_index(self):
+        """Scan the file once and record the offset and book_id of every row."""
+        self.offsets = []
+        self.book_ids = []
+        size = len(self._mmap) if self._mmap else 0
+        _, offset = self._parse_at(0)  # Pomiń nagłówek
+        while offset < size:
+            end = self._mmap.find(b'\n', offset)
+            end = size if end == -1 else end + 1
+            line = self._mmap[offset:end]
+            if b'"' in line:
+                # Pola w cudzysłowach mogą zawierać przecinki i nowe linie
+                row, next_offset = self._parse_at(offset)
+                book_id = row[0] if row else ''
+            else:
+                book_id = line.split(b',', 1)[0].rstrip(b'\r\n').decode('utf-8')
+                next_offset = end
+            if line.strip():
+                self.offsets.append(offset)
+                self.book_ids.append(book_id)
+            offset = next_offset
+
+    def read_row(self, offset):
+        """
+        Parse a single row of the file.
+
+        Args:
+            offset (int): Byte offset of the row, taken from the index
+
+        Returns:
+            list: The fields of the row
+        """
+        return self._parse_at(offset)[0]
+
+    def __len__(self):
+        """
+        Return the number of books in the file.
+
+        Returns:
+            int: The number of rows, without the header
+        """
+        return len(self.offsets)
+
+    def __contains__(self, book_id):
+        """
+        Check whether a book is in the file, without parsing any row.
+
+        Args:
+            book_id (str): The ID of the book
+
+        Returns:
+            bool: True if the file contains the book
+        """
+        return book_id in self._positions
+
+    def get(self, book_id):
+        """
+        Look up a book by its ID.
+
+        Args:
+            book_id (str): The ID of the book
+
+        Returns:
+            LazyBook: A view of the first row with that ID, or None if there is none
+        """
+        position = self._positions.get(book_id)
+        if position is None:
+            return None
+        return LazyBook(self, self.offsets[position], book_id)
+
+    def __iter__(self):
+        """
+        Iterate over views of all rows in file order.
+
+        Yields:
+            LazyBook: A view of the next row
+        """
+        for offset, book_id in zip(self.offsets, self.book_ids):
+            yield LazyBook(self, offset, book_id)
+
+    def iter_column(self, column):
+        """
+        Iterate over the values of a single column.
+
+        The book_id column is served from the index; other columns are read
+        row by row without creating Book objects.
+
+        Args:
+            column (str): A Book attribute name, e.g. 'author', or a CSV header, e.g. 'Autor'
+
+        Yields:
+            str: The value of the column in the next row
+        """
+        position = CSV_HEADERS.index(column) if column in CSV_HEADERS else BOOK_FIELDS.index(column)
+        if position == 0:
+            yield from self.book_ids
+            return
+        lines = (line for line, _ in self._lines(self.offsets[0] if self.offsets else 0))
+        for row in csv.reader(lines):
+            if row:
+                yield row[position] if position < len(row) else ''
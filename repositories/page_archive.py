@@ -0,0 +1,147 @@
+"""
+Page archive for the Lubimyczytac.pl web scraper.
+
+This module contains the PageArchive class that stores the raw HTML of
+visited pages in a compressed, content-addressed archive, so pages can be
+parsed again later without a browser.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+class PageArchive:
+    """
+    Content-addressed archive of raw HTML pages.
+
+    Every page is stored once as objects/<hash[:2]>/<hash>.html.gz, where
+    hash is the SHA-256 of its HTML. An append-only index.jsonl maps URLs to
+    hashes; when a URL is archived again, the latest entry wins. The archive
+    can be shared by several threads.
+    """
+
+    INDEX_FILE = 'index.jsonl'
+
+    def __init__(self, directory, clock=time.time):
+        """
+        Initialize the PageArchive and load its index.
+
+        Args:
+            directory (str): Path to the archive directory
+            clock (callable): Function returning the current time in seconds
+        """
+        self.directory = directory
+        self.clock = clock
+        self.entries = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Read the URL index of the archive."""
+        index_file = os.path.join(self.directory, self.INDEX_FILE)
+        if not os.path.exists(index_file):
+            return
+
+        with open(index_file, mode='r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Ostatnia linia mogła zostać przerwana w trakcie zapisu
+                    continue
+                self.entries[entry['url']] = entry
+
+    def _object_path(self, digest):
+        """
+        Return the path of the stored page with the given hash.
+
+        Args:
+            digest (str): SHA-256 of the page HTML, as a hex string
+
+        Returns:
+            str: Path to the compressed page
+        """
+        return os.path.join(self.directory, 'objects', digest[:2], f"{digest}.html.gz")
+
+    def store(self, url, html, kind):
+        """
+        Archive the HTML of a page.
+
+        Args:
+            url (str): URL of the page
+            html (str): HTML source of the page
+            kind (str): Kind of the page, 'listing' or 'book'
+
+        Returns:
+            str: SHA-256 of the page HTML
+        """
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temporary = f"{path}.{threading.get_ident()}.tmp"
+                with gzip.open(temporary, mode='wb') as file:
+                    file.write(data)
+                os.replace(temporary, path)
+
+            entry = {'url': url, 'sha256': digest, 'kind': kind, 'archived_at': self.clock()}
+            self.entries[url] = entry
+            with open(os.path.join(self.directory, self.INDEX_FILE), mode='a', encoding='utf-8') as file:
+                file.write(json.dumps(entry) + '\n')
+        return digest
+
+    def get(self, url):
+        """
+        Return the archived HTML of a page.
+
+        Args:
+            url (str): URL of the page
+
+        Returns:
+            str: HTML source of the page, or None if the page is not archived
+        """
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        with gzip.open(self._object_path(entry['sha256']), mode='rb') as file:
+            return file.read().decode('utf-8')
+
+    def urls(self, kind=None):
+        """
+        Return the URLs of archived pages.
+
+        Args:
+            kind (str): Kind of pages to return, or None for all pages
+
+        Returns:
+            list: URLs in the order they were first archived
+        """
+        return [url for url, entry in self.entries.items() if kind is None or entry['kind'] == kind]
+
+    def __contains__(self, url):
+        """
+        Check whether a page is archived.
+
+        Args:
+            url (str): URL of the page
+
+        Returns:
+            bool: True if the page is archived
+        """
+        return url in self.entries
+
+    def __len__(self):
+        """
+        Return the number of archived URLs.
+
+        Returns:
+            int: The number of archived URLs
+        """
+        return len(self.entries)
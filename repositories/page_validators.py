@@ -0,0 +1,100 @@
+"""
+Page validator store for the Lubimyczytac.pl web scraper.
+
+This module contains the PageValidatorStore class that keeps the ETag and
+Last-Modified headers of book pages, so they can be re-checked with
+conditional HTTP requests.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+class PageValidatorStore:
+    """
+    Persistent store of HTTP cache validators keyed by book_id.
+
+    The store can be shared by several threads.
+    """
+
+    def __init__(self, filename, clock=time.time):
+        """
+        Initialize the PageValidatorStore and create the database if needed.
+
+        Args:
+            filename (str): Path to the SQLite database file
+            clock (callable): Function returning the current time in seconds
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.filename = filename
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS validators ('
+            'book_id TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, checked_at REAL)'
+        )
+        self._connection.commit()
+
+    def __enter__(self):
+        """
+        Return the store when entering a context.
+
+        Returns:
+            PageValidatorStore: The PageValidatorStore instance
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Close the database when exiting a context.
+
+        Args:
+            exc_type: Exception type
+            exc_val: Exception value
+            exc_tb: Exception traceback
+        """
+        self.close()
+
+    def get(self, book_id):
+        """
+        Look up the validators of a book page.
+
+        Args:
+            book_id (str): The ID of the book
+
+        Returns:
+            tuple: (etag, last_modified), either of which may be None, or None if unknown
+        """
+        with self._lock:
+            return self._connection.execute(
+                'SELECT etag, last_modified FROM validators WHERE book_id = ?', (book_id,)
+            ).fetchone()
+
+    def put(self, book_id, etag, last_modified):
+        """
+        Store the validators of a book page.
+
+        Args:
+            book_id (str): The ID of the book
+            etag (str): Value of the ETag header, or None
+            last_modified (str): Value of the Last-Modified header, or None
+        """
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO validators (book_id, etag, last_modified, checked_at) '
+                'VALUES (?, ?, ?, ?)',
+                (book_id, etag, last_modified, self.clock())
+            )
+            self._connection.commit()
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,197 @@
+"""
+SQLite book repository for the Lubimyczytac.pl web scraper.
+
+This module contains the SqliteBookRepository class that stores book data
+in an SQLite database with indexed lookups and incremental upserts.
+"""
+
+import os
+import sqlite3
+from models.book import BOOK_FIELDS, Book
+
+# Kolumny tabeli w kolejności Book.to_list()
+BOOK_COLUMNS = list(BOOK_FIELDS)
+
+class SqliteBookRepository:
+    """
+    Repository storing book data in an SQLite database.
+
+    Books are kept in a single table keyed on book_id, with secondary indexes
+    on author, ISBN and read date. Saving uses upserts, so only new and
+    changed rows are written.
+    """
+
+    def __init__(self, filename):
+        """
+        Initialize the SqliteBookRepository and create the schema if needed.
+
+        Args:
+            filename (str): Path to the SQLite database file
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.filename = filename
+        self._connection = sqlite3.connect(filename)
+        self._create_schema()
+
+    def __enter__(self):
+        """
+        Return the repository when entering a context.
+
+        Returns:
+            SqliteBookRepository: The SqliteBookRepository instance
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Close the database when exiting a context.
+
+        Args:
+            exc_type: Exception type
+            exc_val: Exception value
+            exc_tb: Exception traceback
+        """
+        self.close()
+
+    def _create_schema(self):
+        """Create the books table and its indexes."""
+        columns = ', '.join(f"{column} TEXT NOT NULL DEFAULT ''" for column in BOOK_COLUMNS[1:])
+        with self._connection:
+            self._connection.execute(
+                f'CREATE TABLE IF NOT EXISTS books (book_id TEXT PRIMARY KEY, {columns})'
+            )
+            self._connection.execute('CREATE INDEX IF NOT EXISTS books_author ON books (author)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS books_isbn ON books (isbn)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS books_read_date ON books (read_date)')
+
+    def _query(self, sql, parameters=()):
+        """
+        Run a SELECT over all book columns and return Book objects.
+
+        Args:
+            sql (str): SQL appended after 'SELECT <columns> FROM books'
+            parameters (tuple): Query parameters
+
+        Returns:
+            list: A list of Book objects
+        """
+        rows = self._connection.execute(
+            f'SELECT {", ".join(BOOK_COLUMNS)} FROM books {sql}', parameters
+        )
+        return [Book.from_list(list(row)) for row in rows]
+
+    def upsert_books(self, books):
+        """
+        Insert new books and update changed ones in a single transaction.
+
+        Rows whose data did not change are left untouched.
+
+        Args:
+            books (list): A list of Book objects
+
+        Returns:
+            int: The number of inserted or updated rows
+        """
+        updates = ', '.join(f'{column} = excluded.{column}' for column in BOOK_COLUMNS[1:])
+        changed = ' OR '.join(f'books.{column} IS NOT excluded.{column}' for column in BOOK_COLUMNS[1:])
+        sql = (
+            f'INSERT INTO books ({", ".join(BOOK_COLUMNS)}) '
+            f'VALUES ({", ".join("?" * len(BOOK_COLUMNS))}) '
+            f'ON CONFLICT (book_id) DO UPDATE SET {updates} WHERE {changed}'
+        )
+
+        before = self._connection.total_changes
+        with self._connection:
+            self._connection.executemany(sql, (book.to_list() for book in books))
+        return self._connection.total_changes - before
+
+    def delete_books(self, book_ids):
+        """
+        Delete books by their IDs.
+
+        Args:
+            book_ids (iterable): IDs of the books to delete
+        """
+        with self._connection:
+            self._connection.executemany(
+                'DELETE FROM books WHERE book_id = ?', ((book_id,) for book_id in book_ids)
+            )
+
+    def get_book(self, book_id):
+        """
+        Look up a book by its ID.
+
+        Args:
+            book_id (str): The ID of the book
+
+        Returns:
+            Book: The Book object, or None if there is no such book
+        """
+        books = self._query('WHERE book_id = ?', (book_id,))
+        return books[0] if books else None
+
+    def find_by_author(self, author):
+        """
+        Find all books by the given author.
+
+        Args:
+            author (str): The author, exactly as stored
+
+        Returns:
+            list: A list of Book objects
+        """
+        return self._query('WHERE author = ? ORDER BY title', (author,))
+
+    def find_by_isbn(self, isbn):
+        """
+        Find all books with the given ISBN.
+
+        Args:
+            isbn (str): The ISBN
+
+        Returns:
+            list: A list of Book objects
+        """
+        return self._query('WHERE isbn = ?', (isbn,))
+
+    def find_read_between(self, start_date, end_date):
+        """
+        Find books read within a date range.
+
+        Args:
+            start_date (str): First date of the range, in YYYY-MM-DD format
+            end_date (str): Last date of the range, in YYYY-MM-DD format
+
+        Returns:
+            list: A list of Book objects ordered by read date
+        """
+        return self._query(
+            'WHERE read_date BETWEEN ? AND ? ORDER BY read_date', (start_date, end_date)
+        )
+
+    def load_books(self):
+        """
+        Load all books.
+
+        Returns:
+            list: A list of Book objects in the order they were first saved
+        """
+        return self._query('ORDER BY rowid')
+
+    def count(self):
+        """
+        Return the number of stored books.
+
+        Returns:
+            int: The number of books
+        """
+        return self._connection.execute('SELECT COUNT(*) FROM books').fetchone()[0]
+
+    def close(self):
+        """Close the database."""
+        if self._connection:
+            self._connection.close()
+            self._connection = None
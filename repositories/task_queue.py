@@ -0,0 +1,251 @@
+"""
+Enrichment task queue for the Lubimyczytac.pl web scraper.
+
+This module contains the EnrichmentTaskQueue class, a durable SQLite queue
+of book enrichment tasks shared by a coordinator and any number of worker
+processes on the same machine.
+"""
+
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from models.book import Book
+from repositories.details_cache import BookDetailsCache
+
+class EnrichmentTaskQueue:
+    """
+    Durable queue of book enrichment tasks with leases.
+
+    A worker leases a batch of tasks for lease_timeout seconds. Tasks whose
+    lease expires, e.g. because the worker crashed, become available to other
+    workers again. A task that was leased max_attempts times without being
+    completed is marked as failed and is not handed out any more. Every process opens its own EnrichmentTaskQueue on the
+    same database file. The database uses SQLite's WAL mode, which needs
+    shared memory between the processes, so the file must be on a local
+    disk and not on a network filesystem.
+    """
+
+    PENDING = 'pending'
+    LEASED = 'leased'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, filename, lease_timeout=300, clock=time.time, max_attempts=3):
+        """
+        Initialize the EnrichmentTaskQueue and create the database if needed.
+
+        Args:
+            filename (str): Path to the SQLite database file
+            lease_timeout (float): Time in seconds after which a leased task is handed out again
+            clock (callable): Function returning the current time in seconds
+            max_attempts (int): Number of leases after which an unfinished task is marked as failed
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.filename = filename
+        self.lease_timeout = lease_timeout
+        self.clock = clock
+        self.max_attempts = max_attempts
+        # Transakcje sterowane ręcznie, oczekiwanie na blokady innych procesów
+        self._connection = sqlite3.connect(filename, timeout=30, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS tasks ('
+            'book_id TEXT PRIMARY KEY, book_link TEXT NOT NULL, title TEXT NOT NULL DEFAULT \'\', '
+            'status TEXT NOT NULL, worker TEXT, lease_expires REAL, attempts INTEGER NOT NULL DEFAULT 0, '
+            'isbn TEXT, original_title TEXT)'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, lease_expires)')
+
+    def __enter__(self):
+        """
+        Return the queue when entering a context.
+
+        Returns:
+            EnrichmentTaskQueue: The EnrichmentTaskQueue instance
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Close the database when exiting a context.
+
+        Args:
+            exc_type: Exception type
+            exc_val: Exception value
+            exc_tb: Exception traceback
+        """
+        self.close()
+
+    def enqueue(self, books):
+        """
+        Add enrichment tasks for books that are not queued yet.
+
+        Args:
+            books (list): A list of Book objects
+
+        Returns:
+            int: The number of added tasks
+        """
+        before = self._connection.total_changes
+        self._connection.execute('BEGIN IMMEDIATE')
+        try:
+            self._connection.executemany(
+                'INSERT OR IGNORE INTO tasks (book_id, book_link, title, status) VALUES (?, ?, ?, ?)',
+                ((key, book.book_link, book.title, self.PENDING)
+                 for book in books
+                 for key in [BookDetailsCache.book_key(book)]
+                 if key and book.book_link)
+            )
+            self._connection.execute('COMMIT')
+        except Exception:
+            self._connection.execute('ROLLBACK')
+            raise
+        return self._connection.total_changes - before
+
+    def lease(self, worker_id, limit=10):
+        """
+        Lease pending tasks and tasks with an expired lease.
+
+        Tasks with an expired lease that were already leased max_attempts
+        times are marked as failed instead.
+
+        Args:
+            worker_id (str): ID of the worker taking the tasks
+            limit (int): Maximum number of tasks to lease
+
+        Returns:
+            list: Book objects with book_id, title and book_link set
+        """
+        now = self.clock()
+        # BEGIN IMMEDIATE blokuje zapis, więc dwa procesy nie wezmą tego samego zadania
+        self._connection.execute('BEGIN IMMEDIATE')
+        try:
+            self._connection.execute(
+                'UPDATE tasks SET status = ?, worker = NULL, lease_expires = NULL '
+                'WHERE status = ? AND lease_expires < ? AND attempts >= ?',
+                (self.FAILED, self.LEASED, now, self.max_attempts)
+            )
+            rows = self._connection.execute(
+                'SELECT book_id, book_link, title FROM tasks '
+                'WHERE status = ? OR (status = ? AND lease_expires < ?) '
+                'ORDER BY rowid LIMIT ?',
+                (self.PENDING, self.LEASED, now, limit)
+            ).fetchall()
+            self._connection.executemany(
+                'UPDATE tasks SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1 '
+                'WHERE book_id = ?',
+                ((self.LEASED, worker_id, now + self.lease_timeout, row[0]) for row in rows)
+            )
+            self._connection.execute('COMMIT')
+        except Exception:
+            self._connection.execute('ROLLBACK')
+            raise
+        return [Book(book_id=book_id, book_link=book_link, title=title) for book_id, book_link, title in rows]
+
+    def complete(self, worker_id, books):
+        """
+        Store the results of enriched books and mark their tasks as done.
+
+        Only tasks still leased to the worker are updated; a task whose lease
+        expired and was handed out to another worker is left to that worker.
+
+        Args:
+            worker_id (str): ID of the worker that leased the tasks
+            books (list): A list of enriched Book objects returned by lease()
+
+        Returns:
+            int: The number of tasks marked as done
+        """
+        before = self._connection.total_changes
+        self._connection.execute('BEGIN IMMEDIATE')
+        try:
+            self._connection.executemany(
+                'UPDATE tasks SET status = ?, worker = NULL, lease_expires = NULL, '
+                'isbn = ?, original_title = ? WHERE book_id = ? AND status = ? AND worker = ?',
+                ((self.DONE, book.isbn, book.original_title, book.book_id, self.LEASED, worker_id)
+                 for book in books)
+            )
+            self._connection.execute('COMMIT')
+        except Exception:
+            self._connection.execute('ROLLBACK')
+            raise
+        return self._connection.total_changes - before
+
+    def release(self, worker_id, books):
+        """
+        Return leased tasks to the queue without results.
+
+        Only tasks still leased to the worker are returned. Tasks that were
+        already leased max_attempts times are marked as failed instead.
+
+        Args:
+            worker_id (str): ID of the worker that leased the tasks
+            books (list): A list of Book objects returned by lease()
+
+        Returns:
+            int: The number of tasks returned to the queue or marked as failed
+        """
+        before = self._connection.total_changes
+        self._connection.executemany(
+            'UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, '
+            'worker = NULL, lease_expires = NULL '
+            'WHERE book_id = ? AND status = ? AND worker = ?',
+            ((self.max_attempts, self.FAILED, self.PENDING, book.book_id, self.LEASED, worker_id)
+             for book in books)
+        )
+        return self._connection.total_changes - before
+
+    def has_unfinished(self):
+        """
+        Check whether any task is not finished yet.
+
+        Returns:
+            bool: True if there are pending or leased tasks
+        """
+        row = self._connection.execute(
+            'SELECT 1 FROM tasks WHERE status IN (?, ?) LIMIT 1', (self.PENDING, self.LEASED)
+        ).fetchone()
+        return row is not None
+
+    def results(self):
+        """
+        Return the results of all finished tasks.
+
+        Returns:
+            dict: Mapping of book_id to (isbn, original_title)
+        """
+        rows = self._connection.execute(
+            'SELECT book_id, isbn, original_title FROM tasks WHERE status = ?', (self.DONE,)
+        )
+        return {book_id: (isbn, original_title) for book_id, isbn, original_title in rows}
+
+    def counts(self):
+        """
+        Return the number of tasks in each state.
+
+        Returns:
+            dict: Mapping of status to the number of tasks
+        """
+        counts = {self.PENDING: 0, self.LEASED: 0, self.DONE: 0, self.FAILED: 0}
+        counts.update(self._connection.execute('SELECT status, COUNT(*) FROM tasks GROUP BY status'))
+        return counts
+
+    def close(self):
+        """Close the database."""
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+def new_worker_id():
+    """
+    Return a unique ID for a queue worker.
+
+    Returns:
+        str: The worker ID, made of the host name, process ID and a random suffix
+    """
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
@@ -0,0 +1,47 @@
+"""
+Benchmark runner script for the Lubimyczytac.pl web scraper.
+
+This script benchmarks the data processing path on synthetic libraries and
+compares the results with a saved JSON baseline.
+"""
+
+import argparse
+import sys
+import tempfile
+from benchmarks.data_path import (
+    DEFAULT_SIZES, compare_with_baseline, load_baseline, run_benchmarks, save_baseline
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of the Lubimyczytac.pl data path")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="numbers of books in the synthetic libraries")
+    parser.add_argument('--baseline', default='benchmarks/baseline.json',
+                        help="path to the JSON baseline")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="save the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed relative regression before the run fails")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the peak memory measurement")
+    args = parser.parse_args()
+    
+    print("Running benchmarks for Lubimyczytac.pl web scraper...")
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        report = run_benchmarks(args.sizes, workdir, measure_memory=not args.no_memory)
+    
+    baseline = load_baseline(args.baseline)
+    if baseline is None or args.update_baseline:
+        save_baseline(report, args.baseline)
+        print(f"Saved baseline to '{args.baseline}'")
+        sys.exit(0)
+    
+    regressions = compare_with_baseline(report, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    if not regressions:
+        print("No regressions compared to the baseline")
+    
+    # Exit with an error code if any benchmark regressed
+    sys.exit(1 if regressions else 0)
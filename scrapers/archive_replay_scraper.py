@@ -0,0 +1,113 @@
+"""
+Archive replay scraper for the Lubimyczytac.pl web scraper.
+
+This module contains the ArchiveReplayScraper class that parses pages
+recorded in a PageArchive instead of visiting Lubimyczytac.pl.
+"""
+
+from scrapers.book_page_parser import apply_book_details, parse_book_details, parse_listing_page
+from scrapers.book_scraper import build_page_url
+
+class ArchiveReplayScraper:
+    """
+    Browserless scraper replaying pages from a PageArchive.
+
+    This class offers the scrape_profile, get_book_details and enrich_books
+    methods of BookScraper, but reads the pages recorded by an earlier run, so
+    a fixed parser can be rerun over thousands of books in seconds.
+    """
+
+    def __init__(self, archive):
+        """
+        Initialize the ArchiveReplayScraper.
+
+        Args:
+            archive (PageArchive): Archive with the recorded pages
+        """
+        self.archive = archive
+        self.cache = None
+        self.missing = 0
+
+    def __enter__(self):
+        """
+        Return the scraper when entering a context.
+
+        Returns:
+            ArchiveReplayScraper: The ArchiveReplayScraper instance
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Report pages missing from the archive when exiting a context.
+
+        Args:
+            exc_type: Exception type
+            exc_val: Exception value
+            exc_tb: Exception traceback
+        """
+        if self.missing:
+            print(f"Brak {self.missing} stron w archiwum")
+
+    def scrape_profile(self, profile_url, known_ids=None):
+        """
+        Parse the archived pages of a user's book list.
+
+        Args:
+            profile_url (str): URL of the user's book list, as passed to BookScraper
+            known_ids (set): IDs of books scraped in a previous run, or None
+
+        Returns:
+            list: A list of Book objects
+        """
+        all_books = []
+        page_number = 1
+        while True:
+            page_url = build_page_url(profile_url, page_number)
+            html = self.archive.get(page_url)
+            if html is None:
+                break
+
+            page_books = parse_listing_page(html, page_url)
+            all_books.extend(page_books)
+
+            # Cała strona to znane książki — starsze strony nie zawierają nowych
+            if known_ids is not None and page_books and all(
+                book.book_id in known_ids for book in page_books
+            ):
+                break
+            page_number += 1
+
+        print(f"Odtworzono {page_number - 1 if html is None else page_number} stron listy z archiwum")
+        return all_books
+
+    def get_book_details(self, book):
+        """
+        Get additional details for a book from its archived page.
+
+        Args:
+            book (Book): A Book object with at least the book_link attribute set
+
+        Returns:
+            Book: The same Book object, with ISBN and original title fields populated
+                if the page is archived
+        """
+        html = self.archive.get(book.book_link) if book.book_link else None
+        if html is None:
+            self.missing += 1
+            return book
+        return apply_book_details(book, *parse_book_details(html))
+
+    def enrich_books(self, books):
+        """
+        Enrich book data with ISBN and original titles from the archive.
+
+        Args:
+            books (list): A list of Book objects
+
+        Returns:
+            list: The same list of books, but with ISBN and original title fields populated
+        """
+        for book in books:
+            self.get_book_details(book)
+        return books
@@ -0,0 +1,222 @@
+"""
+Asynchronous book scraper for the Lubimyczytac.pl web scraper.
+
+This module contains the AsyncBookScraper class that fetches many book pages
+concurrently with asyncio and aiohttp, under a concurrency limit and a
+per-host request rate limit.
+"""
+
+import asyncio
+import time
+from urllib.parse import urlsplit
+import aiohttp
+from scrapers.book_page_parser import apply_book_details, parse_book_details
+from scrapers.http_book_scraper import DEFAULT_HEADERS
+
+class TokenBucket:
+    """
+    Token bucket rate limiter for asyncio code.
+
+    Tokens are refilled continuously at a fixed rate up to the bucket
+    capacity; every request consumes one token.
+    """
+
+    def __init__(self, rate, capacity):
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            rate (float): Number of tokens added per second
+            capacity (int): Maximum number of tokens (allowed burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = None
+
+    async def acquire(self):
+        """Wait until a token is available and consume it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self.updated_at is not None:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncBookScraper:
+    """
+    Asynchronous scraper for book details from Lubimyczytac.pl.
+
+    This class is the asyncio counterpart of BookScraper.enrich_books. All
+    book pages are requested concurrently; a semaphore bounds the number of
+    requests in flight and a token bucket per host bounds the request rate.
+    """
+
+    def __init__(self, concurrency=50, rate=10.0, burst=10, timeout=10, cache=None, metrics=None):
+        """
+        Initialize the AsyncBookScraper.
+
+        Args:
+            concurrency (int): Maximum number of requests in flight
+            rate (float): Maximum number of requests per second to a single host
+            burst (int): Number of requests that may be sent to a host at once
+            timeout (float): Timeout in seconds for a single request
+            cache (BookDetailsCache): Optional cache of already fetched book details
+            metrics (RunMetrics): Optional metrics receiving fetch latencies and error counts
+        """
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.timeout = timeout
+        self.cache = cache
+        self.metrics = metrics
+        self.session = None
+        self._semaphore = None
+        self._buckets = {}
+        self.failed_links = set()
+
+    async def __aenter__(self):
+        """
+        Set up the HTTP session when entering an async context.
+
+        Returns:
+            AsyncBookScraper: The AsyncBookScraper instance
+        """
+        self.session = aiohttp.ClientSession(
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._buckets = {}
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        Close the HTTP session when exiting an async context.
+
+        Args:
+            exc_type: Exception type
+            exc_val: Exception value
+            exc_tb: Exception traceback
+        """
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def _bucket_for(self, url):
+        """
+        Return the token bucket of the host the URL points to.
+
+        Args:
+            url (str): URL of the page to fetch
+
+        Returns:
+            TokenBucket: The token bucket shared by all requests to that host
+        """
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    async def get_book_details(self, book):
+        """
+        Get additional details for a book.
+
+        Args:
+            book (Book): A Book object with at least the book_link attribute set
+
+        Returns:
+            Book: The same Book object, but with ISBN and original title fields populated
+        """
+        if not self.session:
+            raise ValueError("HTTP session not initialized. Use async with statement.")
+
+        url = book.book_link
+
+        # Return the book unchanged if URL is invalid
+        if not url or not url.startswith("http"):
+            print(f"❌ Nieprawidłowy URL: {url}")
+            return book
+
+        if self.cache:
+            cached = self.cache.get(book)
+            if cached:
+                book.isbn, book.original_title = cached
+                return book
+
+        async with self._semaphore:
+            await self._bucket_for(url).acquire()
+            start = time.perf_counter()
+            try:
+                async with self.session.get(url) as response:
+                    response.raise_for_status()
+                    html = await response.text()
+            except Exception as e:
+                print(f"Błąd pobierania danych z {url}: {e}")
+                html = None
+                if self.metrics:
+                    self.metrics.increment(
+                        'book_timeouts' if isinstance(e, asyncio.TimeoutError) else 'book_errors'
+                    )
+            if self.metrics:
+                self.metrics.observe('book_fetch', time.perf_counter() - start)
+
+        # Parsowanie odbywa się od razu po nadejściu odpowiedzi
+        isbn, original_title = parse_book_details(html) if html is not None else (None, None)
+        apply_book_details(book, isbn, original_title)
+        # Jak w HttpBookScraper: bez ISBN lub sekcji szczegółów pobranie się nie udało
+        if isbn is None or original_title is None:
+            self.failed_links.add(url)
+        else:
+            self.failed_links.discard(url)
+            if self.cache:
+                self.cache.put(book)
+        return book
+
+    async def enrich_books(self, books, on_book=None):
+        """
+        Enrich book data with ISBN and original titles concurrently.
+
+        Args:
+            books (list): A list of Book objects
+            on_book (callable): Optional function called as on_book(book, fetched) as soon as
+                a book is enriched; fetched is False if its page could not be downloaded
+
+        Returns:
+            list: The same list of books, but with ISBN and original title fields populated
+        """
+        tasks = [asyncio.ensure_future(self.get_book_details(book)) for book in books]
+        for task in asyncio.as_completed(tasks):
+            book = await task
+            if on_book:
+                on_book(book, book.book_link not in self.failed_links)
+        if self.cache:
+            self.cache.print_stats()
+        return books
+
+
+def enrich_books_async(books, on_book=None, **kwargs):
+    """
+    Enrich book data with AsyncBookScraper from synchronous code.
+
+    Args:
+        books (list): A list of Book objects
+        on_book (callable): Optional function called as on_book(book, fetched) as soon as
+            a book is enriched; see AsyncBookScraper.enrich_books
+        **kwargs: Arguments passed to AsyncBookScraper
+
+    Returns:
+        list: The same list of books, but with ISBN and original title fields populated
+    """
+    async def run():
+        async with AsyncBookScraper(**kwargs) as scraper:
+            return await scraper.enrich_books(books, on_book=on_book)
+
+    return asyncio.run(run())
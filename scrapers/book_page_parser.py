@@ -0,0 +1,274 @@
+"""
+Book page parser for the Lubimyczytac.pl web scraper.
+
+This module contains functions that extract book data from raw HTML of
+Lubimyczytac.pl pages, without the need for a running browser.
+"""
+
+import json
+import re
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from models.book import Book
+
+ORIGINAL_TITLE_LABEL = "Tytuł oryginału:"
+
+
+def parse_book_details(html):
+    """
+    Extract the ISBN and original title from the HTML of a book page.
+
+    Args:
+        html (str): HTML source of the book page
+
+    Returns:
+        tuple: (isbn, original_title), where each value is None if the
+            corresponding element is missing from the page. original_title
+            is 'BRAK' if the details section exists but has no original title.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    # --- pobranie ISBN ---
+    isbn = None
+    isbn_meta = soup.find("meta", attrs={"property": "books:isbn"})
+    if isbn_meta is not None:
+        isbn = (isbn_meta.get("content") or "").strip()
+
+    # --- sekcja szczegółów ---
+    original_title = None
+    details_section = soup.find(id="book-details")
+    if details_section is not None:
+        original_title = "BRAK"
+        for dt in details_section.find_all("dt"):
+            if ORIGINAL_TITLE_LABEL in dt.get_text():
+                dd = dt.find_next("dd")
+                if dd is not None:
+                    original_title = dd.get_text().strip()
+                break
+
+    return isbn, original_title
+
+
+READERS_PATTERN = re.compile(r'Czytelnicy:?\s*(\d{1,3}(?:[\s.]\d{3})+|\d+)')
+
+
+def _count_text(value):
+    """
+    Return a count as digits only, e.g. '1 133' or 1133.0 as '1133'.
+
+    Args:
+        value: The count as a string or a number
+
+    Returns:
+        str: The digits of the count
+    """
+    if isinstance(value, (int, float)):
+        return str(int(value))
+    return re.sub(r'\D', '', value)
+
+
+def _aggregate_rating(soup):
+    """
+    Return the aggregateRating object from the JSON-LD data of a page.
+
+    Args:
+        soup (BeautifulSoup): Parsed page
+
+    Returns:
+        dict: The aggregateRating object, or an empty dict if there is none
+    """
+    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        try:
+            data = json.loads(script.string or '')
+        except ValueError:
+            continue
+        for item in data if isinstance(data, list) else [data]:
+            if isinstance(item, dict) and isinstance(item.get("aggregateRating"), dict):
+                return item["aggregateRating"]
+    return {}
+
+
+def parse_book_stats(html):
+    """
+    Extract the volatile statistics of a book from the HTML of its page.
+
+    The ratings are read from the JSON-LD aggregateRating of the page, with
+    the books:rating:value meta tag as a fallback for the average rating.
+    Values are formatted like on the profile list: the average rating with
+    a decimal comma and counts as plain digits.
+
+    Args:
+        html (str): HTML source of the book page
+
+    Returns:
+        dict: Values for the keys avg_rating, rating_count, readers and opinions
+            that were found on the page
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    rating = _aggregate_rating(soup)
+    stats = {}
+
+    avg_rating = rating.get("ratingValue")
+    if avg_rating is None:
+        rating_meta = soup.find("meta", attrs={"property": "books:rating:value"})
+        avg_rating = rating_meta.get("content") if rating_meta is not None else None
+    if avg_rating not in (None, ''):
+        stats['avg_rating'] = str(avg_rating).strip().replace('.', ',')
+
+    if rating.get("ratingCount") not in (None, ''):
+        stats['rating_count'] = _count_text(rating["ratingCount"])
+    if rating.get("reviewCount") not in (None, ''):
+        stats['opinions'] = _count_text(rating["reviewCount"])
+
+    readers = READERS_PATTERN.search(soup.get_text(' '))
+    if readers:
+        stats['readers'] = _count_text(readers.group(1))
+
+    return stats
+
+
+def apply_book_details(book, isbn, original_title):
+    """
+    Store parsed book details on a Book object.
+
+    Missing values are replaced the same way as in BookScraper.get_book_details:
+    an empty ISBN and the Polish title in place of the original title.
+
+    Args:
+        book (Book): The Book object to update
+        isbn (str): The parsed ISBN, or None
+        original_title (str): The parsed original title, 'BRAK' or None
+
+    Returns:
+        Book: The same Book object
+    """
+    book.isbn = isbn or ''
+    book.original_title = original_title or 'BRAK'
+
+    # If original title is not found, use the Polish title
+    if book.original_title == 'BRAK':
+        book.original_title = book.title
+
+    return book
+
+
+STANDARD_SHELVES = {"Przeczytane", "Teraz czytam", "Chcę przeczytać"}
+
+
+def split_shelves(shelf_names):
+    """
+    Split shelf names into standard shelves and user-defined shelves.
+
+    Args:
+        shelf_names (list): Names of all shelves the book is on
+
+    Returns:
+        tuple: (shelves, self_shelves), both joined with ', '
+    """
+    shelves = ', '.join([s for s in shelf_names if s in STANDARD_SHELVES])
+    self_shelves = ', '.join([s for s in shelf_names if s not in STANDARD_SHELVES])
+    return shelves, self_shelves
+
+
+def book_from_listing_fields(fields):
+    """
+    Create a Book object from raw texts of a book row on the profile list.
+
+    The texts are normalized the same way as in BookScraper._extract_book_data.
+
+    Args:
+        fields (dict): Raw texts of a book row with the keys id, title, author,
+            link, cycle, avg_rating, user_rating, rating_count, small_grey,
+            read_date and shelves. A missing element is represented by None.
+
+    Returns:
+        Book: A Book object with the extracted data
+    """
+    def text(key):
+        return (fields.get(key) or '').strip()
+
+    cycle = fields.get('cycle') or ''
+    cycle = cycle[6:] if len(cycle) > 6 else ''
+
+    readers = ''
+    opinions = ''
+    for ro in fields.get('small_grey') or []:
+        ro = ro.strip()
+        if 'Czytelnicy:' in ro:
+            readers = ro.replace('Czytelnicy:', '').strip()
+        elif 'Opinie:' in ro:
+            opinions = ro.replace('Opinie:', '').strip()
+
+    shelves, self_shelves = split_shelves([name.strip() for name in fields.get('shelves') or []])
+
+    return Book(
+        book_id=(fields.get('id') or '').replace('listBookElement', ''),
+        title=text('title'),
+        author=text('author'),
+        cycle=cycle,
+        avg_rating=text('avg_rating'),
+        rating_count=text('rating_count').replace('ocen', '').strip(),
+        readers=readers,
+        opinions=opinions,
+        user_rating=text('user_rating'),
+        book_link=fields.get('link') or '',
+        read_date=text('read_date').replace('Przeczytał:', '').strip(),
+        shelves=shelves,
+        self_shelves=self_shelves
+    )
+
+
+def _inner_text(element):
+    """
+    Return the visible text of an element with collapsed whitespace.
+
+    Args:
+        element: BeautifulSoup element, or None
+
+    Returns:
+        str: The text, or None if there is no element
+    """
+    if element is None:
+        return None
+    return ' '.join(element.get_text(' ').split())
+
+
+def parse_listing_page(html, base_url=None):
+    """
+    Extract all books from the HTML of a profile list page.
+
+    This is the BeautifulSoup counterpart of the script used by
+    BookScraper._extract_page_books, so archived list pages can be parsed
+    without a browser.
+
+    Args:
+        html (str): HTML source of the list page
+        base_url (str): URL of the page, used to resolve relative book links
+
+    Returns:
+        list: A list of Book objects
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    books = []
+    for row in soup.find_all(class_="authorAllBooks__single"):
+        ratings = row.find_all(class_="listLibrary__rating")
+        shelf = row.find(class_="authorAllBooks__singleTextShelfRight")
+        link = row.find("a", href=True)
+
+        def text(root, class_name):
+            return _inner_text(root.find(class_=class_name)) if root is not None else None
+
+        books.append(book_from_listing_fields({
+            'id': row.get('id'),
+            'title': text(row, 'authorAllBooks__singleTextTitle'),
+            'author': text(row, 'authorAllBooks__singleTextAuthor'),
+            'link': urljoin(base_url or '', link['href']) if link is not None else None,
+            'cycle': text(row, 'listLibrary__info--cycles'),
+            'avg_rating': text(ratings[0] if ratings else None, 'listLibrary__ratingStarsNumber'),
+            'user_rating': text(ratings[1] if len(ratings) > 1 else None, 'listLibrary__ratingStarsNumber'),
+            'rating_count': text(row, 'listLibrary__ratingAll'),
+            'small_grey': [_inner_text(e) for e in row.select('.small.grey')],
+            'read_date': text(row, 'authorAllBooks__read-dates'),
+            'shelves': [_inner_text(a) for a in shelf.find_all('a')] if shelf is not None else [],
+        }))
+    return books
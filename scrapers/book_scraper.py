@@ -11,8 +11,121 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
+import re
 import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from models.book import Book
+from scrapers.book_page_parser import book_from_listing_fields, split_shelves
+
+# Opcje Chrome dla trybu oszczędnego
+LEAN_CHROME_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--blink-settings=imagesEnabled=false",
+]
+
+# Zasoby niepotrzebne do odczytu danych książek
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.css",
+    "*.mp4", "*.webm", "*.mp3",
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*",
+]
+
+# Najwyższy numer strony widoczny w paginatorze listy
+PAGE_COUNT_SCRIPT = """
+var pages = Array.prototype.map.call(
+    document.querySelectorAll('.pagination a, .pagination span, .paginator a, .paginator span'),
+    function (e) { return parseInt(e.innerText, 10); }
+).filter(function (n) { return !isNaN(n); });
+return pages.length ? Math.max.apply(null, pages) : null;
+"""
+
+# Zbiera surowe teksty wszystkich książek ze strony w jednym wywołaniu WebDrivera
+EXTRACT_BOOKS_SCRIPT = """
+function text(root, className) {
+    var element = root.getElementsByClassName(className)[0];
+    return element ? element.innerText : null;
+}
+return Array.prototype.map.call(
+    document.getElementsByClassName('authorAllBooks__single'),
+    function (book) {
+        var ratings = book.getElementsByClassName('listLibrary__rating');
+        var shelf = book.getElementsByClassName('authorAllBooks__singleTextShelfRight')[0];
+        var link = book.getElementsByTagName('a')[0];
+        return {
+            id: book.id,
+            title: text(book, 'authorAllBooks__singleTextTitle'),
+            author: text(book, 'authorAllBooks__singleTextAuthor'),
+            link: link ? link.href : null,
+            cycle: text(book, 'listLibrary__info--cycles'),
+            avg_rating: ratings[0] ? text(ratings[0], 'listLibrary__ratingStarsNumber') : null,
+            user_rating: ratings[1] ? text(ratings[1], 'listLibrary__ratingStarsNumber') : null,
+            rating_count: text(book, 'listLibrary__ratingAll'),
+            small_grey: Array.prototype.map.call(
+                book.querySelectorAll('.small.grey'), function (e) { return e.innerText; }
+            ),
+            read_date: text(book, 'authorAllBooks__read-dates'),
+            shelves: shelf ? Array.prototype.map.call(
+                shelf.getElementsByTagName('a'), function (a) { return a.innerText; }
+            ) : []
+        };
+    }
+);
+"""
+
+PROFILE_ID_PATTERN = re.compile(r'/profil/(\d+)')
+
+# Parametry listy książek użytkownika; objectId to identyfikator profilu
+LIST_URL_SUFFIX = (
+    '/biblioteczka/lista?page=1&listId=booksFilteredList&findString=&kolejnosc=data-dodania'
+    '&listType=list&objectId={profile_id}&own=0&paginatorType=Standard'
+)
+
+def get_profile_id(profile_url):
+    """
+    Return the numeric ID of a user's profile.
+    
+    Args:
+        profile_url (str): URL of the profile, e.g. https://lubimyczytac.pl/profil/605200/stokuj
+    
+    Returns:
+        str: The profile ID
+    """
+    match = PROFILE_ID_PATTERN.search(profile_url)
+    if not match:
+        raise ValueError(f"Profile ID not found in URL: {profile_url}")
+    return match.group(1)
+
+def build_list_url(profile_url):
+    """
+    Return the URL of the first page of a user's book list.
+    
+    Args:
+        profile_url (str): URL of the user's profile page
+    
+    Returns:
+        str: URL of the book list, sorted by date added
+    """
+    return profile_url.rstrip('/') + LIST_URL_SUFFIX.format(profile_id=get_profile_id(profile_url))
+
+def build_page_url(list_url, page):
+    """
+    Return the URL of the given page of a user's book list.
+    
+    Args:
+        list_url (str): URL of the book list with a page= parameter
+        page (int): Page number, starting from 1
+    
+    Returns:
+        str: The list URL with the page parameter set to the given page
+    """
+    parts = urlsplit(list_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != 'page']
+    query.insert(0, ('page', str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
 
 class BookScraper:
     """
@@ -22,15 +135,35 @@ class BookScraper:
     extracting detailed information about each book.
     """
     
-    def __init__(self, headless=False):
+    def __init__(self, headless=None, cache=None, lean=False, metrics=None, archive=None,
+                 controller=None):
         """
         Initialize the BookScraper with a WebDriver.
         
         Args:
-            headless (bool): Whether to run the browser in headless mode
+            headless (bool): Whether to run the browser in headless mode; if None,
+                the browser is headless only in lean mode
+            cache (BookDetailsCache): Optional cache of already fetched book details
+            lean (bool): Whether to use eager page loading and block images, fonts,
+                stylesheets and media
+            metrics (RunMetrics): Optional metrics receiving page and book fetch latencies
+            archive (PageArchive): Optional archive receiving the HTML of every list
+                and book page visited
+            controller (FetchController): Optional controller retrying failed book page
+                loads; sharing one between the scrapers of a DriverPool also limits
+                how many of them load pages at once
         """
         self.driver = None
-        self.headless = headless
+        self.headless = lean if headless is None else headless
+        self.cache = cache
+        self.lean = lean
+        self.page_load_times = []
+        self.cookies_accepted = False
+        self.cookies_checked = False
+        self.failed_links = set()
+        self.metrics = metrics
+        self.archive = archive
+        self.controller = controller
     
     def __enter__(self):
         """
@@ -42,7 +175,17 @@ class BookScraper:
         chrome_options = Options()
         if self.headless:
             chrome_options.add_argument("--headless=new")
+        if self.lean:
+            # Nie czekamy na obrazki i ramki — wystarczy gotowy DOM
+            chrome_options.page_load_strategy = 'eager'
+            for argument in LEAN_CHROME_ARGUMENTS:
+                chrome_options.add_argument(argument)
+            chrome_options.add_experimental_option(
+                'prefs', {'profile.managed_default_content_settings.images': 2}
+            )
         self.driver = webdriver.Chrome(options=chrome_options)
+        if self.lean:
+            self._block_resources()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -54,68 +197,257 @@ class BookScraper:
             exc_val: Exception value
             exc_tb: Exception traceback
         """
+        if self.page_load_times:
+            print(f"Średni czas ładowania strony: {self.average_page_load_time():.2f}s "
+                  f"({len(self.page_load_times)} stron)")
         if self.driver:
             self.driver.quit()
             self.driver = None
     
-    def scrape_profile(self, profile_url):
+    def _block_resources(self):
+        """Block non-essential resource types through the DevTools protocol."""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"Nie udało się zablokować zasobów: {e}")
+    
+    def _load_page(self, url):
+        """
+        Navigate to a URL and record how long the page took to load.
+        
+        Args:
+            url (str): URL of the page to load
+        """
+        start = time.perf_counter()
+        try:
+            self.driver.get(url)
+        finally:
+            self.page_load_times.append(time.perf_counter() - start)
+    
+    def _fetch_page(self, url):
+        """
+        Load a book page, through the fetch controller if there is one.
+        
+        Args:
+            url (str): URL of the page to load
+        """
+        if self.controller:
+            self.controller.call(self._load_page, url)
+        else:
+            self._load_page(url)
+    
+    def _observe(self, name, start):
+        """
+        Record the latency of an operation started at the given time.
+        
+        Args:
+            name (str): Name of the latency histogram
+            start (float): time.perf_counter() value from the start of the operation
+        """
+        if self.metrics:
+            self.metrics.observe(name, time.perf_counter() - start)
+    
+    def _count(self, name):
+        """
+        Increase a metrics counter.
+        
+        Args:
+            name (str): Name of the counter
+        """
+        if self.metrics:
+            self.metrics.increment(name)
+    
+    def _archive_page(self, url, kind):
+        """
+        Store the HTML of the current page in the archive, if there is one.
+        
+        Args:
+            url (str): URL under which the page is archived
+            kind (str): Kind of the page, 'listing' or 'book'
+        """
+        if self.archive is None:
+            return
+        try:
+            self.archive.store(url, self.driver.page_source, kind)
+        except Exception as e:
+            print(f"Błąd archiwizacji strony {url}: {e}")
+    
+    def average_page_load_time(self):
+        """
+        Return the average time of page loads made by this scraper.
+        
+        Returns:
+            float: Average page load time in seconds, or 0.0 if no page was loaded
+        """
+        if not self.page_load_times:
+            return 0.0
+        return sum(self.page_load_times) / len(self.page_load_times)
+    
+    def scrape_profile(self, profile_url, known_ids=None):
         """
         Scrape book data from a user's profile on Lubimyczytac.pl.
         
         This method navigates through all pages of a user's book list,
-        extracting detailed information about each book.
+        extracting detailed information about each book. If known_ids is given,
+        the list is expected to be sorted by date added and paging stops after
+        the first page consisting only of already known books.
         
         Args:
             profile_url (str): URL of the user's profile page
+            known_ids (set): IDs of books scraped in a previous run, or None
         
         Returns:
             list: A list of Book objects
         """
-        if not self.driver:
-            raise ValueError("WebDriver not initialized. Use with statement.")
+        all_books = []
+        for page_books in self.iter_profile_pages(profile_url, known_ids):
+            all_books.extend(page_books)
+        return all_books
+    
+    def iter_profile_pages(self, profile_url, known_ids=None):
+        """
+        Scrape a user's book list page by page.
         
-        self.driver.get(profile_url)
+        This is the streaming counterpart of scrape_profile(): the books of each
+        page are yielded as soon as the page is extracted.
         
-        # Akceptacja ciasteczek, jeśli przycisk się pojawi
-        try:
-            accept_btn = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, '//button[contains(text(), "Akcept")]'))
-            )
-            time.sleep(1)
-            accept_btn.click()
-        except:
-            print("Nie znaleziono przycisku akceptacji ciasteczek.")
+        Args:
+            profile_url (str): URL of the user's profile page
+            known_ids (set): IDs of books scraped in a previous run, or None
         
-        all_books = []
+        Yields:
+            list: The Book objects of a single page
+        """
+        if not self.driver:
+            raise ValueError("WebDriver not initialized. Use with statement.")
+        
+        page_start = time.perf_counter()
+        page_number = 1
+        self._load_page(profile_url)
+        self._accept_cookies()
         
         while True:
             # Czekaj aż książki się załadują
-            try:
-                WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, 'authorAllBooks__single'))
-                )
-            except TimeoutException:
+            if not self._wait_for_books():
                 print("Brak książek na stronie — zakończono zbieranie.")
                 break
             
-            books = self.driver.find_elements(By.CLASS_NAME, 'authorAllBooks__single')
+            page_books = self._extract_page_books()
+            self._observe('page_fetch', page_start)
+            self._archive_page(build_page_url(profile_url, page_number), 'listing')
+            yield page_books
             
-            for book in books:
-                # Extract book data
-                book_data = self._extract_book_data(book)
-                all_books.append(book_data)
+            # Cała strona to znane książki — starsze strony nie zawierają nowych
+            if known_ids is not None and page_books and all(
+                book.book_id in known_ids for book in page_books
+            ):
+                print("Strona zawiera tylko znane książki — zakończono zbieranie.")
+                break
             
             # Przejście do następnej strony
             try:
                 next_button = self.driver.find_element(By.CLASS_NAME, 'next-page')
                 if 'disabled' in next_button.get_attribute('class'):
                     break
+                page_start = time.perf_counter()
+                page_number += 1
                 next_button.click()
                 time.sleep(1)  # Poczekaj na załadowanie strony
             except:
                 break  # Nie ma przycisku lub już ostatnia strona
+    
+    def scrape_page(self, page_url):
+        """
+        Scrape book data from a single page of a user's book list.
         
-        return all_books
+        Args:
+            page_url (str): URL of the page, e.g. built with build_page_url()
+        
+        Returns:
+            list: A list of Book objects, empty if the page has no books
+        """
+        if not self.driver:
+            raise ValueError("WebDriver not initialized. Use with statement.")
+        
+        page_start = time.perf_counter()
+        self._load_page(page_url)
+        self._accept_cookies()
+        if not self._wait_for_books():
+            print(f"Brak książek na stronie {page_url}")
+            return []
+        page_books = self._extract_page_books()
+        self._observe('page_fetch', page_start)
+        self._archive_page(page_url, 'listing')
+        return page_books
+    
+    def get_page_count(self):
+        """
+        Read the number of pages of the book list from the paginator.
+        
+        Returns:
+            int: The highest page number shown in the paginator, or None if it cannot be read
+        """
+        try:
+            page_count = self.driver.execute_script(PAGE_COUNT_SCRIPT)
+        except Exception as e:
+            print(f"Błąd odczytu liczby stron: {e}")
+            return None
+        return page_count if isinstance(page_count, int) and page_count > 0 else None
+    
+    def _accept_cookies(self):
+        """Accept the cookie banner if it appears; the banner is looked for once per session."""
+        if self.cookies_accepted or self.cookies_checked:
+            return
+        self.cookies_checked = True
+        
+        # Akceptacja ciasteczek, jeśli przycisk się pojawi
+        try:
+            accept_btn = WebDriverWait(self.driver, 10).until(
+                EC.element_to_be_clickable((By.XPATH, '//button[contains(text(), "Akcept")]'))
+            )
+            time.sleep(1)
+            accept_btn.click()
+            self.cookies_accepted = True
+        except:
+            print("Nie znaleziono przycisku akceptacji ciasteczek.")
+    
+    def _wait_for_books(self):
+        """
+        Wait until the books on the current page are loaded.
+        
+        Returns:
+            bool: True if the page contains books, False on timeout
+        """
+        try:
+            WebDriverWait(self.driver, 5).until(
+                EC.presence_of_element_located((By.CLASS_NAME, 'authorAllBooks__single'))
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    def _extract_page_books(self):
+        """
+        Extract data of all books on the current page.
+        
+        All rows are read with a single JavaScript call. If the script fails,
+        the books are extracted element by element with _extract_book_data.
+        
+        Returns:
+            list: A list of Book objects
+        """
+        try:
+            rows = self.driver.execute_script(EXTRACT_BOOKS_SCRIPT)
+        except Exception as e:
+            print(f"Błąd wykonania skryptu: {e}")
+            rows = None
+        
+        if isinstance(rows, list):
+            return [book_from_listing_fields(row) for row in rows]
+        
+        books = self.driver.find_elements(By.CLASS_NAME, 'authorAllBooks__single')
+        return [self._extract_book_data(book) for book in books]
     
     def _extract_book_data(self, book_element):
         """
@@ -218,10 +550,7 @@ class BookScraper:
         try:
             shelf_elem = book_element.find_element(By.CLASS_NAME, 'authorAllBooks__singleTextShelfRight')
             all_shelf_names = [a.text.strip() for a in shelf_elem.find_elements(By.TAG_NAME, 'a')]
-            
-            standard_shelves = {"Przeczytane", "Teraz czytam", "Chcę przeczytać"}
-            shelves = ', '.join([s for s in all_shelf_names if s in standard_shelves])
-            self_shelves = ', '.join([s for s in all_shelf_names if s not in standard_shelves])
+            shelves, self_shelves = split_shelves(all_shelf_names)
         except:
             pass # zostają domyślne puste stringi
         
@@ -267,8 +596,18 @@ class BookScraper:
             print(f"❌ Nieprawidłowy URL: {url}")
             return book
         
+        if self.cache:
+            cached = self.cache.get(book)
+            if cached:
+                book.isbn, book.original_title = cached
+                return book
+        
+        fetched = True
+        loaded = False
+        fetch_start = time.perf_counter()
         try:
-            self.driver.get(url)
+            self._fetch_page(url)
+            loaded = True
             
             # czekamy, aż strona się załaduje
             WebDriverWait(self.driver, 5).until(
@@ -304,18 +643,35 @@ class BookScraper:
             except TimeoutException:
                 print(f"🔍 Nie znaleziono sekcji szczegółów książki na stronie {url}")
                 book.original_title = "BRAK"
+                fetched = False
+                self._count('book_timeouts')
             
         except Exception as e:
             print(f"Błąd pobierania danych z {url}: {e}")
             book.original_title = 'BRAK'
+            fetched = False
+            self._count('book_timeouts' if isinstance(e, TimeoutException) else 'book_errors')
+        
+        self._observe('book_fetch', fetch_start)
+        # Archiwizujemy także strony, których nie udało się sparsować, ale nie
+        # nieudane wczytania — przeglądarka pokazuje wtedy poprzednią stronę
+        if loaded:
+            self._archive_page(url, 'book')
         
         # If original title is not found, use the Polish title
         if book.original_title == 'BRAK':
             book.original_title = book.title
         
+        if fetched:
+            self.failed_links.discard(url)
+            if self.cache:
+                self.cache.put(book)
+        else:
+            self.failed_links.add(url)
+        
         return book
     
-    def enrich_books(self, books):
+    def enrich_books(self, books, report=True):
         """
         Enrich book data with ISBN and original titles.
         
@@ -324,6 +680,7 @@ class BookScraper:
         
         Args:
             books (list): A list of Book objects
+            report (bool): Whether to print the cache and fetch statistics afterwards
         
         Returns:
             list: The same list of books, but with ISBN and original title fields populated
@@ -334,4 +691,14 @@ class BookScraper:
         for book in books:
             self.get_book_details(book)
         
-        return books
\ No newline at end of file
+        if report:
+            self.print_stats()
+        
+        return books
+    
+    def print_stats(self):
+        """Print the cache and fetch statistics of this session."""
+        if self.cache:
+            self.cache.print_stats()
+        if self.controller:
+            self.controller.print_stats()
\ No newline at end of file
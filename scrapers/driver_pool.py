@@ -0,0 +1,227 @@
+"""
+WebDriver pool for the Lubimyczytac.pl web scraper.
+
+This module contains the DriverPool class that runs work concurrently on
+several independent BookScraper sessions.
+"""
+
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from scrapers.book_scraper import BookScraper, build_page_url
+
+class DriverPool:
+    """
+    Pool of independent BookScraper sessions used from a thread pool.
+
+    Each worker thread borrows an idle scraper for a single task and returns
+    it afterwards, so a WebDriver is never used by two threads at once.
+    """
+
+    def __init__(self, size=4, headless=True, scraper_factory=BookScraper, **scraper_kwargs):
+        """
+        Initialize the DriverPool.
+
+        Args:
+            size (int): Number of browser sessions (and worker threads)
+            headless (bool): Whether to run the browsers in headless mode
+            scraper_factory (callable): Callable creating a scraper, called with headless=...
+            **scraper_kwargs: Additional arguments passed to scraper_factory
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.size = size
+        self.headless = headless
+        self.scraper_factory = scraper_factory
+        self.scraper_kwargs = scraper_kwargs
+        self.cache = scraper_kwargs.get('cache')
+        self.archive = scraper_kwargs.get('archive')
+        self.scrapers = []
+        self.worker_stats = []
+        self._idle = None
+
+    def __enter__(self):
+        """
+        Start all browser sessions when entering a context.
+
+        Returns:
+            DriverPool: The DriverPool instance
+        """
+        # Chrome startup is slow, so the sessions are started concurrently
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [
+                executor.submit(lambda: self.scraper_factory(
+                    headless=self.headless, **self.scraper_kwargs
+                ).__enter__())
+                for _ in range(self.size)
+            ]
+
+        started = [future.result() for future in futures if future.exception() is None]
+        failures = [future.exception() for future in futures if future.exception() is not None]
+        if failures:
+            # __exit__ nie zostanie wywołane, więc zamykamy uruchomione sesje tutaj
+            for scraper in started:
+                scraper.__exit__(type(failures[0]), failures[0], failures[0].__traceback__)
+            raise failures[0]
+        self.scrapers = started
+
+        self._idle = queue.Queue()
+        self.worker_stats = []
+        for worker_id, scraper in enumerate(self.scrapers):
+            self._idle.put((worker_id, scraper))
+            self.worker_stats.append({'books': 0, 'seconds': 0.0})
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Close all browser sessions when exiting a context.
+
+        Args:
+            exc_type: Exception type
+            exc_val: Exception value
+            exc_tb: Exception traceback
+        """
+        for scraper in self.scrapers:
+            scraper.__exit__(exc_type, exc_val, exc_tb)
+        self.scrapers = []
+        self._idle = None
+
+    def _run_task(self, func, item):
+        """
+        Run a single task on an idle scraper.
+
+        Args:
+            func (callable): Function called as func(scraper, item)
+            item: The item to process
+
+        Returns:
+            The result of func
+        """
+        worker_id, scraper = self._idle.get()
+        start = time.perf_counter()
+        try:
+            return func(scraper, item)
+        finally:
+            stats = self.worker_stats[worker_id]
+            stats['books'] += 1
+            stats['seconds'] += time.perf_counter() - start
+            self._idle.put((worker_id, scraper))
+
+    @property
+    def failed_links(self):
+        """
+        Return the links of books whose pages could not be fetched by any session.
+
+        Returns:
+            set: Book links
+        """
+        failed_links = set()
+        for scraper in self.scrapers:
+            failed_links |= scraper.failed_links
+        return failed_links
+
+    def map(self, func, items):
+        """
+        Apply a function to every item concurrently across the pool.
+
+        Args:
+            func (callable): Function called as func(scraper, item)
+            items (iterable): Items to process
+
+        Returns:
+            list: Results in the same order as the input items
+        """
+        if self._idle is None:
+            raise ValueError("DriverPool not started. Use with statement.")
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(lambda item: self._run_task(func, item), items))
+
+    def get_book_details(self, book):
+        """
+        Get additional details for a single book on an idle session.
+
+        Args:
+            book (Book): A Book object with at least the book_link attribute set
+
+        Returns:
+            Book: The same Book object, but with ISBN and original title fields populated
+        """
+        if self._idle is None:
+            raise ValueError("DriverPool not started. Use with statement.")
+        return self._run_task(lambda scraper, item: scraper.get_book_details(item), book)
+
+    def enrich_books(self, books, report=True):
+        """
+        Enrich book data with ISBN and original titles using all sessions.
+
+        Args:
+            books (list): A list of Book objects
+            report (bool): Whether to print the worker and cache statistics afterwards
+
+        Returns:
+            list: The enriched books, in the same order as the input list
+        """
+        enriched_books = self.map(lambda scraper, book: scraper.get_book_details(book), books)
+        if report:
+            self.print_stats()
+        return enriched_books
+
+    def print_stats(self):
+        """Print the worker and cache statistics of the pool."""
+        self.print_worker_stats()
+        if self.cache:
+            self.cache.print_stats()
+
+    def scrape_profile(self, profile_url, known_ids=None):
+        """
+        Scrape all pages of a user's book list concurrently.
+
+        The first page is loaded to read the number of pages; the remaining
+        pages are then fetched directly by URL across all sessions. If the
+        number of pages cannot be read, or known_ids is given (paging stops
+        at the first page of already known books), the list is walked page
+        by page on a single session, as in BookScraper.scrape_profile().
+
+        Args:
+            profile_url (str): URL of the user's book list with a page= parameter
+            known_ids (set): IDs of books scraped in a previous run, or None
+
+        Returns:
+            list: A list of Book objects, in the order of the list pages
+        """
+        first_page_url = build_page_url(profile_url, 1)
+        if known_ids is not None:
+            return self.map(
+                lambda scraper, url: scraper.scrape_profile(url, known_ids), [first_page_url]
+            )[0]
+
+        def scrape_first_page(scraper, url):
+            books = scraper.scrape_page(url)
+            if not books:
+                return books, 1
+            page_count = scraper.get_page_count()
+            if page_count is None:
+                print("Nie odczytano liczby stron — przechodzenie strona po stronie.")
+                return scraper.scrape_profile(url), None
+            return books, page_count
+
+        first_books, page_count = self.map(scrape_first_page, [first_page_url])[0]
+        if page_count is None:
+            return first_books
+        print(f"Lista liczy {page_count} stron")
+
+        page_urls = [build_page_url(profile_url, page) for page in range(2, page_count + 1)]
+        pages = self.map(lambda scraper, url: scraper.scrape_page(url), page_urls)
+
+        all_books = list(first_books)
+        for page_books in pages:
+            all_books.extend(page_books)
+        return all_books
+
+    def print_worker_stats(self):
+        """Print the number of processed books and the throughput of each worker."""
+        for worker_id, stats in enumerate(self.worker_stats):
+            rate = stats['books'] / stats['seconds'] if stats['seconds'] else 0.0
+            print(f"Worker {worker_id}: {stats['books']} books in {stats['seconds']:.1f}s "
+                  f"({rate:.2f} books/s)")
@@ -0,0 +1,236 @@
+"""
+Fetch controller for the Lubimyczytac.pl web scraper.
+
+This module contains the FetchController class that retries failed page
+fetches with jittered exponential backoff and adapts the number of
+concurrent fetches to the error rate and latency of the site (AIMD).
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import contextmanager
+import requests
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Rodzaje błędów, po których warto ponowić próbę
+RETRYABLE_FAILURES = {'timeout', 'throttled', 'server', 'connection', 'driver'}
+
+# Rodzaje błędów świadczące o przeciążeniu serwisu
+OVERLOAD_FAILURES = {'timeout', 'throttled', 'server'}
+
+def classify_failure(error):
+    """
+    Classify a fetch error.
+    
+    Args:
+        error (Exception): The exception raised by a fetch
+    
+    Returns:
+        str: 'timeout', 'throttled' (HTTP 429), 'server' (HTTP 5xx), 'client'
+            (other HTTP 4xx), 'connection', 'driver' (WebDriver errors) or 'other'
+    """
+    if isinstance(error, (requests.Timeout, TimeoutException, asyncio.TimeoutError, TimeoutError)):
+        return 'timeout'
+    
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(error, 'status', None)
+    if isinstance(status, int):
+        if status == 429:
+            return 'throttled'
+        if status >= 500:
+            return 'server'
+        if status >= 400:
+            return 'client'
+    
+    if isinstance(error, (requests.ConnectionError, ConnectionError)):
+        return 'connection'
+    if isinstance(error, WebDriverException):
+        return 'driver'
+    return 'other'
+
+def retry_after(error):
+    """
+    Return the delay requested by the server in a Retry-After header.
+    
+    Args:
+        error (Exception): The exception raised by a fetch
+    
+    Returns:
+        float: The delay in seconds, or None if there is no numeric Retry-After header
+    """
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+class FetchController:
+    """
+    Shared retry and concurrency controller for page fetches.
+    
+    Fetches run through call(), which holds one of `limit` concurrent slots.
+    Fast successes raise the limit by one per window of `limit` successes
+    (additive increase); overload failures and slow responses halve it
+    (multiplicative decrease), at most once per cooldown. Retryable failures
+    are retried with full-jitter exponential backoff. One instance can be
+    shared by all threads of a run.
+    """
+    
+    def __init__(self, max_retries=3, base_delay=1.0, max_delay=60.0, initial_concurrency=4,
+                 min_concurrency=1, max_concurrency=16, latency_target=5.0, decrease_factor=0.5,
+                 cooldown=5.0, metrics=None, clock=time.monotonic, sleep=time.sleep, rng=random.random):
+        """
+        Initialize the FetchController.
+        
+        Args:
+            max_retries (int): Maximum number of retries of a single fetch
+            base_delay (float): Backoff delay in seconds before the first retry
+            max_delay (float): Upper bound of the backoff delay in seconds
+            initial_concurrency (int): Initial number of concurrent fetches
+            min_concurrency (int): Lower bound of the concurrency limit
+            max_concurrency (int): Upper bound of the concurrency limit
+            latency_target (float): Fetches slower than this many seconds count as overload
+            decrease_factor (float): Factor the limit is multiplied by on overload
+            cooldown (float): Minimum time in seconds between two decreases
+            metrics (RunMetrics): Optional metrics receiving retry and failure counts
+            clock (callable): Function returning the current time in seconds
+            sleep (callable): Function sleeping for the given number of seconds
+            rng (callable): Function returning a random float in [0, 1)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = max(min_concurrency, min(initial_concurrency, max_concurrency))
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.metrics = metrics
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng
+        self.in_flight = 0
+        self.retries = 0
+        self.failures = {}
+        self._successes = 0
+        self._last_decrease = None
+        self._condition = threading.Condition()
+    
+    @contextmanager
+    def slot(self):
+        """Hold one of the concurrent fetch slots, waiting until one is free."""
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+    
+    def _on_success(self, latency):
+        """
+        Adjust the concurrency limit after a successful fetch.
+        
+        Args:
+            latency (float): Duration of the fetch in seconds
+        """
+        with self._condition:
+            if latency > self.latency_target:
+                self._decrease()
+                return
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.max_concurrency:
+                self._successes = 0
+                self.limit += 1
+                self._condition.notify_all()
+    
+    def _on_failure(self, kind):
+        """
+        Record a failed fetch and adjust the concurrency limit.
+        
+        Args:
+            kind (str): Kind of the failure returned by classify_failure()
+        """
+        with self._condition:
+            self.failures[kind] = self.failures.get(kind, 0) + 1
+            if kind in OVERLOAD_FAILURES:
+                self._decrease()
+        if self.metrics:
+            self.metrics.increment(f"fetch_failures_{kind}")
+    
+    def _decrease(self):
+        """Lower the concurrency limit multiplicatively. Must be called with the lock held."""
+        now = self.clock()
+        if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._successes = 0
+        self.limit = max(self.min_concurrency, int(self.limit * self.decrease_factor))
+    
+    def backoff_delay(self, attempt, error=None):
+        """
+        Return the delay before the next retry.
+        
+        Args:
+            attempt (int): Number of the failed attempt, starting from 0
+            error (Exception): The failure; its Retry-After header is honoured
+        
+        Returns:
+            float: The delay in seconds
+        """
+        requested = retry_after(error) if error is not None else None
+        if requested is not None:
+            return min(self.max_delay, requested)
+        # Pełny jitter rozprasza ponowienia wielu wątków w czasie
+        return self.rng() * min(self.max_delay, self.base_delay * 2 ** attempt)
+    
+    def call(self, func, *args, **kwargs):
+        """
+        Run a fetch within a concurrency slot, retrying retryable failures.
+        
+        Args:
+            func (callable): The fetch to run
+            *args: Positional arguments of func
+            **kwargs: Keyword arguments of func
+        
+        Returns:
+            The result of func
+        
+        Raises:
+            Exception: The last error if the fetch did not succeed
+        """
+        attempt = 0
+        while True:
+            with self.slot():
+                start = self.clock()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    error = e
+                    kind = classify_failure(e)
+                    self._on_failure(kind)
+                else:
+                    self._on_success(self.clock() - start)
+                    return result
+            
+            if kind not in RETRYABLE_FAILURES or attempt >= self.max_retries:
+                raise error
+            
+            self.sleep(self.backoff_delay(attempt, error))
+            attempt += 1
+            with self._condition:
+                self.retries += 1
+            if self.metrics:
+                self.metrics.increment('fetch_retries')
+    
+    def print_stats(self):
+        """Print the number of retries, failures and the final concurrency limit."""
+        failures = ', '.join(f"{kind}: {count}" for kind, count in sorted(self.failures.items()))
+        print(f"Ponowienia: {self.retries}, błędy: {failures or 'brak'}, "
+              f"limit równoległości: {self.limit}")
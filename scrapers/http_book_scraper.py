@@ -0,0 +1,334 @@
+"""
+HTTP book scraper for the Lubimyczytac.pl web scraper.
+
+This module contains the HttpBookScraper class that fetches book details
+over plain HTTP with a keep-alive session, falling back to Selenium only
+when the static HTML does not contain the required data.
+"""
+
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from repositories.details_cache import BookDetailsCache
+from scrapers.book_page_parser import apply_book_details, parse_book_details, parse_book_stats
+from scrapers.book_scraper import BookScraper
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept-Language": "pl-PL,pl;q=0.9,en;q=0.8",
+}
+
+
+class HttpBookScraper:
+    """
+    Browserless scraper for book details from Lubimyczytac.pl.
+
+    This class downloads book pages with a pooled requests.Session and parses
+    them with BeautifulSoup. A headless BookScraper is started lazily, and
+    only for books whose static HTML lacks the ISBN or the details section.
+    """
+
+    def __init__(self, session=None, timeout=10, pool_size=10, use_fallback=True, cache=None,
+                 fallback_scraper=None, metrics=None, controller=None, archive=None):
+        """
+        Initialize the HttpBookScraper.
+
+        Args:
+            session (requests.Session): Session to use; a pooled one is created if None
+            timeout (float): Timeout in seconds for a single HTTP request
+            pool_size (int): Maximum number of keep-alive connections per host
+            use_fallback (bool): Whether to fall back to Selenium when the HTML lacks data
+            cache (BookDetailsCache): Optional cache of already fetched book details
+            fallback_scraper (BookScraper): Already started browser session to use as the
+                fallback; it is not closed by this scraper
+            metrics (RunMetrics): Optional metrics receiving fetch latencies and error counts
+            controller (FetchController): Optional controller retrying failed requests and
+                limiting the number of concurrent requests
+            archive (PageArchive): Optional archive receiving the HTML of every book page
+                downloaded
+        """
+        self.session = session
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.use_fallback = use_fallback
+        self.fallback_scraper = fallback_scraper
+        self._owns_fallback = False
+        self._fallback_lock = threading.Lock()
+        self.fallback_count = 0
+        self.failed_links = set()
+        self.cache = cache
+        self.metrics = metrics
+        self.controller = controller
+        self.archive = archive
+        self.refresh_stats = {'changed': 0, 'not_modified': 0, 'failed': 0, 'bytes': 0}
+
+    def __enter__(self):
+        """
+        Set up the HTTP session when entering a context.
+
+        Returns:
+            HttpBookScraper: The HttpBookScraper instance
+        """
+        if self.session is None:
+            self.session = self._create_session()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Close the HTTP session and the fallback browser when exiting a context.
+
+        Args:
+            exc_type: Exception type
+            exc_val: Exception value
+            exc_tb: Exception traceback
+        """
+        if self.fallback_scraper and self._owns_fallback:
+            self.fallback_scraper.__exit__(exc_type, exc_val, exc_tb)
+            self.fallback_scraper = None
+            self._owns_fallback = False
+        if self.session:
+            self.session.close()
+            self.session = None
+
+    def _create_session(self):
+        """
+        Create a requests.Session with a keep-alive connection pool.
+
+        Returns:
+            requests.Session: The configured session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(DEFAULT_HEADERS)
+        return session
+
+    def _fetch(self, url):
+        """
+        Download the HTML of a page.
+
+        Args:
+            url (str): URL of the page
+
+        Returns:
+            str: HTML source of the page
+        """
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def _conditional_fetch(self, url, headers):
+        """
+        Send a GET request with conditional headers.
+
+        Args:
+            url (str): URL of the page
+            headers (dict): Request headers, e.g. If-None-Match
+
+        Returns:
+            requests.Response: The response, with status 200 or 304
+        """
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def refresh_book_stats(self, book, validators):
+        """
+        Re-check a book page and update its rating statistics if the page changed.
+
+        The request carries the ETag and Last-Modified validators stored for
+        the book, so an unchanged page is answered with an empty
+        304 Not Modified response and is not parsed again.
+
+        Args:
+            book (Book): A Book object with at least the book_link attribute set
+            validators (PageValidatorStore): Store of the validators of book pages
+
+        Returns:
+            bool: True if the page changed and the statistics were parsed again
+        """
+        if not self.session:
+            raise ValueError("HTTP session not initialized. Use with statement.")
+
+        url = book.book_link
+        key = BookDetailsCache.book_key(book)
+        if not url or not url.startswith("http") or not key:
+            return False
+
+        headers = {}
+        stored = validators.get(key)
+        if stored:
+            etag, last_modified = stored
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        try:
+            if self.controller:
+                response = self.controller.call(self._conditional_fetch, url, headers)
+            else:
+                response = self._conditional_fetch(url, headers)
+        except Exception as e:
+            print(f"Błąd odświeżania danych z {url}: {e}")
+            self.refresh_stats['failed'] += 1
+            return False
+
+        self.refresh_stats['bytes'] += len(response.content or b'')
+        if response.status_code == 304:
+            self.refresh_stats['not_modified'] += 1
+            return False
+
+        for field, value in parse_book_stats(response.text).items():
+            setattr(book, field, value)
+        validators.put(key, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        self.refresh_stats['changed'] += 1
+        return True
+
+    def refresh_books_stats(self, books, validators):
+        """
+        Refresh the rating statistics of books with conditional requests.
+
+        Args:
+            books (list): A list of Book objects
+            validators (PageValidatorStore): Store of the validators of book pages
+
+        Returns:
+            list: The same list of books, with statistics of changed pages updated
+        """
+        for book in books:
+            self.refresh_book_stats(book, validators)
+
+        print(f"Zmienione strony: {self.refresh_stats['changed']}, "
+              f"bez zmian: {self.refresh_stats['not_modified']}, "
+              f"błędy: {self.refresh_stats['failed']}, "
+              f"pobrano {self.refresh_stats['bytes'] / 1024:.1f} KB")
+        return books
+
+    def _archive_page(self, url, html):
+        """
+        Store the HTML of a downloaded book page in the archive, if there is one.
+
+        Args:
+            url (str): URL of the book page
+            html (str): HTML source of the page
+        """
+        if self.archive is None:
+            return
+        try:
+            self.archive.store(url, html, 'book')
+        except Exception as e:
+            print(f"Błąd archiwizacji strony {url}: {e}")
+
+    def _get_fallback_scraper(self):
+        """
+        Return the Selenium fallback scraper, starting it on first use.
+
+        Returns:
+            BookScraper: A headless BookScraper with an initialized WebDriver
+        """
+        if self.fallback_scraper is None:
+            self.fallback_scraper = BookScraper(headless=True).__enter__()
+            self.fallback_scraper.metrics = self.metrics
+            self.fallback_scraper.cache = self.cache
+            self.fallback_scraper.archive = self.archive
+            self._owns_fallback = True
+        return self.fallback_scraper
+
+    def get_book_details(self, book):
+        """
+        Get additional details for a book over HTTP.
+
+        Args:
+            book (Book): A Book object with at least the book_link attribute set
+
+        Returns:
+            Book: The same Book object, but with ISBN and original title fields populated
+        """
+        if not self.session:
+            raise ValueError("HTTP session not initialized. Use with statement.")
+
+        url = book.book_link
+
+        # Return the book unchanged if URL is invalid
+        if not url or not url.startswith("http"):
+            print(f"❌ Nieprawidłowy URL: {url}")
+            return book
+
+        if self.cache:
+            cached = self.cache.get(book)
+            if cached:
+                book.isbn, book.original_title = cached
+                return book
+
+        start = time.perf_counter()
+        try:
+            html = self.controller.call(self._fetch, url) if self.controller else self._fetch(url)
+            self._archive_page(url, html)
+            isbn, original_title = parse_book_details(html)
+        except Exception as e:
+            print(f"Błąd pobierania danych z {url}: {e}")
+            isbn, original_title = None, None
+            if self.metrics:
+                self.metrics.increment(
+                    'book_timeouts' if isinstance(e, requests.Timeout) else 'book_errors'
+                )
+        if self.metrics:
+            self.metrics.observe('book_fetch', time.perf_counter() - start)
+
+        # Strona statyczna nie zawiera danych — użyj przeglądarki
+        if (isbn is None or original_title is None) and self.use_fallback:
+            # Przeglądarka nie może być używana przez kilka wątków naraz
+            with self._fallback_lock:
+                self.fallback_count += 1
+                if self.metrics:
+                    self.metrics.increment('book_fallbacks')
+                fallback_scraper = self._get_fallback_scraper()
+                fallback_scraper.get_book_details(book)
+                fetched = url not in fallback_scraper.failed_links
+        else:
+            apply_book_details(book, isbn, original_title)
+            fetched = isbn is not None and original_title is not None
+            if self.cache and fetched:
+                self.cache.put(book)
+
+        if fetched:
+            self.failed_links.discard(url)
+        else:
+            self.failed_links.add(url)
+        return book
+
+    def enrich_books(self, books, report=True):
+        """
+        Enrich book data with ISBN and original titles over HTTP.
+
+        Args:
+            books (list): A list of Book objects
+            report (bool): Whether to print the fallback, cache and fetch statistics afterwards
+
+        Returns:
+            list: The same list of books, but with ISBN and original title fields populated
+        """
+        if not self.session:
+            raise ValueError("HTTP session not initialized. Use with statement.")
+
+        for book in books:
+            self.get_book_details(book)
+
+        if report:
+            self.print_stats()
+        return books
+
+    def print_stats(self):
+        """Print the fallback, cache and fetch statistics of this scraper."""
+        if self.fallback_count:
+            print(f"Użyto przeglądarki dla {self.fallback_count} książek")
+        if self.controller:
+            self.controller.print_stats()
+        if self.cache:
+            self.cache.print_stats()
@@ -0,0 +1,86 @@
+"""
+Queue worker for the Lubimyczytac.pl web scraper.
+
+This module contains the QueueWorker class that takes book enrichment
+tasks from an EnrichmentTaskQueue and processes them with a scraper.
+"""
+
+import time
+from repositories.task_queue import new_worker_id
+
+class QueueWorker:
+    """
+    Stateless worker processing an EnrichmentTaskQueue.
+
+    The worker repeatedly leases a batch of tasks, enriches the books with
+    the given scraper and writes the results back. It keeps no state of its
+    own, so any number of workers can run in separate processes sharing
+    the queue file on a local disk.
+    """
+
+    def __init__(self, queue, scraper, worker_id=None, batch_size=10, poll_interval=5.0):
+        """
+        Initialize the QueueWorker.
+
+        Args:
+            queue (EnrichmentTaskQueue): The task queue
+            scraper: Started scraper with a get_book_details(book) method and a
+                failed_links set, e.g. HttpBookScraper or BookScraper
+            worker_id (str): ID of the worker; a unique one is generated if None
+            batch_size (int): Number of tasks leased at once
+            poll_interval (float): Seconds to wait when all remaining tasks are
+                leased by other workers
+        """
+        self.queue = queue
+        self.scraper = scraper
+        self.worker_id = worker_id or new_worker_id()
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.processed = 0
+
+    def run_once(self):
+        """
+        Lease and process a single batch of tasks.
+
+        Books whose page could not be fetched are returned to the queue, so
+        they are retried until the queue's max_attempts is reached.
+
+        Returns:
+            int: The number of processed tasks
+        """
+        books = self.queue.lease(self.worker_id, self.batch_size)
+        try:
+            for book in books:
+                self.scraper.get_book_details(book)
+        except BaseException:
+            # Zadania wracają do kolejki, by przejął je inny worker
+            self.queue.release(self.worker_id, books)
+            raise
+        fetched = [book for book in books if book.book_link not in self.scraper.failed_links]
+        failed = [book for book in books if book.book_link in self.scraper.failed_links]
+        completed = self.queue.complete(self.worker_id, fetched)
+        if failed:
+            self.queue.release(self.worker_id, failed)
+        if completed < len(fetched):
+            # Dzierżawa wygasła i zadania przejął inny worker
+            print(f"Worker {self.worker_id}: {len(fetched) - completed} zadań przejął inny worker")
+        self.processed += completed
+        return len(books)
+
+    def run(self):
+        """
+        Process tasks until every task in the queue is done.
+
+        Returns:
+            int: The number of tasks processed by this worker
+        """
+        while True:
+            if self.run_once():
+                continue
+            if not self.queue.has_unfinished():
+                break
+            # Pozostałe zadania są wydzierżawione przez innych workerów
+            time.sleep(self.poll_interval)
+
+        print(f"Worker {self.worker_id}: przetworzono {self.processed} książek")
+        return self.processed
@@ -8,6 +8,7 @@ provides conversion to Goodreads format for import into Goodreads.
 
 import csv
 import os
+from repositories.book_repository import BookRepository
 
 def save_books_to_csv(books, filename):
     """
@@ -53,50 +54,11 @@ def convert_books_to_goodreads(input_file, output_file):
 
     This function reads book data from a CSV file in the format produced by
     save_books_to_csv() and converts it to a format that can be imported into
-    Goodreads.
+    Goodreads. The conversion is streamed row by row by
+    BookRepository.convert_books_to_goodreads().
 
     Args:
         input_file (str): Path to the input CSV file in Lubimyczytac.pl format
         output_file (str): Path to the output CSV file in Goodreads format
     """
-    with open(input_file, mode='r', encoding='utf-8') as infile:
-        reader = csv.DictReader(infile)
-
-        # Print the header to debug
-        print("Headers in the input CSV:", reader.fieldnames)
-
-        fieldnames = [
-            'Title', 'Polish Title', 'Author', 'ISBN', 'My Rating', 'Average Rating', 'Publisher', 
-            'Binding', 'Year Published', 'Original Publication Year', 'Date Read', 
-            'Date Added', 'Shelves', 'Bookshelves', 'My Review'
-        ]
-
-        with open(output_file, mode='w', encoding='utf-8', newline='') as outfile:
-            writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for row in reader:
-
-                # Check if 'Na półkach Główne' exists in row and handle it
-                shelves = row.get('Na półkach Głowne', '')
-                bookshelves = row.get('Na półkach Pozostałe', '')
-
-                goodreads_row = {
-                    'Title': row.get('Tytuł', ''),
-                    'Polish Title': row.get('Polski Tytuł', ''), 
-                    'Author': row.get('Autor', ''),
-                    'ISBN': row.get('ISBN', ''),
-                    'My Rating': row.get('Ocena użytkownika', ''),
-                    'Average Rating': row.get('Średnia ocena', ''),
-                    'Publisher': '',  # No equivalent for Publisher
-                    'Binding': '',  # No equivalent for Binding
-                    'Year Published': '',  # No equivalent for Year Published
-                    'Original Publication Year': '',  # No equivalent
-                    'Date Read': row.get('Data przeczytania', ''),
-                    'Date Added': '',  # No equivalent
-                    'Shelves': shelves,  # Shelves from 'Na półkach Główne'
-                    'Bookshelves': bookshelves,  # Bookshelves from 'Na półkach Pozostałe'
-                    'My Review': '',  # No equivalent
-                }
-
-                writer.writerow(goodreads_row)
+    BookRepository.convert_books_to_goodreads(input_file, output_file)
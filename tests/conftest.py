@@ -45,3 +45,24 @@ def mock_driver():
     driver.find_element.return_value = isbn_meta
 
     return driver
+
+@pytest.fixture
+def book_page_html():
+    """Fixture providing the HTML of a saved book page with an original title."""
+    path = os.path.join(os.path.dirname(__file__), 'fixtures', 'book_page.html')
+    with open(path, mode='r', encoding='utf-8') as file:
+        return file.read()
+
+@pytest.fixture
+def book_page_no_original_title_html():
+    """Fixture providing the HTML of a saved book page without an original title."""
+    path = os.path.join(os.path.dirname(__file__), 'fixtures', 'book_page_no_original_title.html')
+    with open(path, mode='r', encoding='utf-8') as file:
+        return file.read()
+
+@pytest.fixture
+def listing_page_html():
+    """Fixture providing the HTML of a saved page of a user's book list."""
+    path = os.path.join(os.path.dirname(__file__), 'fixtures', 'listing_page.html')
+    with open(path, mode='r', encoding='utf-8') as file:
+        return file.read()
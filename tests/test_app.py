@@ -0,0 +1,226 @@
+import json
+import requests
+import pytest
+from unittest.mock import MagicMock, patch
+from main import ScraperApp
+from models.book import Book
+from repositories.book_repository import BookRepository
+from repositories.enrichment_journal import EnrichmentJournal
+from repositories.task_queue import EnrichmentTaskQueue
+from scrapers.book_scraper import BookScraper
+from scrapers.http_book_scraper import HttpBookScraper
+
+@pytest.fixture
+def app(tmp_path):
+    """Fixture providing a ScraperApp with a temporary configuration file."""
+    config_file = tmp_path / "config.ini"
+    config_file.write_text(
+        "[settings]\nprofile_url = https://lubimyczytac.pl/profil/605200/stokuj\n",
+        encoding='utf-8'
+    )
+    return ScraperApp(str(config_file))
+
+@patch('scrapers.book_scraper.webdriver.Chrome')
+def test_shared_session_starts_browser_once(mock_chrome, app, tmp_path):
+    """Test that scraping and enrichment reuse one browser session."""
+    scraped_books = [Book(book_id='1', title='Tytuł Polski 1', book_link='http://example.com/book1')]
+
+    with patch.object(BookScraper, 'scrape_profile', return_value=scraped_books), \
+         patch.object(BookScraper, 'get_book_details', side_effect=lambda book: book) as details:
+        with app.open_session(cache_file=None) as scraper:
+            books = app.scrape_books(scraper=scraper)
+            app.enrich_books(books, scraper=scraper, journal_file=str(tmp_path / "journal"))
+
+    assert mock_chrome.call_count == 1
+    details.assert_called_once_with(scraped_books[0])
+    mock_chrome.return_value.quit.assert_called_once()
+
+@patch('scrapers.book_scraper.webdriver.Chrome')
+def test_stream_books_writes_enriched_books_in_order(mock_chrome, app, tmp_path):
+    """Test that streamed books are enriched and written in list order."""
+    pages = [
+        [Book(book_id=str(i), title=f"Tytuł {i}") for i in range(3)],
+        [Book(book_id=str(i), title=f"Tytuł {i}") for i in range(3, 5)],
+    ]
+
+    def get_book_details(book):
+        book.isbn = f"ISBN-{book.book_id}"
+        return book
+
+    output_file = str(tmp_path / "books_enriched.csv")
+    with patch.object(BookScraper, 'iter_profile_pages', return_value=iter(pages)), \
+         patch.object(HttpBookScraper, 'get_book_details', side_effect=get_book_details):
+        count = app.stream_books(output_file, enrich_workers=3, max_pending=2, cache_file=None)
+
+    loaded_books = BookRepository.load_books_from_csv(output_file)
+    assert count == 5
+    assert [book.book_id for book in loaded_books] == ['0', '1', '2', '3', '4']
+    assert all(book.isbn == f"ISBN-{book.book_id}" for book in loaded_books)
+
+@patch('scrapers.book_scraper.webdriver.Chrome')
+def test_stream_books_falls_back_on_separate_browser(mock_chrome, app, tmp_path):
+    """Test that a fallback during pagination does not navigate the list browser."""
+    mock_chrome.side_effect = lambda options: MagicMock()
+    app.fetch_controller.sleep = lambda seconds: None
+    paginators = []
+    fallbacks = []
+
+    def iter_profile_pages(scraper, profile_url, known_ids=None):
+        paginators.append(scraper)
+        for page in range(2):
+            yield [Book(book_id=str(page), title=f"Tytuł {page}",
+                        book_link=f"http://example.com/{page}")]
+
+    def get_book_details(scraper, book):
+        fallbacks.append(scraper)
+        book.isbn = f"ISBN-{book.book_id}"
+        return book
+
+    output_file = str(tmp_path / "books_enriched.csv")
+    with patch.object(BookScraper, 'iter_profile_pages', autospec=True, side_effect=iter_profile_pages), \
+         patch.object(BookScraper, 'get_book_details', autospec=True, side_effect=get_book_details), \
+         patch.object(HttpBookScraper, '_fetch', return_value='<html></html>'):
+        count = app.stream_books(output_file, enrich_workers=2, cache_file=None)
+
+    assert count == 2
+    assert len(fallbacks) == 2
+    assert paginators[0] not in fallbacks
+    assert mock_chrome.call_count == 2
+
+def test_enrich_books_resumes_from_journal(app, tmp_path):
+    """Test that books recorded in the journal are not fetched again."""
+    journal_file = str(tmp_path / "enrichment.journal")
+    books = [Book(book_id=str(i), title=f"Tytuł {i}", book_link=f"http://example.com/{i}")
+             for i in range(4)]
+    with EnrichmentJournal(journal_file) as journal:
+        journal.record([Book(book_id='0', isbn='ISBN-0', original_title='Title 0'),
+                        Book(book_id='1', isbn='ISBN-1', original_title='Title 1')])
+
+    def get_book_details(book):
+        book.isbn = f"ISBN-{book.book_id}"
+        return book
+
+    with patch.object(HttpBookScraper, 'get_book_details', side_effect=get_book_details) as details:
+        app.enrich_books(books, engine='http', cache_file=None, journal_file=journal_file, resume=True)
+
+    assert [call.args[0].book_id for call in details.call_args_list] == ['2', '3']
+    assert books[0].original_title == 'Title 0'
+    assert [book.isbn for book in books] == ['ISBN-0', 'ISBN-1', 'ISBN-2', 'ISBN-3']
+    with EnrichmentJournal(journal_file, resume=True) as journal:
+        assert set(journal.entries) == {'0', '1', '2', '3'}
+
+def test_journaled_enrichment_opens_engine_once(app, tmp_path):
+    """Test that all journal batches share one HTTP scraper."""
+    books = [Book(book_id=str(i), title=f"Tytuł {i}", book_link=f"http://example.com/{i}")
+             for i in range(250)]
+
+    def get_book_details(book):
+        book.isbn = f"ISBN-{book.book_id}"
+        return book
+
+    with patch.object(HttpBookScraper, '_create_session') as create_session, \
+         patch.object(HttpBookScraper, 'get_book_details', side_effect=get_book_details), \
+         patch.object(HttpBookScraper, 'print_stats') as print_stats:
+        app.enrich_books(books, engine='http', cache_file=None,
+                         journal_file=str(tmp_path / "enrichment.journal"))
+
+    create_session.assert_called_once()
+    print_stats.assert_called_once()
+    with EnrichmentJournal(str(tmp_path / "enrichment.journal"), resume=True) as journal:
+        assert len(journal.entries) == 250
+
+def test_journal_skips_failed_fetches(app, tmp_path, book_page_html):
+    """Test that books whose pages could not be fetched are retried on resume."""
+    journal_file = str(tmp_path / "enrichment.journal")
+    books = [Book(book_id=str(i), title=f"Tytuł {i}", book_link=f"http://example.com/{i}")
+             for i in range(3)]
+    app.fetch_controller.sleep = lambda seconds: None
+    fallback = MagicMock(failed_links={'http://example.com/1'})
+
+    def fetch(url):
+        if url.endswith('/1'):
+            raise requests.ConnectionError("connection reset")
+        return book_page_html
+
+    with patch.object(HttpBookScraper, '_fetch', side_effect=fetch), \
+         patch.object(HttpBookScraper, '_get_fallback_scraper', return_value=fallback):
+        app.enrich_books(books, engine='http', cache_file=None, journal_file=journal_file)
+
+    fallback.get_book_details.assert_called_once_with(books[1])
+    with EnrichmentJournal(journal_file, resume=True) as journal:
+        assert journal.replay(books) == [books[1]]
+
+@patch('scrapers.book_scraper.webdriver.Chrome')
+def test_run_writes_metrics_report(mock_chrome, app, tmp_path):
+    """Test that stages are timed and fetch errors are counted in the metrics."""
+    books = [Book(book_id='1', title='Tytuł 1', book_link='http://example.com/1')]
+    app.metrics_file = str(tmp_path / "metrics.json")
+    app.fetch_controller.sleep = lambda seconds: None
+    
+    with patch('requests.Session.get', side_effect=requests.Timeout("timeout")), \
+         patch.object(BookScraper, 'get_book_details', side_effect=lambda book: book):
+        app.enrich_books(books, engine='http', cache_file=None, journal_file=None)
+    app.save_books(books, str(tmp_path / "books.csv"))
+    app.save_metrics()
+    
+    report = json.loads((tmp_path / "metrics.json").read_text(encoding='utf-8'))
+    assert set(report['stages']) == {'enrich', 'save'}
+    assert report['counters']['book_timeouts'] == 1
+    assert report['counters']['book_fallbacks'] == 1
+    assert report['counters']['fetch_retries'] == 3
+    assert report['latencies']['book_fetch']['count'] == 1
+
+@patch('scrapers.book_scraper.webdriver.Chrome')
+def test_run_batch_enriches_shared_books_once(mock_chrome, tmp_path):
+    """Test that profiles share one browser and books common to them are enriched once."""
+    config_file = tmp_path / "config.ini"
+    config_file.write_text(
+        "[settings]\nprofile_urls =\n    https://lubimyczytac.pl/profil/1/anna\n"
+        "    https://lubimyczytac.pl/profil/2/piotr\n",
+        encoding='utf-8'
+    )
+    app = ScraperApp(str(config_file))
+    lists = {
+        '1': [Book(book_id='10', title='Wspólna', user_rating='8', book_link='http://example.com/10'),
+              Book(book_id='11', title='Tylko Anna', book_link='http://example.com/11')],
+        '2': [Book(book_id='10', title='Wspólna', user_rating='5', book_link='http://example.com/10')],
+    }
+    
+    def scrape_profile(list_url):
+        return lists['1' if 'objectId=1&' in list_url else '2']
+    
+    def get_book_details(book):
+        book.isbn = f"ISBN-{book.book_id}"
+        return book
+    
+    with patch.object(BookScraper, 'scrape_profile', side_effect=scrape_profile), \
+         patch.object(HttpBookScraper, 'get_book_details', side_effect=get_book_details) as details:
+        books_by_profile = app.run_batch(output_dir=str(tmp_path / "profiles"),
+                                         cache_file=None, journal_file=None)
+    
+    assert app.profile_url.endswith("objectId=1&own=0&paginatorType=Standard")
+    assert mock_chrome.call_count == 1
+    assert sorted(call.args[0].book_id for call in details.call_args_list) == ['10', '11']
+    assert books_by_profile['2'][0].isbn == 'ISBN-10'
+    assert books_by_profile['2'][0].user_rating == '5'
+    saved = BookRepository.load_books_from_csv(str(tmp_path / "profiles" / "2" / "books_enriched.csv"))
+    assert [book.isbn for book in saved] == ['ISBN-10']
+    assert (tmp_path / "profiles" / "1" / "goodreads.csv").exists()
+
+def test_enqueue_and_collect_results(app, tmp_path):
+    """Test that results written by queue workers are collected into the books."""
+    queue_file = str(tmp_path / "tasks.db")
+    books = [Book(book_id=str(i), title=f"Tytuł {i}", book_link=f"http://example.com/{i}")
+             for i in range(3)]
+    
+    assert app.enqueue_books(books, queue_file) == 3
+    with EnrichmentTaskQueue(queue_file) as queue:
+        leased = queue.lease('worker', limit=2)
+        for book in leased:
+            book.isbn = f"ISBN-{book.book_id}"
+            book.original_title = book.title
+        queue.complete('worker', leased)
+    
+    app.collect_results(books, queue_file)
+    
+    assert [book.isbn for book in books] == ['ISBN-0', 'ISBN-1', '']
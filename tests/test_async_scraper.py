@@ -0,0 +1,117 @@
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from repositories.details_cache import BookDetailsCache
+from scrapers.async_book_scraper import TokenBucket, enrich_books_async
+from models.book import Book
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+class BookPageHandler(BaseHTTPRequestHandler):
+    """Stand-in for lubimyczytac.pl serving saved book pages."""
+
+    pages = {
+        '/ksiazka/4883648/imperium-ciszy': 'book_page.html',
+        '/ksiazka/1/pan-tadeusz': 'book_page_no_original_title.html',
+        '/ksiazka/5/bez-danych': 'listing_page.html',
+    }
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(0.05)
+            fixture = self.pages.get(self.path)
+            if fixture is None:
+                self.send_error(404)
+                return
+            with open(os.path.join(FIXTURES_DIR, fixture), mode='rb') as file:
+                body = file.read()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def book_server():
+    """Fixture running a local HTTP server with saved book pages."""
+    BookPageHandler.max_in_flight = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BookPageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_enrich_books_async(book_server):
+    """Test concurrent enrichment against a local stand-in server."""
+    books = [
+        Book(book_id='4883648', title='Imperium ciszy',
+             book_link=f"{book_server}/ksiazka/4883648/imperium-ciszy"),
+        Book(book_id='1', title='Pan Tadeusz', book_link=f"{book_server}/ksiazka/1/pan-tadeusz"),
+        Book(book_id='2', title='Brak strony', book_link=f"{book_server}/ksiazka/2/brak"),
+    ] * 4
+
+    enriched_books = enrich_books_async(books, concurrency=3, rate=1000, burst=1000)
+
+    assert enriched_books[0].isbn == '9788380625068'
+    assert enriched_books[0].original_title == 'Empire of Silence'
+    assert enriched_books[1].isbn == '9788373271890'
+    assert enriched_books[1].original_title == 'Pan Tadeusz'
+    assert enriched_books[2].isbn == ''
+    assert enriched_books[2].original_title == 'Brak strony'
+    assert BookPageHandler.max_in_flight <= 3
+
+def test_enrich_books_async_reports_each_book(book_server):
+    """Test that every book is passed to on_book once it is enriched."""
+    books = [Book(book_id=str(i), title='Pan Tadeusz', book_link=f"{book_server}/ksiazka/1/pan-tadeusz")
+             for i in range(6)]
+    done = []
+
+    enrich_books_async(books, on_book=lambda book, fetched: done.append(book), concurrency=3, rate=1000, burst=1000)
+
+    assert sorted(book.book_id for book in done) == [str(i) for i in range(6)]
+    assert all(book.isbn == '9788373271890' for book in done)
+
+def test_pages_without_details_are_not_cached(book_server, tmp_path):
+    """Test that a downloaded page lacking the ISBN or details counts as a failed fetch."""
+    books = [
+        Book(book_id='1', title='Pan Tadeusz', book_link=f"{book_server}/ksiazka/1/pan-tadeusz"),
+        Book(book_id='5', title='Bez danych', book_link=f"{book_server}/ksiazka/5/bez-danych"),
+    ]
+    outcomes = {}
+
+    with BookDetailsCache(str(tmp_path / "cache.db")) as cache:
+        enrich_books_async(books, cache=cache, rate=1000, burst=1000,
+                           on_book=lambda book, fetched: outcomes.update({book.book_id: fetched}))
+
+        assert outcomes == {'1': True, '5': False}
+        assert cache.get(books[0]) is not None
+        assert cache.get(books[1]) is None
+
+def test_token_bucket_limits_rate():
+    """Test that the token bucket spaces out requests beyond the burst size."""
+    async def run():
+        bucket = TokenBucket(rate=50, capacity=2)
+        start = asyncio.get_running_loop().time()
+        for _ in range(7):
+            await bucket.acquire()
+        return asyncio.get_running_loop().time() - start
+
+    # 2 tokens are available at once, the remaining 5 need 5 / 50 s
+    assert asyncio.run(run()) >= 0.09
@@ -0,0 +1,41 @@
+"""
+Tests for the data path benchmarks.
+"""
+
+import os
+from benchmarks.data_path import (
+    compare_with_baseline, generate_rows, load_baseline, run_benchmarks, save_baseline
+)
+from repositories.book_repository import CSV_HEADERS
+
+def test_generate_rows_is_repeatable():
+    """Test that synthetic rows are deterministic and have the CSV layout."""
+    rows = generate_rows(20, seed=1)
+    
+    assert rows == generate_rows(20, seed=1)
+    assert all(len(row) == len(CSV_HEADERS) for row in rows)
+    assert len({row[0] for row in rows}) == 20
+
+def test_run_benchmarks_and_baseline(tmp_path):
+    """Test a small benchmark run, saving it as a baseline and comparing against it."""
+    report = run_benchmarks([50], str(tmp_path))
+    
+    result = report['results']['50']['repository_load_books_from_csv']
+    assert result['rows_per_second'] > 0
+    assert result['peak_memory_mb'] is not None
+    assert 'repository_load_columns_from_columnar' in report['results']['50']
+    
+    baseline_file = os.path.join(tmp_path, 'baseline.json')
+    save_baseline(report, baseline_file)
+    assert compare_with_baseline(report, load_baseline(baseline_file)) == []
+    assert load_baseline(os.path.join(tmp_path, 'missing.json')) is None
+
+def test_compare_with_baseline_reports_regressions():
+    """Test that slower or more memory hungry runs are reported."""
+    baseline = {'results': {'100': {'op': {'rows_per_second': 1000.0, 'peak_memory_mb': 10.0}}}}
+    report = {'results': {'100': {'op': {'rows_per_second': 500.0, 'peak_memory_mb': 20.0}}}}
+    
+    regressions = compare_with_baseline(report, baseline, tolerance=0.2)
+    
+    assert len(regressions) == 2
+    assert compare_with_baseline(report, baseline, tolerance=1.5) == []
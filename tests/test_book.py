@@ -0,0 +1,103 @@
+import tracemalloc
+import pytest
+from models.book import BOOK_FIELDS, Book, parse_count, parse_decimal
+
+def test_numeric_fields_are_parsed():
+    """Test that numeric fields keep their original text and are parsed on access."""
+    book = Book(avg_rating='7,2', rating_count='1 182', readers='1 133', opinions='49',
+                user_rating='')
+
+    assert book.avg_rating == '7,2'
+    assert book.avg_rating_value == 7.2
+    assert book.rating_count_value == 1182
+    assert book.readers_value == 1133
+    assert book.opinions_value == 49
+    assert book.user_rating_value is None
+
+    book.avg_rating = '6,9'
+    assert book.avg_rating_value == 6.9
+
+def test_conversions_are_unchanged(sample_books):
+    """Test that conversions return the original text of every field."""
+    row = list(sample_books[0])
+    book = Book.from_list(list(row))
+
+    assert book.to_list() == row
+    assert Book.from_dict(book.to_dict()).to_list() == row
+    assert book.to_goodreads_dict()['Average Rating'] == '4.5'
+
+def test_book_has_no_instance_dict():
+    """Test that Book instances use slots instead of a per-instance dict."""
+    book = Book(author='Autor 1')
+
+    assert not hasattr(book, '__dict__')
+    with pytest.raises(AttributeError):
+        book.unknown_field = 'x'
+
+class DictBook:
+    """The Book layout before __slots__: the same fields in a per-instance dict."""
+
+    def __init__(self, **fields):
+        for name in BOOK_FIELDS:
+            setattr(self, name, fields.get(name, ''))
+
+def allocated_per_instance(factory, count=2000):
+    """Return the average number of bytes allocated for one instance."""
+    fields = {name: f"{name} value" for name in BOOK_FIELDS}
+    fields.update(avg_rating='7,2', rating_count='1 182', readers='1133', opinions='49',
+                  user_rating='')
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [factory(**fields) for _ in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert len(instances) == count
+    return allocated / count
+
+def test_book_is_smaller_than_dict_layout():
+    """Test that a Book takes less memory than the same fields in an instance dict."""
+    book_size = allocated_per_instance(Book)
+
+    assert book_size < allocated_per_instance(DictBook)
+    # Nagłówek obiektu i jeden wskaźnik na każde z 15 pól
+    assert book_size <= 8 * (len(BOOK_FIELDS) + 6)
+
+def test_numeric_fields_are_stored_typed():
+    """Test that numeric fields are parsed once and their text round-trips exactly."""
+    book = Book(avg_rating='4.5', rating_count='1 182', readers='1133', opinions='',
+                user_rating='8')
+
+    assert book.avg_rating == '4.5'
+    assert book.rating_count == '1 182'
+    assert book.readers == '1133'
+    assert book.opinions == ''
+    assert book.user_rating == '8'
+    assert book._readers == 1133
+    assert book._user_rating == 8.0
+    assert book._opinions is None
+    assert book.avg_rating_value == 4.5
+    assert book.rating_count_value == 1182
+
+    book.readers = '1 200'
+    assert book.readers == '1 200'
+    assert book.readers_value == 1200
+
+def test_repeated_strings_are_interned():
+    """Test that authors and shelves built at runtime share one object."""
+    first = Book(author=''.join(['Autor', ' 1']), shelves=''.join(['Prze', 'czytane']))
+    second = Book(author=''.join(['Autor ', '1']), shelves=''.join(['Przecz', 'ytane']))
+
+    assert first.author is second.author
+    assert first.shelves is second.shelves
+
+@pytest.mark.parametrize('text, expected', [('7,2', 7.2), (' 10 ', 10.0), ('', None), ('brak', None)])
+def test_parse_decimal(text, expected):
+    """Test parsing decimal numbers with Polish decimal commas."""
+    assert parse_decimal(text) == expected
+
+@pytest.mark.parametrize('text, expected', [('1 133', 1133), ('1.133', 1133), ('', None), ('x', None)])
+def test_parse_count(text, expected):
+    """Test parsing counts with thousands separators."""
+    assert parse_count(text) == expected
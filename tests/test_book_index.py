@@ -0,0 +1,72 @@
+"""
+Tests for the BookIndex class.
+"""
+
+from models.book import Book
+from models.book_index import BookIndex
+from repositories.book_repository import BookRepository
+from repositories.sqlite_book_repository import SqliteBookRepository
+
+def make_library():
+    """Return a small library of books."""
+    return [
+        Book(book_id='1', title='Ostatnie życzenie', author='Andrzej Sapkowski',
+             cycle='Wiedźmin (tom 1)', read_date='2021-03-04', shelves='Przeczytane',
+             self_shelves='Fantasy, Ulubione'),
+        Book(book_id='2', title='Miecz przeznaczenia', author='Andrzej Sapkowski',
+             cycle='Wiedźmin (tom 2)', read_date='2021-05-10', shelves='Przeczytane',
+             self_shelves='Fantasy'),
+        Book(book_id='3', title='Imperium ciszy', author='Christopher Ruocchio',
+             cycle='Pożeracz słońc (tom 1)', shelves='Chcę przeczytać', self_shelves='Sci-Fi'),
+        Book(book_id='4', title='Solaris', author='Stanisław Lem', read_date='2019-11-30',
+             shelves='Przeczytane', self_shelves='Sci-Fi, Ulubione'),
+        Book(book_id='5', title='Ogniem i mieczem', author='Henryk Sienkiewicz',
+             read_date='2021-04-01', shelves='Przeczytane'),
+    ]
+
+def ids(books):
+    """Return the IDs of books."""
+    return [book.book_id for book in books]
+
+def test_hash_indexes():
+    """Test lookups by author, cycle and shelf."""
+    index = BookIndex(make_library())
+    
+    assert len(index) == 5
+    assert ids(index.by_author('andrzej sapkowski')) == ['1', '2']
+    assert ids(index.by_cycle('Wiedźmin')) == ['1', '2']
+    assert ids(index.by_cycle('Wiedźmin (tom 2)')) == ['2']
+    assert ids(index.by_shelf('Ulubione')) == ['1', '4']
+    assert ids(index.by_shelf('Przeczytane')) == ['1', '2', '4', '5']
+    assert index.by_author('Nieznany') == []
+
+def test_read_date_range_and_title_prefix():
+    """Test range queries on read date and prefix queries on title."""
+    index = BookIndex(make_library())
+    
+    assert ids(index.read_between('2021-01-01', '2021-04-30')) == ['1', '5']
+    assert ids(index.read_between(end_date='2020-12-31')) == ['4']
+    assert ids(index.read_between()) == ['4', '1', '5', '2']
+    assert ids(index.title_starts_with('o')) == ['5', '1']
+    assert ids(index.title_starts_with('Ostatnie ż')) == ['1']
+    assert index.title_starts_with('Zz') == []
+
+def test_query_combines_conditions(tmp_path):
+    """Test combined queries on an index built from a repository."""
+    with SqliteBookRepository(str(tmp_path / "books.db")) as repository:
+        repository.upsert_books(make_library())
+        index = BookIndex.from_repository(repository)
+    
+    assert ids(index.query(shelf='Fantasy', read_from='2021-05-01')) == ['2']
+    assert ids(index.query(author='Andrzej Sapkowski', title_prefix='Miecz')) == ['2']
+    assert ids(index.query(shelf='Sci-Fi', read_to='2020-01-01')) == ['4']
+    assert len(index.query()) == 5
+
+def test_from_csv_repository_and_iterable(tmp_path):
+    """Test building the index from the default CSV backend and from a plain iterable."""
+    filename = tmp_path / "books.csv"
+    BookRepository.save_books_to_csv(make_library(), str(filename))
+    
+    for source in (str(filename), filename, iter(make_library())):
+        index = BookIndex.from_repository(source)
+        assert ids(index.by_cycle('Wiedźmin')) == ['1', '2']
@@ -0,0 +1,66 @@
+import os
+import pytest
+from repositories.details_cache import BookDetailsCache
+from scrapers.book_scraper import BookScraper
+from models.book import Book
+
+class FakeClock:
+    """Manually advanced clock for cache expiry tests."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def cache_file(tmp_path):
+    """Fixture providing a temporary cache database path."""
+    return os.path.join(tmp_path, "cache.db")
+
+def test_cache_hit_miss_and_ttl(cache_file):
+    """Test that cached entries are returned until they expire."""
+    clock = FakeClock()
+    book = Book(book_id="1", isbn="9781234567890", original_title="Original Title 1")
+
+    with BookDetailsCache(cache_file, ttl=60, clock=clock) as cache:
+        assert cache.get(book) is None
+        cache.put(book)
+        assert cache.get(book) == ("9781234567890", "Original Title 1")
+        clock.now += 61
+        assert cache.get(book) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+def test_cache_persists_between_runs(cache_file):
+    """Test that entries are kept on disk."""
+    with BookDetailsCache(cache_file) as cache:
+        cache.put(Book(book_link="https://lubimyczytac.pl/ksiazka/4883648/imperium-ciszy",
+                       isbn="9788380625068", original_title="Empire of Silence"))
+
+    with BookDetailsCache(cache_file) as cache:
+        assert cache.get(Book(book_id="4883648")) == ("9788380625068", "Empire of Silence")
+
+def test_cache_evicts_oldest_entries(cache_file):
+    """Test that the cache keeps at most max_entries newest entries."""
+    clock = FakeClock()
+    with BookDetailsCache(cache_file, max_entries=2, clock=clock) as cache:
+        for book_id in ("1", "2", "3"):
+            clock.now += 1
+            cache.put(Book(book_id=book_id))
+
+    with BookDetailsCache(cache_file, clock=clock) as cache:
+        assert cache.get(Book(book_id="1")) is None
+        assert cache.get(Book(book_id="3")) is not None
+
+def test_get_book_details_uses_cache(cache_file, mock_driver):
+    """Test that a cached book does not trigger a page load."""
+    with BookDetailsCache(cache_file) as cache:
+        cache.put(Book(book_id="1", isbn="9781234567890", original_title="Original Title 1"))
+
+        scraper = BookScraper(cache=cache)
+        scraper.driver = mock_driver
+        book = scraper.get_book_details(Book(book_id="1", book_link="http://example.com/book1"))
+
+    assert book.isbn == "9781234567890"
+    assert book.original_title == "Original Title 1"
+    mock_driver.get.assert_not_called()
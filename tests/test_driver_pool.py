@@ -0,0 +1,125 @@
+import threading
+import time
+import pytest
+from scrapers.book_scraper import build_page_url
+from scrapers.driver_pool import DriverPool
+from models.book import Book
+
+class FakeScraper:
+    """Stand-in for BookScraper that records which thread used it."""
+
+    instances = []
+
+    def __init__(self, headless=True):
+        self.headless = headless
+        self.active = threading.Lock()
+        self.closed = False
+        FakeScraper.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.closed = True
+
+    def get_book_details(self, book):
+        # A scraper must never be shared by two threads at once
+        assert self.active.acquire(blocking=False)
+        try:
+            book.isbn = f"ISBN-{book.book_id}"
+            return book
+        finally:
+            self.active.release()
+
+def test_enrich_books_preserves_order():
+    """Test that concurrent enrichment returns books in input order."""
+    FakeScraper.instances = []
+    books = [Book(book_id=str(i), book_link=f"http://example.com/{i}") for i in range(20)]
+
+    with DriverPool(size=3, scraper_factory=FakeScraper) as pool:
+        enriched_books = pool.enrich_books(books)
+        stats = pool.worker_stats
+
+    assert [book.book_id for book in enriched_books] == [str(i) for i in range(20)]
+    assert all(book.isbn == f"ISBN-{book.book_id}" for book in enriched_books)
+    assert sum(worker['books'] for worker in stats) == 20
+    assert len(FakeScraper.instances) == 3
+    assert all(scraper.closed for scraper in FakeScraper.instances)
+
+def test_map_requires_context():
+    """Test that the pool must be started before use."""
+    pool = DriverPool(size=2, scraper_factory=FakeScraper)
+    with pytest.raises(ValueError):
+        pool.map(lambda scraper, item: item, [1, 2])
+
+class FakeListScraper(FakeScraper):
+    """Stand-in for BookScraper serving a three-page book list."""
+
+    def scrape_page(self, page_url):
+        time.sleep(0.01)
+        page = page_url.split('page=')[1].split('&')[0]
+        return [Book(book_id=f"{page}-{i}") for i in range(2)]
+
+    def get_page_count(self):
+        return 3
+
+def test_build_page_url():
+    """Test replacing the page parameter of a list URL."""
+    url = 'https://lubimyczytac.pl/profil/1/x/biblioteczka/lista?page=1&listId=booksFilteredList&findString='
+
+    assert build_page_url(url, 7) == (
+        'https://lubimyczytac.pl/profil/1/x/biblioteczka/lista?page=7&listId=booksFilteredList&findString='
+    )
+
+def test_scrape_profile_fetches_pages_in_order():
+    """Test that pages fetched concurrently are reassembled in order."""
+    with DriverPool(size=3, scraper_factory=FakeListScraper) as pool:
+        books = pool.scrape_profile('http://example.com/lista?page=1&objectId=1')
+
+    assert [book.book_id for book in books] == ['1-0', '1-1', '2-0', '2-1', '3-0', '3-1']
+
+class FakeUnpagedScraper(FakeListScraper):
+    """Stand-in for BookScraper whose paginator cannot be read."""
+
+    def get_page_count(self):
+        return None
+
+    def scrape_profile(self, profile_url, known_ids=None):
+        self.walked = (profile_url, known_ids)
+        return [Book(book_id=str(i)) for i in range(5)]
+
+def test_scrape_profile_walks_pages_without_page_count():
+    """Test that an unreadable paginator falls back to walking the list page by page."""
+    with DriverPool(size=2, scraper_factory=FakeUnpagedScraper) as pool:
+        books = pool.scrape_profile('http://example.com/lista?page=1&objectId=1')
+
+    assert [book.book_id for book in books] == ['0', '1', '2', '3', '4']
+
+def test_scrape_profile_with_known_ids_walks_sequentially():
+    """Test that incremental scraping keeps the early stop of the sequential path."""
+    FakeScraper.instances = []
+    with DriverPool(size=2, scraper_factory=FakeUnpagedScraper) as pool:
+        books = pool.scrape_profile('http://example.com/lista?page=3&objectId=1', known_ids={'0'})
+
+    walked = [scraper.walked for scraper in FakeScraper.instances if hasattr(scraper, 'walked')]
+    assert walked == [('http://example.com/lista?page=1&objectId=1', {'0'})]
+    assert len(books) == 5
+
+class FailingStartScraper(FakeScraper):
+    """Stand-in for BookScraper whose third browser fails to start."""
+
+    def __enter__(self):
+        if len(FakeScraper.instances) == 3 and self is FakeScraper.instances[2]:
+            raise RuntimeError("chrome failed to start")
+        return self
+
+def test_started_sessions_are_closed_when_one_fails():
+    """Test that browsers already started are quit when another one fails to start."""
+    FakeScraper.instances = []
+    pool = DriverPool(size=3, scraper_factory=FailingStartScraper)
+
+    with pytest.raises(RuntimeError):
+        pool.__enter__()
+
+    assert [scraper.closed for scraper in FakeScraper.instances] == [True, True, False]
+    assert pool.scrapers == []
@@ -0,0 +1,47 @@
+import os
+import pytest
+from repositories.enrichment_journal import EnrichmentJournal
+from models.book import Book
+
+@pytest.fixture
+def journal_file(tmp_path):
+    """Fixture providing a temporary journal path."""
+    return os.path.join(tmp_path, "enrichment.journal")
+
+def test_replay_after_interrupted_write(journal_file):
+    """Test that journaled books are replayed and a torn last line is ignored."""
+    with EnrichmentJournal(journal_file) as journal:
+        journal.record([Book(book_id='1', isbn='ISBN1', original_title='Original Title 1')])
+    with open(journal_file, mode='a', encoding='utf-8') as file:
+        file.write('{"book_id": "2", "isb')
+
+    books = [Book(book_id='1'), Book(book_id='2')]
+    with EnrichmentJournal(journal_file, resume=True) as journal:
+        pending = journal.replay(books)
+
+    assert pending == [books[1]]
+    assert books[0].isbn == 'ISBN1'
+    assert books[0].original_title == 'Original Title 1'
+
+def test_resume_after_torn_line_keeps_new_entries(journal_file):
+    """Test that entries written after a torn last line survive the next resume."""
+    with EnrichmentJournal(journal_file) as journal:
+        journal.record([Book(book_id='1', isbn='ISBN1', original_title='Original Title 1')])
+    with open(journal_file, mode='a', encoding='utf-8') as file:
+        file.write('{"book_id": "2", "isb')
+
+    with EnrichmentJournal(journal_file, resume=True) as journal:
+        journal.record([Book(book_id='3', isbn='ISBN3', original_title='Original Title 3')])
+
+    with EnrichmentJournal(journal_file, resume=True) as journal:
+        assert sorted(journal.entries) == ['1', '3']
+
+def test_new_run_truncates_journal(journal_file):
+    """Test that a run without resume starts with an empty journal."""
+    with EnrichmentJournal(journal_file) as journal:
+        journal.record([Book(book_id='1', isbn='ISBN1')])
+
+    with EnrichmentJournal(journal_file) as journal:
+        assert journal.replay([Book(book_id='1')]) != []
+
+    assert os.path.getsize(journal_file) == 0
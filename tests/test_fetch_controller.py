@@ -0,0 +1,133 @@
+"""
+Tests for the FetchController class.
+"""
+
+import threading
+import time
+import pytest
+import requests
+from unittest.mock import MagicMock
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from models.book import Book
+from scrapers.fetch_controller import FetchController, classify_failure
+from scrapers.http_book_scraper import HttpBookScraper
+
+def http_error(status, headers=None):
+    """Return a requests.HTTPError with a response of the given status."""
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status} Error", response=response)
+
+def make_controller(**kwargs):
+    """Return a FetchController that records its sleeps instead of sleeping."""
+    controller = FetchController(rng=lambda: 0.5, **kwargs)
+    controller.sleeps = []
+    controller.sleep = controller.sleeps.append
+    return controller
+
+def test_classify_failure():
+    """Test the classification of fetch errors."""
+    assert classify_failure(requests.Timeout()) == 'timeout'
+    assert classify_failure(TimeoutException()) == 'timeout'
+    assert classify_failure(http_error(429)) == 'throttled'
+    assert classify_failure(http_error(503)) == 'server'
+    assert classify_failure(http_error(404)) == 'client'
+    assert classify_failure(requests.ConnectionError()) == 'connection'
+    assert classify_failure(WebDriverException("chrome not reachable")) == 'driver'
+    assert classify_failure(ValueError()) == 'other'
+
+def test_call_retries_with_backoff():
+    """Test that retryable failures are retried with growing, jittered delays."""
+    controller = make_controller(base_delay=1.0)
+    func = MagicMock(side_effect=[requests.Timeout(), http_error(503), "html"])
+    
+    assert controller.call(func, "http://example.com") == "html"
+    assert func.call_count == 3
+    assert controller.sleeps == [0.5, 1.0]
+    assert controller.retries == 2
+    assert controller.failures == {'timeout': 1, 'server': 1}
+
+def test_call_honours_retry_after_and_gives_up():
+    """Test that Retry-After is respected and the last error is raised after max_retries."""
+    controller = make_controller(max_retries=2)
+    func = MagicMock(side_effect=http_error(429, {'Retry-After': '7'}))
+    
+    with pytest.raises(requests.HTTPError):
+        controller.call(func)
+    
+    assert func.call_count == 3
+    assert controller.sleeps == [7.0, 7.0]
+
+def test_client_errors_are_not_retried():
+    """Test that a 404 is raised right away."""
+    controller = make_controller()
+    func = MagicMock(side_effect=http_error(404))
+    
+    with pytest.raises(requests.HTTPError):
+        controller.call(func)
+    
+    assert func.call_count == 1
+    assert controller.sleeps == []
+
+def test_aimd_concurrency_limit():
+    """Test additive increase on fast successes and multiplicative decrease on overload."""
+    now = [0.0]
+    controller = make_controller(initial_concurrency=2, max_concurrency=4, cooldown=10.0,
+                                 latency_target=1.0)
+    controller.clock = lambda: now[0]
+    
+    for _ in range(2):
+        controller.call(lambda: None)
+    assert controller.limit == 3
+    for _ in range(3):
+        controller.call(lambda: None)
+    assert controller.limit == 4
+    
+    controller._on_failure('throttled')
+    assert controller.limit == 2
+    # W okresie ochronnym limit nie spada ponownie
+    controller._on_failure('server')
+    assert controller.limit == 2
+    
+    now[0] = 20.0
+    controller._on_success(5.0)
+    assert controller.limit == 1
+
+def test_slot_limits_concurrency():
+    """Test that no more than `limit` fetches run at once."""
+    controller = make_controller(initial_concurrency=2, max_concurrency=2)
+    running = []
+    peak = []
+    lock = threading.Lock()
+    
+    def fetch():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+    
+    threads = [threading.Thread(target=controller.call, args=(fetch,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert max(peak) == 2
+
+def test_http_scraper_retries_throttled_request(book_page_html):
+    """Test that HttpBookScraper retries a 429 response through the controller."""
+    throttled = MagicMock()
+    throttled.raise_for_status.side_effect = http_error(429)
+    ok = MagicMock(text=book_page_html)
+    session = MagicMock()
+    session.get.side_effect = [throttled, ok]
+    controller = make_controller()
+    
+    with HttpBookScraper(session=session, use_fallback=False, controller=controller) as scraper:
+        book = scraper.get_book_details(Book(title="Imperium ciszy", book_link="http://example.com/1"))
+    
+    assert session.get.call_count == 2
+    assert book.original_title == "Empire of Silence"
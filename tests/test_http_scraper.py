@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock, patch
+from scrapers.book_page_parser import parse_book_details
+from scrapers.http_book_scraper import HttpBookScraper
+from models.book import Book
+
+def test_parse_book_details(book_page_html):
+    """Test parsing ISBN and original title from a saved book page."""
+    isbn, original_title = parse_book_details(book_page_html)
+
+    assert isbn == "9788380625068"
+    assert original_title == "Empire of Silence"
+
+def test_parse_book_details_missing_elements():
+    """Test that missing elements are reported as None."""
+    isbn, original_title = parse_book_details("<html><head></head><body></body></html>")
+
+    assert isbn is None
+    assert original_title is None
+
+def test_get_book_details_over_http(book_page_no_original_title_html):
+    """Test that a page without an original title falls back to the Polish title."""
+    session = MagicMock()
+    session.get.return_value.text = book_page_no_original_title_html
+
+    book = Book(book_link="http://example.com/book", title="Pan Tadeusz")
+    with HttpBookScraper(session=session) as scraper:
+        scraper.get_book_details(book)
+
+    assert book.isbn == "9788373271890"
+    assert book.original_title == "Pan Tadeusz"
+    session.get.assert_called_once_with("http://example.com/book", timeout=10)
+
+@patch('scrapers.http_book_scraper.BookScraper')
+def test_get_book_details_uses_selenium_fallback(mock_scraper_class):
+    """Test that Selenium is used only when the static HTML lacks the data."""
+    session = MagicMock()
+    session.get.return_value.text = "<html><head></head><body></body></html>"
+    fallback = mock_scraper_class.return_value.__enter__.return_value
+
+    book = Book(book_link="http://example.com/book", title="Test Title")
+    with HttpBookScraper(session=session) as scraper:
+        scraper.get_book_details(book)
+        assert scraper.fallback_count == 1
+
+    mock_scraper_class.assert_called_once_with(headless=True)
+    fallback.get_book_details.assert_called_once_with(book)
+
+@patch('scrapers.http_book_scraper.BookScraper')
+def test_own_fallback_browser_uses_cache(mock_scraper_class):
+    """Test that books enriched by the fallback browser started here are cached."""
+    session = MagicMock()
+    session.get.return_value.text = "<html><head></head><body></body></html>"
+    cache = MagicMock()
+    cache.get.return_value = None
+
+    with HttpBookScraper(session=session, cache=cache) as scraper:
+        scraper.get_book_details(Book(book_link="http://example.com/book", title="Test Title"))
+
+    assert mock_scraper_class.return_value.__enter__.return_value.cache is cache
+
+def test_shared_fallback_scraper_is_not_closed():
+    """Test that a fallback browser passed in by the caller stays open."""
+    session = MagicMock()
+    session.get.return_value.text = "<html><head></head><body></body></html>"
+    fallback = MagicMock()
+
+    book = Book(book_link="http://example.com/book", title="Test Title")
+    with HttpBookScraper(session=session, fallback_scraper=fallback) as scraper:
+        scraper.get_book_details(book)
+
+    fallback.get_book_details.assert_called_once_with(book)
+    fallback.__exit__.assert_not_called()
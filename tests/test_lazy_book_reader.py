@@ -0,0 +1,86 @@
+"""
+Tests for the LazyBookCsvReader class.
+"""
+
+import copy
+import os
+import pytest
+from unittest.mock import patch
+from models.book import Book
+from repositories.book_repository import BookRepository
+from repositories.lazy_book_reader import LazyBook, LazyBookCsvReader
+
+def test_lookup_parses_only_requested_rows(sample_books, temp_csv_file):
+    """Test that looking up a book parses only its row."""
+    BookRepository.save_books_to_csv(sample_books, temp_csv_file)
+    
+    with LazyBookCsvReader(temp_csv_file) as reader:
+        assert len(reader) == len(sample_books)
+        assert sample_books[1][0] in reader
+        assert reader.get('missing') is None
+        
+        with patch.object(Book, 'from_list', wraps=Book.from_list) as from_list:
+            book = reader.get(sample_books[1][0])
+            assert isinstance(book, LazyBook)
+            assert from_list.call_count == 0
+            assert book.title == sample_books[1][1]
+            assert book.materialize().to_list() == sample_books[1]
+            assert from_list.call_count == 1
+
+def test_quoted_fields_and_columns(temp_csv_file):
+    """Test rows with commas, quotes and new lines inside fields."""
+    books = [
+        Book(book_id='1', title='Zwykły tytuł', author='Autor'),
+        Book(book_id='2', title='Tytuł, z "cudzysłowem"\ni nową linią', author='Inny, Autor'),
+        Book(book_id='3', title='Ostatni', author='Autor'),
+    ]
+    BookRepository.save_books_to_csv(books, temp_csv_file)
+    
+    with LazyBookCsvReader(temp_csv_file) as reader:
+        assert reader.book_ids == ['1', '2', '3']
+        assert reader.get('2').title == books[1].title
+        assert reader.get('3').title == 'Ostatni'
+        assert list(reader.iter_column('author')) == ['Autor', 'Inny, Autor', 'Autor']
+        assert list(reader.iter_column('Polski Tytuł')) == [book.title for book in books]
+        assert [book.to_list() for book in reader] == [book.to_list() for book in books]
+
+def test_lookups_while_reading_a_column(temp_csv_file):
+    """Test that parsing rows with get() does not disturb a running iter_column()."""
+    books = [Book(book_id=str(i), title=f"Tytuł {i}", author=f"Autor {i}") for i in range(5)]
+    BookRepository.save_books_to_csv(books, temp_csv_file)
+    
+    with LazyBookCsvReader(temp_csv_file) as reader:
+        authors = []
+        for author in reader.iter_column('author'):
+            authors.append(author)
+            assert reader.get('0').materialize().title == 'Tytuł 0'
+        
+        assert authors == [book.author for book in books]
+
+def test_index_is_cached_and_rebuilt_when_stale(sample_books, temp_csv_file):
+    """Test that the sidecar index is reused and rebuilt after the CSV changes."""
+    BookRepository.save_books_to_csv(sample_books, temp_csv_file)
+    with LazyBookCsvReader(temp_csv_file):
+        pass
+    assert os.path.exists(temp_csv_file + '.idx')
+    
+    with patch.object(LazyBookCsvReader, '_build_index') as build_index:
+        with LazyBookCsvReader(temp_csv_file) as reader:
+            assert len(reader) == len(sample_books)
+        build_index.assert_not_called()
+    
+    BookRepository.save_books_to_csv(sample_books[:1], temp_csv_file)
+    os.utime(temp_csv_file, ns=(0, 0))
+    with LazyBookCsvReader(temp_csv_file) as reader:
+        assert reader.book_ids == [sample_books[0][0]]
+
+def test_lazy_book_can_be_copied(sample_books, temp_csv_file):
+    """Test that copying a view does not recurse through unset private fields."""
+    BookRepository.save_books_to_csv(sample_books, temp_csv_file)
+    
+    with LazyBookCsvReader(temp_csv_file) as reader:
+        copied = copy.copy(reader.get('2'))
+        assert copied.author == 'Autor 2'
+    
+    with pytest.raises(AttributeError):
+        LazyBook.__new__(LazyBook)._book
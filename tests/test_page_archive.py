@@ -0,0 +1,100 @@
+"""
+Tests for the PageArchive class and replaying archived pages.
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+from models.book import Book
+from repositories.page_archive import PageArchive
+from scrapers.archive_replay_scraper import ArchiveReplayScraper
+from scrapers.book_page_parser import parse_listing_page
+from scrapers.book_scraper import BookScraper, build_page_url
+from scrapers.http_book_scraper import HttpBookScraper
+
+LIST_URL = "https://lubimyczytac.pl/profil/605200/stokuj/biblioteczka/lista?page=1&listId=booksFilteredList"
+
+def test_store_is_content_addressed(tmp_path):
+    """Test that identical pages are stored once and the index survives reopening."""
+    archive = PageArchive(str(tmp_path))
+    digest = archive.store("http://example.com/1", "<html>1</html>", 'book')
+    assert archive.store("http://example.com/2", "<html>1</html>", 'book') == digest
+    archive.store("http://example.com/list", "<html>list</html>", 'listing')
+    
+    objects = [name for _, _, names in os.walk(tmp_path / "objects") for name in names]
+    assert len(objects) == 2
+    
+    reopened = PageArchive(str(tmp_path))
+    assert len(reopened) == 3
+    assert reopened.get("http://example.com/2") == "<html>1</html>"
+    assert reopened.urls('listing') == ["http://example.com/list"]
+    assert reopened.get("http://example.com/missing") is None
+
+def test_parse_listing_page(listing_page_html):
+    """Test that a saved list page is parsed like the in-browser extraction script."""
+    books = parse_listing_page(listing_page_html, LIST_URL)
+    
+    assert books[0].to_list() == [
+        '4883648', 'Imperium ciszy', 'Christopher Ruocchio', '', 'Pożeracz słońc (tom 1)',
+        '7,2', '182', '1133', '49', '', 'https://lubimyczytac.pl/ksiazka/4883648/imperium-ciszy',
+        '', 'Chcę przeczytać', 'Fantasy', ''
+    ]
+    assert books[1].user_rating == '9'
+    assert books[1].read_date == '2023-05-14'
+    assert books[1].shelves == 'Przeczytane'
+
+def test_replay_scrapes_and_enriches_from_archive(tmp_path, listing_page_html, book_page_html):
+    """Test that books are scraped and enriched from archived pages only."""
+    archive = PageArchive(str(tmp_path))
+    archive.store(build_page_url(LIST_URL, 1), listing_page_html, 'listing')
+    archive.store("https://lubimyczytac.pl/ksiazka/4883648/imperium-ciszy", book_page_html, 'book')
+    
+    with ArchiveReplayScraper(archive) as scraper:
+        books = scraper.scrape_profile(LIST_URL)
+        scraper.enrich_books(books)
+    
+    assert [book.book_id for book in books] == ['4883648', '31']
+    assert books[0].isbn == '9788380625068'
+    assert books[0].original_title == 'Empire of Silence'
+    assert books[1].isbn == ''
+    assert scraper.missing == 1
+
+@patch('scrapers.book_scraper.WebDriverWait')
+def test_book_scraper_records_pages(mock_wait, mock_driver, tmp_path):
+    """Test that BookScraper archives the book pages it visits."""
+    mock_wait.return_value.until.return_value = MagicMock()
+    mock_driver.page_source = "<html>book</html>"
+    archive = PageArchive(str(tmp_path))
+    
+    scraper = BookScraper(archive=archive)
+    scraper.driver = mock_driver
+    scraper.get_book_details(Book(book_link="http://example.com/book"))
+    
+    assert archive.get("http://example.com/book") == "<html>book</html>"
+    assert archive.urls('book') == ["http://example.com/book"]
+
+@patch('scrapers.book_scraper.WebDriverWait')
+def test_book_scraper_skips_failed_loads(mock_wait, mock_driver, tmp_path):
+    """Test that a failed page load does not archive the previous page under the new URL."""
+    mock_driver.get.side_effect = Exception("net::ERR_CONNECTION_RESET")
+    mock_driver.page_source = "<html>previous page</html>"
+    archive = PageArchive(str(tmp_path))
+    
+    scraper = BookScraper(archive=archive)
+    scraper.driver = mock_driver
+    scraper.get_book_details(Book(book_link="http://example.com/book"))
+    
+    assert "http://example.com/book" not in archive
+
+def test_http_scraper_records_pages(tmp_path, book_page_html):
+    """Test that pages downloaded over HTTP can be replayed."""
+    url = "https://lubimyczytac.pl/ksiazka/4883648/imperium-ciszy"
+    session = MagicMock()
+    session.get.return_value.text = book_page_html
+    archive = PageArchive(str(tmp_path))
+    
+    with HttpBookScraper(session=session, archive=archive) as scraper:
+        scraper.get_book_details(Book(book_id='4883648', book_link=url))
+    
+    with ArchiveReplayScraper(archive) as scraper:
+        book = scraper.get_book_details(Book(book_id='4883648', book_link=url))
+    assert book.isbn == '9788380625068'
@@ -0,0 +1,68 @@
+"""
+Tests for the RunMetrics class.
+"""
+
+import json
+from metrics.run_metrics import RunMetrics, percentile
+
+class FakeClock:
+    """Clock advancing by one second on every call."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = [float(i) for i in range(1, 101)]
+    
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) is None
+
+def test_report_contains_stages_latencies_and_counters():
+    """Test that stages, latencies and counters end up in the report."""
+    metrics = RunMetrics(clock=FakeClock())
+    with metrics.stage('scrape'):
+        pass
+    with metrics.stage('enrich'):
+        pass
+    with metrics.stage('enrich'):
+        pass
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        metrics.observe('page_fetch', seconds)
+    metrics.increment('book_timeouts')
+    metrics.increment('book_errors', 2)
+    
+    report = metrics.report()
+    
+    assert report['stages'] == {'scrape': 1.0, 'enrich': 2.0}
+    assert report['latencies']['page_fetch']['count'] == 4
+    assert report['latencies']['page_fetch']['p50'] == 0.2
+    assert report['latencies']['page_fetch']['p99'] == 0.4
+    assert report['counters'] == {'book_timeouts': 1, 'book_errors': 2}
+    assert report['pages_per_second'] == 4.0
+
+def test_save_json_and_prometheus(tmp_path):
+    """Test exporting the metrics as JSON and as a Prometheus textfile."""
+    metrics = RunMetrics(clock=FakeClock())
+    with metrics.stage('convert'):
+        pass
+    metrics.observe('book_fetch', 0.5)
+    metrics.increment('book_timeouts')
+    
+    json_file = tmp_path / "metrics.json"
+    prom_file = tmp_path / "metrics.prom"
+    metrics.save_json(str(json_file))
+    metrics.save_prometheus(str(prom_file))
+    
+    assert json.loads(json_file.read_text(encoding='utf-8'))['stages'] == {'convert': 1.0}
+    prom = prom_file.read_text(encoding='utf-8')
+    assert 'lubimyczytac_stage_seconds{stage="convert"} 1.0' in prom
+    assert 'lubimyczytac_latency_seconds{kind="book_fetch",quantile="0.95"} 0.5' in prom
+    assert 'lubimyczytac_latency_seconds_count{kind="book_fetch"} 1' in prom
+    assert 'lubimyczytac_events_total{event="book_timeouts"} 1' in prom
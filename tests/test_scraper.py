@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from scrapers.book_scraper import BookScraper
+from scrapers.book_scraper import BLOCKED_URL_PATTERNS, BookScraper, build_list_url, get_profile_id
 from models.book import Book
 
 @patch('scrapers.book_scraper.WebDriverWait')
@@ -188,3 +188,125 @@ def test_scrape_profile(mock_time, mock_wait, mock_chrome):
 
     # Verify driver was used correctly
     mock_driver.get.assert_called_once_with("http://example.com/profile")
+
+@patch('scrapers.book_scraper.WebDriverWait')
+@patch('scrapers.book_scraper.time')
+def test_scrape_profile_stops_at_known_books(mock_time, mock_wait):
+    """Test that delta mode stops paging at a page of already known books."""
+    mock_driver = MagicMock()
+    mock_driver.find_elements.return_value = [MagicMock(), MagicMock()]
+    next_button = MagicMock()
+    next_button.get_attribute.return_value = "next-page"  # More pages available
+    mock_driver.find_element.return_value = next_button
+
+    scraper = BookScraper()
+    scraper.driver = mock_driver
+    pages = iter([["3", "2"], ["1", "0"], ["-1", "-2"]])
+    page_ids = []
+
+    def extract_book_data(book_element):
+        if not page_ids:
+            page_ids.extend(next(pages))
+        return Book(book_id=page_ids.pop(0))
+
+    scraper._extract_book_data = extract_book_data
+
+    books = scraper.scrape_profile("http://example.com/profile", known_ids={"2", "1", "0"})
+
+    # First page has a new book, second page is fully known, third is never visited
+    assert [book.book_id for book in books] == ["3", "2", "1", "0"]
+    assert next_button.click.call_count == 1
+
+@patch('scrapers.book_scraper.WebDriverWait')
+@patch('scrapers.book_scraper.time')
+def test_scrape_profile_with_single_script_call(mock_time, mock_wait):
+    """Test that a page is extracted with one execute_script round trip."""
+    mock_driver = MagicMock()
+    mock_driver.execute_script.return_value = [{
+        'id': 'listBookElement4883648',
+        'title': ' Imperium ciszy ',
+        'author': 'Christopher Ruocchio',
+        'link': 'https://lubimyczytac.pl/ksiazka/4883648/imperium-ciszy',
+        'cycle': 'Cykl: Pożeracz słońc (tom 1)',
+        'avg_rating': '7,2',
+        'user_rating': None,
+        'rating_count': '182 ocen',
+        'small_grey': ['Czytelnicy: 1133', 'Opinie: 49'],
+        'read_date': None,
+        'shelves': ['Chcę przeczytać', 'Fantasy'],
+    }]
+    next_button = MagicMock()
+    next_button.get_attribute.return_value = "disabled"
+    mock_driver.find_element.return_value = next_button
+
+    scraper = BookScraper()
+    scraper.driver = mock_driver
+
+    books = scraper.scrape_profile("http://example.com/profile")
+
+    assert books[0].to_list() == [
+        '4883648', 'Imperium ciszy', 'Christopher Ruocchio', '', 'Pożeracz słońc (tom 1)',
+        '7,2', '182', '1133', '49', '', 'https://lubimyczytac.pl/ksiazka/4883648/imperium-ciszy',
+        '', 'Chcę przeczytać', 'Fantasy', ''
+    ]
+    mock_driver.execute_script.assert_called_once()
+    mock_driver.find_elements.assert_not_called()
+
+@patch('scrapers.book_scraper.WebDriverWait')
+@patch('scrapers.book_scraper.time')
+def test_scrape_page_accepts_cookies_once(mock_time, mock_wait, mock_driver):
+    """Test that pages fetched by URL look for the cookie banner once per session."""
+    mock_driver.execute_script.return_value = []
+    scraper = BookScraper()
+    scraper.driver = mock_driver
+
+    scraper.scrape_page("http://example.com/lista?page=1")
+    scraper.scrape_page("http://example.com/lista?page=2")
+
+    accept_button = mock_wait.return_value.until.return_value
+    accept_button.click.assert_called_once()
+    assert scraper.cookies_accepted
+
+def test_get_page_count_unreadable(mock_driver):
+    """Test that a missing paginator is reported as unknown instead of a single page."""
+    scraper = BookScraper()
+    scraper.driver = mock_driver
+
+    mock_driver.execute_script.return_value = None
+    assert scraper.get_page_count() is None
+    mock_driver.execute_script.return_value = 12
+    assert scraper.get_page_count() == 12
+
+@patch('scrapers.book_scraper.webdriver.Chrome')
+def test_lean_browser_options(mock_chrome):
+    """Test that lean mode uses eager loading, headless mode and resource blocking."""
+    with BookScraper(lean=True) as scraper:
+        options = mock_chrome.call_args.kwargs['options']
+        assert scraper.headless is True
+        assert options.page_load_strategy == 'eager'
+        assert "--headless=new" in options.arguments
+        assert "--disable-extensions" in options.arguments
+        mock_chrome.return_value.execute_cdp_cmd.assert_any_call(
+            'Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS}
+        )
+
+def test_average_page_load_time(mock_driver):
+    """Test that page loads are timed."""
+    scraper = BookScraper()
+    scraper.driver = mock_driver
+    assert scraper.average_page_load_time() == 0.0
+
+    scraper.get_book_details(Book(book_link="http://example.com/book"))
+
+    assert len(scraper.page_load_times) == 1
+    assert scraper.average_page_load_time() >= 0.0
+
+def test_build_list_url_uses_profile_id():
+    """Test that the book list URL contains the ID of the given profile."""
+    list_url = build_list_url("https://lubimyczytac.pl/profil/123456/jan/")
+    
+    assert get_profile_id("https://lubimyczytac.pl/profil/605200/stokuj") == '605200'
+    assert list_url.startswith("https://lubimyczytac.pl/profil/123456/jan/biblioteczka/lista?page=1&")
+    assert "objectId=123456" in list_url
+    with pytest.raises(ValueError):
+        get_profile_id("https://lubimyczytac.pl/ksiazka/1/tytul")
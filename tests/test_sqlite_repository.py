@@ -0,0 +1,45 @@
+import os
+import pytest
+from repositories.sqlite_book_repository import SqliteBookRepository
+from models.book import Book
+
+@pytest.fixture
+def repository(tmp_path):
+    """Fixture providing an SQLite repository in a temporary directory."""
+    with SqliteBookRepository(os.path.join(tmp_path, "books.db")) as repository:
+        yield repository
+
+def test_upsert_and_lookup(repository, sample_books):
+    """Test saving books and looking them up by ID, author, ISBN and read date."""
+    books = [Book.from_list(list(book)) for book in sample_books]
+
+    assert repository.upsert_books(books) == 2
+    assert repository.count() == 2
+    assert repository.get_book('1').to_list() == books[0].to_list()
+    assert repository.get_book('3') is None
+    assert [book.book_id for book in repository.find_by_author('Autor 2')] == ['2']
+    assert [book.book_id for book in repository.find_by_isbn('ISBN1')] == ['1']
+    assert [book.book_id for book in repository.find_read_between('2023-01-15', '2023-12-31')] == ['2']
+
+def test_upsert_writes_only_changed_rows(repository, sample_books):
+    """Test that unchanged rows are not rewritten."""
+    books = [Book.from_list(list(book)) for book in sample_books]
+    repository.upsert_books(books)
+
+    books[1].avg_rating = '4.1'
+    new_book = Book(book_id='3', title='Nowa książka')
+
+    assert repository.upsert_books(books + [new_book]) == 2
+    assert repository.get_book('2').avg_rating == '4.1'
+    assert [book.book_id for book in repository.load_books()] == ['1', '2', '3']
+
+    repository.delete_books(['1'])
+    assert repository.count() == 2
+
+def test_indexes_are_used(repository):
+    """Test that lookups by author use the secondary index."""
+    plan = repository._connection.execute(
+        'EXPLAIN QUERY PLAN SELECT * FROM books WHERE author = ?', ('Autor 1',)
+    ).fetchall()
+
+    assert any('books_author' in row[-1] for row in plan)
@@ -0,0 +1,82 @@
+"""
+Tests for refreshing book statistics with conditional requests.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from models.book import Book
+from repositories.page_validators import PageValidatorStore
+from scrapers.book_page_parser import parse_book_stats
+from scrapers.http_book_scraper import HttpBookScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+class ConditionalPageHandler(BaseHTTPRequestHandler):
+    """Stand-in for lubimyczytac.pl answering conditional requests."""
+    
+    etag = '"v1"'
+    requests = []
+    
+    def do_GET(self):
+        type(self).requests.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        with open(os.path.join(FIXTURES_DIR, 'book_page_stats.html'), mode='rb') as file:
+            body = file.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', self.etag)
+        self.send_header('Last-Modified', 'Sat, 17 Oct 2026 10:00:00 GMT')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def conditional_server():
+    """Fixture running a local HTTP server supporting ETags."""
+    ConditionalPageHandler.etag = '"v1"'
+    ConditionalPageHandler.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ConditionalPageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_parse_book_stats():
+    """Test reading the statistics from the JSON-LD and the page text."""
+    with open(os.path.join(FIXTURES_DIR, 'book_page_stats.html'), mode='r', encoding='utf-8') as file:
+        stats = parse_book_stats(file.read())
+    
+    assert stats == {'avg_rating': '7,3', 'rating_count': '1204', 'opinions': '61', 'readers': '3215'}
+
+def test_unchanged_pages_are_not_parsed_again(conditional_server, tmp_path):
+    """Test that only changed pages are downloaded and parsed."""
+    book = Book(book_id='4883648', title='Imperium ciszy', avg_rating='7,2', rating_count='182',
+                book_link=f"{conditional_server}/ksiazka/4883648/imperium-ciszy")
+    
+    with PageValidatorStore(str(tmp_path / "validators.db")) as validators, \
+         HttpBookScraper() as scraper:
+        assert scraper.refresh_book_stats(book, validators) is True
+        assert book.avg_rating == '7,3'
+        assert book.readers == '3215'
+        assert validators.get('4883648') == ('"v1"', 'Sat, 17 Oct 2026 10:00:00 GMT')
+        
+        book.avg_rating = 'stale'
+        assert scraper.refresh_book_stats(book, validators) is False
+        assert book.avg_rating == 'stale'
+        
+        ConditionalPageHandler.etag = '"v2"'
+        assert scraper.refresh_book_stats(book, validators) is True
+        assert book.avg_rating == '7,3'
+    
+    assert ConditionalPageHandler.requests == [None, '"v1"', '"v1"']
+    assert scraper.refresh_stats['changed'] == 2
+    assert scraper.refresh_stats['not_modified'] == 1
@@ -1,7 +1,8 @@
 import os
 import csv
 import pytest
-from repositories.book_repository import BookRepository
+import table_utils
+from repositories.book_repository import MISSING_COUNT, BookCsvWriter, BookRepository
 from models.book import Book
 
 def test_save_and_load_books(sample_books, temp_csv_file):
@@ -58,3 +59,159 @@ def test_convert_books_to_goodreads(sample_books, temp_csv_file, tmp_path):
         assert rows[0]['Date Read'] == '2023-01-01'
         assert rows[0]['Shelves'] == 'Przeczytane'
         assert rows[0]['Bookshelves'] == 'Fantasy, Sci-Fi'
+
+def test_merge_books(sample_books):
+    """Test merging freshly scraped books into previously saved ones."""
+    existing_books = [Book.from_list(list(book)) for book in sample_books]
+    new_books = [
+        Book(book_id='3', title='Nowa książka'),
+        Book(book_id='1', title='Tytuł Polski 1', avg_rating='4.6'),
+    ]
+
+    merged_books = BookRepository.merge_books(new_books, existing_books)
+
+    assert [book.book_id for book in merged_books] == ['3', '1', '2']
+    assert merged_books[1].avg_rating == '4.6'
+
+def test_book_csv_writer_appends(sample_books, temp_csv_file):
+    """Test writing books one by one and appending to an existing file."""
+    books = [Book.from_list(list(book)) for book in sample_books]
+
+    with BookCsvWriter(temp_csv_file) as writer:
+        writer.write(books[0])
+    with BookCsvWriter(temp_csv_file, append=True) as writer:
+        writer.write(books[1])
+
+    loaded_books = BookRepository.load_books_from_csv(temp_csv_file)
+    assert [book.to_list() for book in loaded_books] == [book.to_list() for book in books]
+
+def test_save_and_load_columnar(sample_books, tmp_path):
+    """Test saving books to a columnar file and loading native arrays."""
+    np = pytest.importorskip('numpy')
+    books = [Book.from_list(list(book)) for book in sample_books]
+    books.append(Book(book_id='3', avg_rating='7,2', rating_count='1 182'))
+    filename = os.path.join(tmp_path, "books.npz")
+
+    BookRepository.save_books_to_columnar(books, filename)
+    columns = BookRepository.load_columns_from_columnar(filename)
+
+    assert list(columns['book_id']) == ['1', '2', '3']
+    assert list(columns['author']) == ['Autor 1', 'Autor 2', '']
+    assert columns['avg_rating'].dtype == np.float64
+    assert columns['avg_rating'][2] == 7.2
+    assert columns['rating_count'].dtype == np.int64
+    assert list(columns['rating_count']) == [100, 200, 1182]
+    assert np.isnan(columns['user_rating'][2])
+    assert columns['readers'][2] == MISSING_COUNT
+
+def test_columnar_text_is_not_padded(tmp_path):
+    """Test that one long title does not widen the stored text column."""
+    np = pytest.importorskip('numpy')
+    books = [Book(book_id=str(i), title='Ż' if i else 'Długi tytuł ' * 500) for i in range(100)]
+    filename = os.path.join(tmp_path, "books.npz")
+
+    BookRepository.save_books_to_columnar(books, filename)
+    with np.load(filename) as data:
+        stored_bytes = data['title_utf8'].nbytes
+    columns = BookRepository.load_columns_from_columnar(filename)
+
+    assert stored_bytes == sum(len(book.title.encode('utf-8')) for book in books)
+    assert list(columns['title']) == [book.title for book in books]
+
+def test_columnar_text_is_decoded_on_access(tmp_path):
+    """Test that loaded text columns decode single values, iterate and convert to arrays."""
+    np = pytest.importorskip('numpy')
+    books = [Book(book_id=str(i), author=f"Łukasz {i}") for i in range(5)]
+    filename = os.path.join(tmp_path, "books.npz")
+
+    BookRepository.save_books_to_columnar(books, filename)
+    authors = BookRepository.load_columns_from_columnar(filename)['author']
+
+    assert len(authors) == 5
+    assert authors[2] == 'Łukasz 2'
+    assert authors[np.int64(-1)] == 'Łukasz 4'
+    with pytest.raises(IndexError):
+        authors[5]
+    array = authors.to_array()
+    assert array.dtype == object
+    assert list(array) == [book.author for book in books]
+
+def test_both_converters_produce_identical_output(sample_books, temp_csv_file, tmp_path):
+    """Test that table_utils and BookRepository share one streaming converter."""
+    books = [Book.from_list(list(book)) for book in sample_books]
+    books.append(Book(book_id='3', title='Bez oryginału', author='Autor 3'))
+    BookRepository.save_books_to_csv(books, temp_csv_file)
+
+    repository_file = os.path.join(tmp_path, "goodreads_repository.csv")
+    table_utils_file = os.path.join(tmp_path, "goodreads_table_utils.csv")
+    assert BookRepository.convert_books_to_goodreads(temp_csv_file, repository_file) == 3
+    table_utils.convert_books_to_goodreads(temp_csv_file, table_utils_file)
+
+    with open(repository_file, mode='r', encoding='utf-8') as file:
+        repository_output = file.read()
+    with open(table_utils_file, mode='r', encoding='utf-8') as file:
+        assert file.read() == repository_output
+
+    rows = list(csv.DictReader(repository_output.splitlines()))
+    assert rows == [book.to_goodreads_dict() for book in books]
+    assert rows[2]['Title'] == 'Bez oryginału'
+
+def read_rows(filename):
+    """Read all rows of a CSV file."""
+    with open(filename, mode='r', encoding='utf-8', newline='') as file:
+        return list(csv.reader(file))
+
+def test_save_books_incrementally(sample_books, tmp_path):
+    """Test that only changes are written and reported in the delta file."""
+    filename = str(tmp_path / "books.csv")
+    delta_file = str(tmp_path / "books.delta.csv")
+    books = [Book.from_list(list(row)) for row in sample_books]
+    
+    assert BookRepository.save_books_incrementally(books, filename)['mode'] == 'rewrite'
+    assert len(read_rows(filename)) == 3
+    assert [row[0] for row in read_rows(delta_file)[1:]] == ['added', 'added']
+    
+    # Bez zmian plik nie jest modyfikowany
+    mtime = os.stat(filename).st_mtime_ns
+    changes = BookRepository.save_books_incrementally(books, filename)
+    assert changes == {'added': 0, 'changed': 0, 'removed': 0, 'mode': 'unchanged'}
+    assert os.stat(filename).st_mtime_ns == mtime
+    assert len(read_rows(delta_file)) == 1
+    
+    # Nowa książka na początku listy wymaga przepisania, jak w pełnym eksporcie
+    new_book = Book(book_id='3', title='Tytuł Polski 3', author='Autor 3')
+    changes = BookRepository.save_books_incrementally([new_book] + books, filename)
+    assert changes == {'added': 1, 'changed': 0, 'removed': 0, 'mode': 'rewrite'}
+    full_file = str(tmp_path / "books_full.csv")
+    BookRepository.save_books_to_csv([new_book] + books, full_file)
+    assert read_rows(filename) == read_rows(full_file)
+    assert read_rows(delta_file)[1][:3] == ['added', '3', '3']
+    
+    # Nowa książka na końcu listy jest dopisywana
+    last_book = Book(book_id='4', title='Tytuł Polski 4', author='Autor 4')
+    changes = BookRepository.save_books_incrementally([new_book] + books + [last_book], filename)
+    assert changes == {'added': 1, 'changed': 0, 'removed': 0, 'mode': 'append'}
+    assert [row[0] for row in read_rows(filename)[1:]] == ['3', '1', '2', '4']
+    
+    # Zmiana i usunięcie wymagają przepisania pliku
+    books[0].avg_rating = '4,6'
+    changes = BookRepository.save_books_incrementally([books[0], new_book], filename)
+    assert changes == {'added': 0, 'changed': 1, 'removed': 2, 'mode': 'rewrite'}
+    assert [book.to_list() for book in BookRepository.load_books_from_csv(filename)] == \
+        [books[0].to_list(), new_book.to_list()]
+    assert [row[:2] for row in read_rows(delta_file)[1:]] == \
+        [['changed', '1'], ['removed', '2'], ['removed', '4']]
+
+def test_goodreads_incremental_matches_full_conversion(sample_books, temp_csv_file, tmp_path):
+    """Test that the incremental Goodreads export has the same content as a full conversion."""
+    full_file = str(tmp_path / "goodreads_full.csv")
+    incremental_file = str(tmp_path / "goodreads.csv")
+    BookRepository.save_books_to_csv([Book.from_list(list(row)) for row in sample_books], temp_csv_file)
+    
+    BookRepository.convert_books_to_goodreads(temp_csv_file, full_file)
+    BookRepository.convert_books_to_goodreads_incrementally(temp_csv_file, incremental_file)
+    
+    assert read_rows(incremental_file) == read_rows(full_file)
+    assert BookRepository.convert_books_to_goodreads_incrementally(
+        temp_csv_file, incremental_file
+    )['mode'] == 'unchanged'
@@ -0,0 +1,139 @@
+"""
+Tests for the EnrichmentTaskQueue and QueueWorker classes.
+"""
+
+import pytest
+from models.book import Book
+from repositories.task_queue import EnrichmentTaskQueue
+from scrapers.queue_worker import QueueWorker
+
+class FakeClock:
+    """Clock that only moves when told to."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+class FakeScraper:
+    """Scraper setting the ISBN from the book ID."""
+    
+    def __init__(self, fail_on=None, unavailable=()):
+        self.fail_on = fail_on
+        self.unavailable = unavailable
+        self.calls = []
+        self.failed_links = set()
+    
+    def get_book_details(self, book):
+        self.calls.append(book.book_id)
+        if book.book_id == self.fail_on:
+            raise RuntimeError("crash")
+        if book.book_id in self.unavailable:
+            self.failed_links.add(book.book_link)
+            return book
+        self.failed_links.discard(book.book_link)
+        book.isbn = f"ISBN-{book.book_id}"
+        book.original_title = f"Original {book.title}"
+        return book
+
+def make_books(count):
+    """Return books with links to their pages."""
+    return [Book(book_id=str(i), title=f"Tytuł {i}", book_link=f"http://example.com/ksiazka/{i}")
+            for i in range(count)]
+
+def test_enqueue_skips_queued_books(tmp_path):
+    """Test that a book is queued only once."""
+    with EnrichmentTaskQueue(str(tmp_path / "tasks.db")) as queue:
+        assert queue.enqueue(make_books(3)) == 3
+        assert queue.enqueue(make_books(4)) == 1
+        assert queue.counts() == {'pending': 4, 'leased': 0, 'done': 0, 'failed': 0}
+
+def test_lease_is_exclusive_until_expired(tmp_path):
+    """Test that leased tasks are handed out again only after the lease expires."""
+    clock = FakeClock()
+    filename = str(tmp_path / "tasks.db")
+    with EnrichmentTaskQueue(filename, lease_timeout=60, clock=clock) as first, \
+         EnrichmentTaskQueue(filename, lease_timeout=60, clock=clock) as second:
+        first.enqueue(make_books(3))
+        
+        assert [book.book_id for book in first.lease('a', limit=2)] == ['0', '1']
+        clock.now += 30
+        assert [book.book_id for book in second.lease('b', limit=2)] == ['2']
+        assert second.lease('b') == []
+        
+        # Worker 'a' przestał odpowiadać, dzierżawa 'b' jest wciąż ważna
+        clock.now += 31
+        assert [book.book_id for book in second.lease('b')] == ['0', '1']
+
+def test_workers_process_queue_and_app_collects_results(tmp_path):
+    """Test that workers sharing a queue enrich every book once."""
+    filename = str(tmp_path / "tasks.db")
+    books = make_books(5)
+    with EnrichmentTaskQueue(filename) as queue:
+        queue.enqueue(books)
+    
+    scrapers = [FakeScraper(), FakeScraper()]
+    with EnrichmentTaskQueue(filename) as queue_a, EnrichmentTaskQueue(filename) as queue_b:
+        QueueWorker(queue_a, scrapers[0], 'a', batch_size=2).run_once()
+        assert QueueWorker(queue_b, scrapers[1], 'b', batch_size=2).run() == 3
+        assert not queue_b.has_unfinished()
+    
+    assert sorted(scrapers[0].calls + scrapers[1].calls) == ['0', '1', '2', '3', '4']
+    with EnrichmentTaskQueue(filename) as queue:
+        assert queue.results()['3'] == ('ISBN-3', 'Original Tytuł 3')
+
+def test_failed_batch_is_released(tmp_path):
+    """Test that a worker returns its tasks to the queue when it fails."""
+    with EnrichmentTaskQueue(str(tmp_path / "tasks.db")) as queue:
+        queue.enqueue(make_books(2))
+        
+        with pytest.raises(RuntimeError):
+            QueueWorker(queue, FakeScraper(fail_on='1'), 'a').run_once()
+        
+        assert queue.counts() == {'pending': 2, 'leased': 0, 'done': 0, 'failed': 0}
+
+def test_expired_lease_cannot_complete_or_release(tmp_path):
+    """Test that a worker whose lease expired cannot touch tasks re-leased to another worker."""
+    clock = FakeClock()
+    with EnrichmentTaskQueue(str(tmp_path / "tasks.db"), lease_timeout=60, clock=clock) as queue:
+        queue.enqueue(make_books(2))
+        stale = queue.lease('a')
+        clock.now += 61
+        current = queue.lease('b')
+        
+        assert queue.release('a', stale) == 0
+        assert queue.complete('a', stale) == 0
+        assert queue.counts() == {'pending': 0, 'leased': 2, 'done': 0, 'failed': 0}
+        assert queue.complete('b', current) == 2
+        assert queue.counts() == {'pending': 0, 'leased': 0, 'done': 2, 'failed': 0}
+
+def test_unfetched_books_are_retried_until_max_attempts(tmp_path):
+    """Test that books whose page was not fetched are released and given up after max_attempts."""
+    with EnrichmentTaskQueue(str(tmp_path / "tasks.db"), max_attempts=2) as queue:
+        queue.enqueue(make_books(2))
+        scraper = FakeScraper(unavailable={'1'})
+        worker = QueueWorker(queue, scraper, 'a')
+        
+        worker.run_once()
+        assert queue.counts() == {'pending': 1, 'leased': 0, 'done': 1, 'failed': 0}
+        assert list(queue.results()) == ['0']
+        
+        assert worker.run() == 1
+        assert scraper.calls == ['0', '1', '1']
+        assert queue.counts() == {'pending': 0, 'leased': 0, 'done': 1, 'failed': 1}
+        assert not queue.has_unfinished()
+
+def test_expired_lease_fails_after_max_attempts(tmp_path):
+    """Test that a task whose workers keep crashing is not handed out forever."""
+    clock = FakeClock()
+    with EnrichmentTaskQueue(str(tmp_path / "tasks.db"), lease_timeout=60, clock=clock,
+                             max_attempts=2) as queue:
+        queue.enqueue(make_books(1))
+        assert len(queue.lease('a')) == 1
+        clock.now += 61
+        assert len(queue.lease('b')) == 1
+        clock.now += 61
+        
+        assert queue.lease('c') == []
+        assert queue.counts() == {'pending': 0, 'leased': 0, 'done': 0, 'failed': 1}
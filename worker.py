@@ -0,0 +1,46 @@
+"""
+Queue worker script for the Lubimyczytac.pl web scraper.
+
+This script processes book enrichment tasks enqueued by ScraperApp.enqueue_books.
+Any number of workers can run at once, in separate processes on the machine
+holding the queue file. The queue uses SQLite's WAL mode, so the file must
+not be on a network filesystem.
+"""
+
+import argparse
+from repositories.details_cache import BookDetailsCache
+from repositories.task_queue import EnrichmentTaskQueue
+from scrapers.book_scraper import BookScraper
+from scrapers.fetch_controller import FetchController
+from scrapers.http_book_scraper import HttpBookScraper
+from scrapers.queue_worker import QueueWorker
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lubimyczytac.pl enrichment worker")
+    parser.add_argument('--queue', default='dane/tasks.db', help="path to the task queue")
+    parser.add_argument('--engine', choices=['http', 'selenium'], default='http',
+                        help="how book pages are fetched")
+    parser.add_argument('--batch-size', type=int, default=10, help="number of tasks leased at once")
+    parser.add_argument('--lease-timeout', type=float, default=300,
+                        help="seconds after which tasks of a crashed worker are handed out again")
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help="number of attempts after which a book is given up on")
+    parser.add_argument('--cache', default='dane/details_cache.db',
+                        help="path to the book details cache, or an empty string to disable it")
+    parser.add_argument('--worker-id', help="ID of this worker")
+    args = parser.parse_args()
+    
+    cache = BookDetailsCache(args.cache) if args.cache else None
+    controller = FetchController()
+    if args.engine == 'http':
+        scraper = HttpBookScraper(cache=cache, controller=controller)
+    else:
+        scraper = BookScraper(headless=True, cache=cache, controller=controller)
+    
+    try:
+        with EnrichmentTaskQueue(args.queue, lease_timeout=args.lease_timeout,
+                                 max_attempts=args.max_attempts) as queue, scraper:
+            QueueWorker(queue, scraper, args.worker_id, args.batch_size).run()
+    finally:
+        if cache:
+            cache.close()